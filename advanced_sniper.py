@@ -10,6 +10,7 @@ import os
 import sys
 import time
 import json
+import asyncio
 import logging
 import argparse
 import datetime
@@ -19,8 +20,17 @@ from dotenv import load_dotenv
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from minecraft_auth import MinecraftAuth
-from name_utils import NameChecker
-from sniper import Sniper, SniperResult
+from profiling import enable_profiling, DEFAULT_PROFILE_FILE
+from log_setup import HOT_LOGGER, setup_logging
+from name_utils import NameChecker, UsernameStream
+from sniper import Sniper, SniperResult, SNIPE_WINDOW_END
+from rate_planner import RatePlanner, targets_from_times, load_scheduled_targets
+from session_recorder import start_recording
+from request_context import Deadline, DeadlineExceeded, SnipeCancelled, CancellationToken, current_token, bind_request_context, retry_wait, wait_until
+from timing_calibration import calibrate, display_profile, DEFAULT_SLEEP_SAMPLES
+from readiness import SnipeSession, READINESS_LEAD_TIME
+from gc_control import critical_section
+from dns_cache import pin_hosts
 try:
     from notifications import NotificationManager
     notifications_available = True
@@ -30,15 +40,8 @@ except ImportError:
 # Initialize colorama
 init(autoreset=True)
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("advanced_sniper.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Set up logging on a background thread with a rotating log file
+setup_logging("advanced_sniper.log")
 
 # Constants
 MAX_THREADS = 5
@@ -61,15 +64,17 @@ class DistributedStrategy:
     
     def execute(self, sniper, username, target_time=None):
         """Execute the strategy"""
-        logging.info(f"{Fore.CYAN}Using Distributed Strategy with {self.thread_count} threads")
-        
-        # If we have a target time, wait until just before it
-        if target_time:
-            wait_until_close(target_time, buffer_seconds=self.initial_delay)
+        HOT_LOGGER.info("%sUsing Distributed Strategy with %d threads", Fore.CYAN, self.thread_count)
         
         result = SniperResult(username)
         result.strategy = self.name
-        result.start_time = datetime.datetime.now()
+        
+        # If we have a target time, wait until just before it, unless the snipe is cancelled first
+        if target_time and not wait_until(target_time.timestamp() - self.initial_delay):
+            result.error = f"Snipe cancelled: {current_token().reason}"
+            return result
+        
+        start_time = time.time()
         
         # Calculate safe request distribution to respect rate limits
         # (60 requests/minute across all threads)
@@ -78,17 +83,20 @@ class DistributedStrategy:
                                  total_safe_requests // self.thread_count)
         thread_delay = 60 / total_safe_requests  # seconds between requests
         
-        logging.info(f"{Fore.CYAN}Each thread will make up to {requests_per_thread} attempts")
+        HOT_LOGGER.info("%sEach thread will make up to %d attempts", Fore.CYAN, requests_per_thread)
         
-        # Create and start worker threads
+        # Create and start worker threads, all stopping at the end of the snipe window
+        # or as soon as one of them claims the name
         results = []
-        with ThreadPoolExecutor(max_workers=self.thread_count) as executor:
+        deadline = Deadline((target_time.timestamp() if target_time else start_time) + SNIPE_WINDOW_END)
+        token = CancellationToken(parent=current_token())
+        with deadline, token, pin_hosts(), critical_section(), ThreadPoolExecutor(max_workers=self.thread_count) as executor:
             futures = []
             for i in range(self.thread_count):
                 # Stagger the threads slightly
                 thread_start_delay = i * (thread_delay / 2)
                 futures.append(executor.submit(
-                    self._worker_thread, 
+                    bind_request_context(self._worker_thread), 
                     sniper, 
                     username, 
                     i, 
@@ -102,7 +110,8 @@ class DistributedStrategy:
                 thread_result = future.result()
                 results.append(thread_result)
                 if thread_result and thread_result.success:
-                    # Cancel remaining futures if one succeeded
+                    # Stop the running threads and drop the queued ones
+                    token.cancel("claimed")
                     for f in futures:
                         if not f.done():
                             f.cancel()
@@ -115,7 +124,7 @@ class DistributedStrategy:
         else:
             # Combine attempt information from all threads
             result.attempts = sum(r.attempts if r else 0 for r in results)
-            result.time_taken = (datetime.datetime.now() - result.start_time).total_seconds()
+            result.time_taken = time.time() - start_time
             result.error = "Failed to claim username across all threads"
             
             # Check if any availability was detected
@@ -128,11 +137,11 @@ class DistributedStrategy:
         """Worker thread that attempts to claim the username"""
         thread_result = SniperResult(username)
         thread_result.strategy = f"{self.name}_thread_{thread_id}"
-        thread_result.start_time = datetime.datetime.now()
+        start_time = time.time()
         
         # If requested, add a start delay for this thread (for staggering)
-        if start_delay > 0:
-            time.sleep(start_delay)
+        if start_delay > 0 and not retry_wait(start_delay):
+            return thread_result
         
         attempts = 0
         availability_detected = False
@@ -144,42 +153,105 @@ class DistributedStrategy:
                 break
                 
             # Check if the username is available first
-            is_available = sniper.check_username(username)
-            thread_result.requests.append(datetime.datetime.now())
+            try:
+                is_available = sniper.check_username(username)
+            except (DeadlineExceeded, SnipeCancelled):
+                break
+            thread_result.requests.append(time.time())
             
             if is_available:
                 availability_detected = True
-                logging.info(f"{Fore.GREEN}Thread {thread_id}: Username '{username}' is available! Attempting to claim...")
+                HOT_LOGGER.info("%sThread %d: Username '%s' is available! Attempting to claim...", Fore.GREEN, thread_id, username)
                 
                 # Attempt to claim immediately
                 try:
                     success = auth.change_username(username)
-                    thread_result.requests.append(datetime.datetime.now())
-                    thread_result.claim_time = datetime.datetime.now()
+                    thread_result.requests.append(time.time())
+                    thread_result.claim_time = time.time()
                     
                     if success:
-                        logging.info(f"{Fore.GREEN}Thread {thread_id}: Successfully claimed username '{username}'!")
+                        HOT_LOGGER.info("%sThread %d: Successfully claimed username '%s'!", Fore.GREEN, thread_id, username)
+                        current_token().cancel("claimed")
                         thread_result.success = True
                         thread_result.attempts = attempts + 1
-                        thread_result.time_taken = (datetime.datetime.now() - thread_result.start_time).total_seconds()
+                        thread_result.time_taken = time.time() - start_time
                         return thread_result
                     else:
-                        logging.warning(f"{Fore.YELLOW}Thread {thread_id}: Failed to claim '{username}' despite availability")
+                        HOT_LOGGER.warning("%sThread %d: Failed to claim '%s' despite availability", Fore.YELLOW, thread_id, username)
+                except (DeadlineExceeded, SnipeCancelled):
+                    break
                 except Exception as e:
-                    logging.error(f"{Fore.RED}Thread {thread_id}: Error claiming username: {str(e)}")
+                    HOT_LOGGER.error("%sThread %d: Error claiming username: %s", Fore.RED, thread_id, e)
             
-            # Add a delay between attempts to respect rate limits
-            time.sleep(delay)
+            # Add a delay between attempts to respect rate limits, unless the window closes first
             attempts += 1
+            if not retry_wait(delay):
+                break
         
         thread_result.success = False
         thread_result.attempts = attempts
-        thread_result.time_taken = (datetime.datetime.now() - thread_result.start_time).total_seconds()
+        thread_result.time_taken = time.time() - start_time
         thread_result.availability_detected = availability_detected
         thread_result.error = "Maximum attempts reached" if not availability_detected else "Failed to claim despite availability"
         
         return thread_result
 
+def serialize_result(value):
+    """Convert a SniperResult or result dictionary into JSON-serializable data"""
+    if isinstance(value, SniperResult):
+        return {
+            "username": value.username,
+            "success": value.success,
+            "attempts": value.attempts,
+            "time_taken": value.time_taken,
+            "error": value.error,
+            "timestamp": value.timestamp.isoformat()
+        }
+    
+    if isinstance(value, dict):
+        # Convert datetime objects to strings
+        return {
+            key: item.isoformat() if isinstance(item, (datetime.datetime, datetime.date)) else item
+            for key, item in value.items()
+        }
+    
+    return value
+
+class ResultFileWriter:
+    """Write results to a JSON object file one entry at a time"""
+    
+    def __init__(self, filename):
+        self.filename = filename
+        self.count = 0
+        self._file = None
+    
+    def open(self):
+        """Create the file and start the JSON object"""
+        self._file = open(self.filename, "w")
+        self._file.write("{")
+        return self
+    
+    def write(self, key, value):
+        """Append a single result and flush it to disk"""
+        entry = json.dumps(serialize_result(value), indent=4).replace("\n", "\n    ")
+        self._file.write(f"{',' if self.count else ''}\n    {json.dumps(key)}: {entry}")
+        self._file.flush()
+        self.count += 1
+    
+    def close(self):
+        """Finish the JSON object and close the file"""
+        if self._file:
+            self._file.write("\n}\n" if self.count else "}\n")
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self.open()
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
 class AdvancedSniper:
     """Advanced wrapper around the core Sniper class to handle multiple usernames and configurations"""
     
@@ -201,7 +273,7 @@ class AdvancedSniper:
     
     def check_usernames_bulk(self, usernames):
         """Check multiple usernames and return available ones"""
-        return self.core_sniper.check_usernames_bulk(usernames)
+        return self.core_sniper.check_usernames(usernames)
     
     def monitor_username(self, username, check_interval=1.5, auto_claim=False):
         """
@@ -212,6 +284,10 @@ class AdvancedSniper:
     
     def _monitor_username_thread(self, username, check_interval, auto_claim, results_dict):
         """Thread worker for monitoring a username"""
+        store = self.core_sniper.stats.store
+        watch_id = f"cli:{username.lower()}"
+        store.upsert_watchlist(watch_id, username, "monitoring", data={"auto_claim": auto_claim})
+        
         try:
             result = self.monitor_username(username, check_interval, auto_claim)
             results_dict[username] = {
@@ -225,6 +301,11 @@ class AdvancedSniper:
                 "error": str(e),
                 "timestamp": datetime.datetime.now()
             }
+        
+        status = "claimed" if results_dict[username].get("claimed") else (
+            "available" if results_dict[username]["available"] else "error"
+        )
+        store.upsert_watchlist(watch_id, username, status, data=results_dict[username])
     
     def monitor_multiple_usernames(self, usernames, check_interval=1.5, auto_claim=False):
         """
@@ -283,62 +364,198 @@ class AdvancedSniper:
         print(f"\r{Fore.CYAN}Monitoring: {active_count} active, {available_count} available, {claimed_count} claimed", end="")
         sys.stdout.flush()
     
-    def snipe_username(self, username, strategy="timing", target_time=None, latency_ms=None):
+    def snipe_username(self, username, strategy="timing", target_time=None, latency_ms=None, allocation=None):
         """Snipe a username with the specified strategy"""
-        return self.core_sniper.snipe_username(username, strategy, target_time, latency_ms)
+        return self.core_sniper.snipe_username(username, strategy, target_time, latency_ms, allocation)
     
-    def _snipe_username_thread(self, username, strategy, target_time, results_dict):
-        """Thread worker for sniping a username"""
+    def plan_snipes(self, target_times, strategy="timing", include_scheduled=True, reserved_per_window=0):
+        """
+        Plan the request budget across drops
+        
+        Args:
+            target_times: Dictionary mapping usernames to target times
+            strategy: Strategy the snipes will use (sets the requests each one asks for)
+            include_scheduled: Also account for monitors scheduled in the Electron app
+            reserved_per_window: Requests per minute kept back for monitoring
+            
+        Returns:
+            RatePlan covering every target
+        """
+        targets = targets_from_times(target_times, strategy)
+        if include_scheduled:
+            planned = {username.lower() for username in target_times}
+            targets += [target for target in load_scheduled_targets() if target[0].lower() not in planned]
+        
+        return RatePlanner(reserved_per_window=reserved_per_window).plan(targets)
+    
+    def _snipe_one(self, username, strategy, target_time, latency_ms=None, allocation=None):
+        """Snipe a single username, turning exceptions into a failed result"""
         try:
-            result = self.snipe_username(username, strategy, target_time)
-            results_dict[username] = result
+            return self.snipe_username(username, strategy, target_time, latency_ms, allocation)
         except Exception as e:
-            results_dict[username] = SniperResult(
+            return SniperResult(
                 username=username,
                 success=False,
                 error=str(e)
             )
     
-    def snipe_multiple_usernames(self, usernames, strategy="timing", target_times=None):
+    def _snipe_username_thread(self, username, strategy, target_time, results_dict):
+        """Thread worker for sniping a username"""
+        results_dict[username] = self._snipe_one(username, strategy, target_time)
+    
+    def iter_snipe_results(self, usernames, strategy="timing", target_times=None, latency_ms=None):
         """
-        Snipe multiple usernames concurrently.
+        Snipe multiple usernames concurrently, yielding each result as soon as it is ready.
         
         Args:
-            usernames: List of usernames to snipe
+            usernames: Usernames to snipe
             strategy: Strategy to use for sniping
             target_times: Optional dictionary mapping usernames to target times
+            latency_ms: Optional network latency passed to the strategy
             
-        Returns:
-            Dictionary mapping usernames to their results
+        Yields:
+            SniperResult for each username, in completion order
         """
         if not self.core_sniper.authenticated:
             logging.error(f"{Fore.RED}Authentication required to snipe usernames")
-            return {}
+            return
+        
+        usernames = list(usernames)
+        if not usernames:
+            return
         
         if not target_times:
             target_times = {}
         
-        # Create result dict
-        results = {}
-        threads = []
+        # Share the request budget between drops close enough to compete for it
+        plan = self.plan_snipes(target_times, strategy) if target_times else None
         
         # Cap the number of threads
         max_concurrent = min(len(usernames), self.max_threads)
         
         logging.info(f"{Fore.CYAN}Starting to snipe {len(usernames)} usernames using {max_concurrent} threads")
         
-        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
-            # Submit sniping tasks for each username
-            futures = {}
-            for username in usernames:
-                target_time = target_times.get(username)
-                future = executor.submit(
-                    self._snipe_username_thread,
-                    username, strategy, target_time, results
-                )
-                futures[future] = username
+        # Cancelled if the caller stops iterating early, so running snipes stop sending requests
+        token = CancellationToken(parent=current_token())
+        executor = ThreadPoolExecutor(max_workers=max_concurrent)
+        try:
+            with token:
+                snipe_one = bind_request_context(self._snipe_one)
+            futures = {
+                executor.submit(
+                    snipe_one, username, strategy, target_times.get(username), latency_ms,
+                    plan.get(username) if plan else None
+                ): username
+                for username in usernames
+            }
+            for future in as_completed(futures):
+                # Forget the future so the result is released once the caller is done with it
+                del futures[future]
+                yield future.result()
+        finally:
+            # Stop running snipes and drop queued ones if the caller stops iterating early
+            token.cancel("stopped")
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    async def aiter_snipe_results(self, usernames, strategy="timing", target_times=None, latency_ms=None):
+        """
+        Async variant of iter_snipe_results for use from an asyncio event loop.
+        
+        Snipes still run in worker threads; each result is yielded as soon as it is ready.
+        """
+        if not self.core_sniper.authenticated:
+            logging.error(f"{Fore.RED}Authentication required to snipe usernames")
+            return
         
-        return results
+        usernames = list(usernames)
+        if not usernames:
+            return
+        
+        if not target_times:
+            target_times = {}
+        
+        plan = self.plan_snipes(target_times, strategy) if target_times else None
+        
+        loop = asyncio.get_running_loop()
+        token = CancellationToken(parent=current_token())
+        with token:
+            snipe_one = bind_request_context(self._snipe_one)
+        executor = ThreadPoolExecutor(max_workers=min(len(usernames), self.max_threads))
+        tasks = [
+            loop.run_in_executor(
+                executor, snipe_one, username, strategy, target_times.get(username), latency_ms,
+                plan.get(username) if plan else None
+            )
+            for username in usernames
+        ]
+        try:
+            for next_result in asyncio.as_completed(tasks):
+                yield await next_result
+        finally:
+            token.cancel("stopped")
+            for task in tasks:
+                task.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def snipe_multiple_usernames(self, usernames, strategy="timing", target_times=None):
+        """
+        Snipe multiple usernames concurrently.
+        
+        Args:
+            usernames: List of usernames to snipe
+            strategy: Strategy to use for sniping
+            target_times: Optional dictionary mapping usernames to target times
+            
+        Returns:
+            Dictionary mapping usernames to their results
+        """
+        return {
+            result.username: result
+            for result in self.iter_snipe_results(usernames, strategy, target_times)
+        }
+    
+    def iter_check_results(self, usernames, include_drop_time=True):
+        """
+        Check usernames from any iterable, yielding (username, result) as each check finishes.
+        
+        Args:
+            usernames: Usernames to check (consumed lazily)
+            include_drop_time: Look up the drop time of names that are taken
+            
+        Yields:
+            Tuples of (username, dict with available, drop_time and timestamp)
+        """
+        for username, is_available in self.core_sniper.iter_check_usernames(usernames):
+            drop_time = None
+            if include_drop_time and not is_available:
+                drop_time = self.core_sniper.get_drop_time(username)
+            
+            yield username, {
+                "available": is_available,
+                "drop_time": drop_time,
+                "timestamp": datetime.datetime.now()
+            }
+    
+    async def aiter_check_results(self, usernames, include_drop_time=True):
+        """Async variant of iter_check_results; checks run in a worker thread"""
+        results = self.iter_check_results(usernames, include_drop_time)
+        finished = object()
+        pending = None
+        try:
+            while True:
+                pending = asyncio.ensure_future(asyncio.to_thread(next, results, finished))
+                item = await asyncio.shield(pending)
+                if item is finished:
+                    break
+                yield item
+        finally:
+            # The generator can't be closed while a worker thread is still running it
+            if pending is not None and not pending.done():
+                try:
+                    await asyncio.shield(pending)
+                except Exception:
+                    pass
+            results.close()
     
     def get_upcoming_available_names(self, limit=10):
         """Get upcoming available names from NameMC"""
@@ -361,29 +578,19 @@ class AdvancedSniper:
         return self.core_sniper.test_network_latency(iterations)
     
     def save_to_file(self, data, filename="sniper_results.json"):
-        """Save results to a JSON file"""
+        """
+        Save results to a JSON file
+        
+        Args:
+            data: Dictionary of results, or an iterable of (key, result) pairs
+                  which is written out entry by entry as it is consumed
+            filename: File to write
+        """
+        items = data.items() if isinstance(data, dict) else data
         try:
-            # Convert datetime objects to strings
-            serializable_data = {}
-            for key, value in data.items():
-                if isinstance(value, SniperResult):
-                    serializable_data[key] = {
-                        "username": value.username,
-                        "success": value.success,
-                        "attempts": value.attempts,
-                        "time_taken": value.time_taken,
-                        "error": value.error,
-                        "timestamp": value.timestamp.isoformat()
-                    }
-                elif isinstance(value, dict) and "timestamp" in value:
-                    serializable_value = value.copy()
-                    serializable_value["timestamp"] = value["timestamp"].isoformat()
-                    serializable_data[key] = serializable_value
-                else:
-                    serializable_data[key] = value
-            
-            with open(filename, "w") as f:
-                json.dump(serializable_data, f, indent=4)
+            with ResultFileWriter(filename) as writer:
+                for key, value in items:
+                    writer.write(key, value)
             
             logging.info(f"{Fore.GREEN}Results saved to {filename}")
             return True
@@ -447,6 +654,9 @@ Examples:
   Check for upcoming available names:
     python advanced_sniper.py upcoming --limit 20
     
+  Check that several drops fit in the rate limit:
+    python advanced_sniper.py plan -f usernames.txt -s burst
+    
   Test network latency for better timing:
     python advanced_sniper.py test -i 20
         """
@@ -483,8 +693,28 @@ Examples:
     snipe_parser.add_argument("-s", "--strategy", choices=["burst", "timing", "distributed", "precision", "adaptive"], 
                          default="adaptive", help="Sniping strategy to use (default: adaptive)")
     snipe_parser.add_argument("--latency", type=float, help="Network latency in milliseconds for precision timing")
+    snipe_parser.add_argument("--prepare", type=float, default=READINESS_LEAD_TIME / 60, metavar="MINUTES",
+                         help=f"Run the readiness checks this many minutes before each drop; 0 disables them "
+                              f"(default: {READINESS_LEAD_TIME / 60:g})")
+    snipe_parser.add_argument("--ignore-no-go", action="store_true",
+                         help="Snipe even if a critical readiness check fails")
     snipe_parser.add_argument("--save", help="Save results to the specified JSON file")
     
+    # Plan command
+    plan_parser = subparsers.add_parser("plan", help="Plan the request budget across upcoming drops")
+    plan_group = plan_parser.add_mutually_exclusive_group(required=True)
+    plan_group.add_argument("-u", "--username", help="Single username to plan")
+    plan_group.add_argument("-f", "--file", help="File containing usernames to plan (one per line)")
+    plan_parser.add_argument("-t", "--time", dest="target_time",
+                        help="Target time for all usernames (format: 'YYYY-MM-DD HH:MM:SS', default: NameMC drop times)")
+    plan_parser.add_argument("-s", "--strategy", choices=["burst", "timing", "distributed", "precision", "adaptive"],
+                        default="adaptive", help="Sniping strategy to plan for (default: adaptive)")
+    plan_parser.add_argument("--reserve", type=int, default=0,
+                        help="Requests per minute to keep back for monitoring (default: 0)")
+    plan_parser.add_argument("--no-scheduled", action="store_true",
+                        help="Ignore monitors scheduled in the desktop app")
+    plan_parser.add_argument("--save", help="Save the plan to the specified JSON file")
+    
     # Upcoming command
     upcoming_parser = subparsers.add_parser("upcoming", help="Check for upcoming available usernames")
     upcoming_parser.add_argument("--limit", type=int, default=10, 
@@ -496,6 +726,11 @@ Examples:
     test_parser.add_argument("-i", "--iterations", type=int, default=10,
                         help="Number of iterations for latency test")
     
+    # Calibrate command
+    calibrate_parser = subparsers.add_parser("calibrate", help="Measure this host's timer accuracy for precise waits")
+    calibrate_parser.add_argument("--samples", type=int, default=DEFAULT_SLEEP_SAMPLES,
+                             help="Sleeps measured per duration")
+    
     # Proxy command
     proxy_parser = subparsers.add_parser("proxy", help="Manage proxies")
     proxy_subparsers = proxy_parser.add_subparsers(dest="proxy_command", help="Proxy command")
@@ -544,45 +779,97 @@ Examples:
                     help=f"Maximum number of concurrent threads (default: {MAX_THREADS})")
     parser.add_argument("-v", "--verbose", action="store_true", 
                     help="Enable verbose output for debugging")
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_PROFILE_FILE, metavar="FILE",
+                    help=f"Profile the command and write folded stacks for a flame graph (default: {DEFAULT_PROFILE_FILE})")
+    parser.add_argument("--record", metavar="FILE",
+                    help="Record request timing (no credentials) to a session file for replay")
     
     return parser.parse_args()
 
-def load_usernames_from_file(filename):
-    """Load usernames from a file, one per line"""
+def log_rejected_usernames(stream):
+    """Log a summary of the lines a username stream skipped"""
+    report = stream.report()
+    if report["invalid"] or report["duplicates"]:
+        logging.warning(f"{Fore.YELLOW}Skipped {report['invalid']} invalid and {report['duplicates']} duplicate lines in {stream.filename}")
+        for line_number, line, reason in report["rejected_samples"]:
+            logging.debug(f"  line {line_number}: {line!r} ({reason})")
+
+def iter_username_batches(filename, batch_size=10):
+    """Yield batches of valid, unique usernames from a file without loading it all
+    
+    The default batch size matches the batches used by Sniper.check_usernames.
+    """
+    stream = UsernameStream(filename, batch_size=batch_size)
     try:
-        with open(filename, "r") as f:
-            usernames = [line.strip() for line in f if line.strip() and not line.startswith("#")]
-        return usernames
+        yield from stream
     except Exception as e:
         logging.error(f"{Fore.RED}Error loading usernames from file: {str(e)}")
-        return []
+    finally:
+        log_rejected_usernames(stream)
 
-def display_check_results(results):
-    """Display username check results in a formatted table"""
-    if not results:
-        print(f"{Fore.YELLOW}No results to display")
-        return
-    
+def load_usernames_from_file(filename):
+    """Load usernames from a file, one per line"""
+    return [username for batch in iter_username_batches(filename) for username in batch]
+
+def display_check_header():
+    """Display the header of the username check results table"""
     print(f"\n{Fore.CYAN}{'='*60}")
     print(f"{Fore.CYAN}Username Availability Results")
     print(f"{Fore.CYAN}{'='*60}")
     print(f"{'Username':<20} {'Status':<15} {'Drop Time':<25}")
     print(f"{'-'*20} {'-'*15} {'-'*25}")
+
+def display_check_row(username, data):
+    """Display a single row of the username check results table"""
+    if data.get("available", False):
+        status = f"{Fore.GREEN}Available"
+    else:
+        status = f"{Fore.RED}Taken"
     
-    for username, data in results.items():
-        if data.get("available", False):
-            status = f"{Fore.GREEN}Available"
-        else:
-            status = f"{Fore.RED}Taken"
-        
-        drop_time = data.get("drop_time", "N/A")
-        if drop_time != "N/A":
-            drop_time = drop_time.strftime("%Y-%m-%d %H:%M:%S")
-        
-        print(f"{username:<20} {status:<35} {drop_time:<25}")
+    drop_time = data.get("drop_time") or "N/A"
+    if drop_time != "N/A":
+        drop_time = drop_time.strftime("%Y-%m-%d %H:%M:%S")
     
+    print(f"{username:<20} {status:<35} {drop_time:<25}")
+
+def display_check_footer():
+    """Display the footer of the username check results table"""
     print(f"{Fore.CYAN}{'='*60}\n")
 
+def display_check_results(results):
+    """Display username check results in a formatted table"""
+    if not results:
+        print(f"{Fore.YELLOW}No results to display")
+        return
+    
+    display_check_header()
+    for username, data in results.items():
+        display_check_row(username, data)
+    display_check_footer()
+
+def display_rate_plan(plan):
+    """Display a request budget plan in a formatted table"""
+    if not plan.allocations:
+        print(f"{Fore.YELLOW}No drops to plan")
+        return
+    
+    print(f"\n{Fore.CYAN}{'='*78}")
+    print(f"{Fore.CYAN}Request Budget Plan ({plan.budget} requests per minute)")
+    print(f"{Fore.CYAN}{'='*78}")
+    print(f"{'Username':<18} {'Target Time':<21} {'Requests':<10} {'Status':<10} {'Notes'}")
+    print(f"{'-'*18} {'-'*21} {'-'*10} {'-'*10} {'-'*15}")
+    
+    colors = {"ok": Fore.GREEN, "reduced": Fore.YELLOW, "infeasible": Fore.RED, "missed": Fore.RED}
+    for allocation in plan.allocations:
+        requests = f"{allocation.allocated}/{allocation.requested}"
+        status = f"{colors[allocation.status]}{allocation.status:<10}{Style.RESET_ALL}"
+        print(f"{allocation.username:<18} {allocation.target_time.strftime('%Y-%m-%d %H:%M:%S'):<21} "
+              f"{requests:<10} {status} {allocation.reason or ''}")
+    
+    print(f"{Fore.CYAN}{'='*78}\n")
+    if not plan.feasible:
+        print(f"{Fore.RED}{len(plan.infeasible)} drop(s) cannot get enough requests; spread them out or reserve fewer requests\n")
+
 def display_upcoming_names(names):
     """Display upcoming available names in a formatted table"""
     if not names:
@@ -650,6 +937,20 @@ def display_stats_report(report):
             
             print(f"{name:<20} {success_rate:<15} {attempts:<10} {avg_time:<10}")
     
+    # Show availability lookup endpoint health
+    endpoints = report.get("endpoints", {})
+    if endpoints:
+        print(f"\n{Fore.CYAN}Lookup Endpoint Health")
+        print(f"{'-'*70}")
+        print(f"{'Endpoint':<28} {'State':<10} {'Answered':<10} {'Failed':<8} {'Last Bad Status':<15}")
+        print(f"{'-'*28} {'-'*10} {'-'*10} {'-'*8} {'-'*15}")
+        
+        for name, health in endpoints.items():
+            color = Fore.GREEN if health.get("state") == "healthy" else Fore.YELLOW
+            last_status = health.get("last_status") or "-"
+            print(f"{color}{name:<28} {health.get('state', '?'):<10}{Style.RESET_ALL} "
+                  f"{health.get('successes', 0):<10} {health.get('failures', 0):<8} {last_status!s:<15}")
+    
     # Show recent claims
     recent_claims = report.get("recent_claims", [])
     if recent_claims:
@@ -683,6 +984,12 @@ def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.profile:
+        enable_profiling(args.profile, args.command)
+    
+    if args.record:
+        start_recording(args.record)
+    
     # Display banner and disclaimer
     display_banner()
     display_disclaimer()
@@ -699,40 +1006,35 @@ def main():
     
     # Execute the requested command
     if args.command == "check":
-        # Load usernames
-        usernames = []
+        # Stream usernames in batches straight into the checker
         if args.username:
             usernames = [args.username]
-        elif args.file:
-            usernames = load_usernames_from_file(args.file)
+        else:
+            usernames = (username for batch in iter_username_batches(args.file) for username in batch)
         
-        if not usernames:
+        # Display and save each result as soon as it is checked
+        writer = ResultFileWriter(args.save).open() if args.save else None
+        checked = 0
+        try:
+            for username, result in sniper.iter_check_results(usernames):
+                if checked == 0:
+                    display_check_header()
+                display_check_row(username, result)
+                checked += 1
+                
+                if writer:
+                    writer.write(username, result)
+        finally:
+            if writer:
+                writer.close()
+        
+        if not checked:
             logging.error(f"{Fore.RED}No usernames to check")
             return
         
-        logging.info(f"{Fore.CYAN}Checking {len(usernames)} usernames...")
-        
-        # Check availability
-        results = {}
-        for username in usernames:
-            is_available = sniper.check_username(username)
-            drop_time = None
-            
-            if not is_available:
-                drop_time = sniper.core_sniper.get_drop_time(username)
-            
-            results[username] = {
-                "available": is_available,
-                "drop_time": drop_time,
-                "timestamp": datetime.datetime.now()
-            }
-        
-        # Display results
-        display_check_results(results)
-        
-        # Save results if requested
-        if args.save:
-            sniper.save_to_file(results, args.save)
+        display_check_footer()
+        if writer:
+            logging.info(f"{Fore.GREEN}Results saved to {args.save}")
     
     elif args.command == "monitor":
         # Load usernames
@@ -838,29 +1140,56 @@ def main():
                     print(f"{Fore.CYAN}Target time for {username}: {target}")
                     print(f"{Fore.CYAN}Time until target: {days}d {hours}h {minutes}m {seconds}s")
         
-        # Execute the snipe
-        results = {}
-        for username in usernames:
-            # Use single-username snipe for better control
-            target = target_times.get(username)
-            result = sniper.snipe_username(username, args.strategy, target, latency_ms)
-            results[username] = result
+        # Execute the snipe, saving each result as soon as it is ready
+        writer = ResultFileWriter(args.save).open() if args.save else None
+        try:
+            for username in usernames:
+                # Use single-username snipe for better control
+                target = target_times.get(username)
+                if target and args.prepare > 0:
+                    session = SnipeSession(sniper.core_sniper, username, target, args.strategy, latency_ms,
+                                           lead_time=args.prepare * 60)
+                    result = session.run(force=args.ignore_no_go)
+                else:
+                    result = sniper.snipe_username(username, args.strategy, target, latency_ms)
+                if writer:
+                    writer.write(username, result)
             
-            # Display result immediately
-            if result.success:
-                print(f"\n{Fore.GREEN}Successfully sniped username: {username}!")
-                print(f"Attempts: {result.attempts}")
-                print(f"Time taken: {result.time_taken:.2f}s")
-            else:
-                print(f"\n{Fore.RED}Failed to snipe username: {username}")
-                if result.error:
-                    print(f"Error: {result.error}")
-                print(f"Attempts: {result.attempts}")
-                print(f"Time taken: {result.time_taken:.2f}s")
+                # Display result immediately
+                if result.success:
+                    print(f"\n{Fore.GREEN}Successfully sniped username: {username}!")
+                    print(f"Attempts: {result.attempts}")
+                    print(f"Time taken: {result.time_taken:.2f}s")
+                else:
+                    print(f"\n{Fore.RED}Failed to snipe username: {username}")
+                    if result.error:
+                        print(f"Error: {result.error}")
+                    print(f"Attempts: {result.attempts}")
+                    print(f"Time taken: {result.time_taken:.2f}s")
+        finally:
+            if writer:
+                writer.close()
+        
+        if writer:
+            logging.info(f"{Fore.GREEN}Results saved to {args.save}")
+    
+    elif args.command == "plan":
+        usernames = [args.username] if args.username else load_usernames_from_file(args.file)
+        target_time = parse_target_time(args.target_time)
+        
+        target_times = {}
+        for username in usernames:
+            target_times[username] = target_time or sniper.core_sniper.get_drop_time(username)
+            if not target_times[username]:
+                logging.warning(f"{Fore.YELLOW}No drop time known for {username}; leaving it out of the plan")
+        
+        plan = sniper.plan_snipes(target_times, args.strategy, not args.no_scheduled, args.reserve)
+        display_rate_plan(plan)
         
-        # Save results if requested
         if args.save:
-            sniper.save_to_file(results, args.save)
+            with open(args.save, "w") as f:
+                json.dump(plan.to_dict(), f, indent=4)
+            logging.info(f"{Fore.GREEN}Plan saved to {args.save}")
     
     elif args.command == "upcoming":
         logging.info(f"{Fore.CYAN}Checking for upcoming available names...")
@@ -868,9 +1197,9 @@ def main():
         
         # Display results
         display_upcoming_names(names)
-    
-    # Save results if requested
-    if args.save:
+        
+        # Save results if requested
+        if args.save:
             sniper.save_to_file({"upcoming_names": names}, args.save)
     
     elif args.command == "test":
@@ -888,6 +1217,10 @@ def main():
             print(f"Maximum Latency: {results['maximum']:.2f}ms")
             print(f"{Fore.CYAN}{'='*50}")
     
+    elif args.command == "calibrate":
+        print(f"{Fore.CYAN}Calibrating timers, this takes a few seconds...")
+        display_profile(calibrate(args.samples))
+    
     elif args.command == "proxy":
         if args.proxy_command == "load":
             proxy_file = args.proxy_file
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Clocks
+
+Strategies read time and sleep through a clock object so they can run against
+simulated endpoints faster than real time.
+"""
+
+import time
+import datetime
+import threading
+
+from timing_calibration import precise_sleep_until
+
+
+class SystemClock:
+    """The real wall clock"""
+
+    def time(self):
+        """Current Unix timestamp"""
+        return time.time()
+
+    def now(self):
+        """Current local datetime"""
+        return datetime.datetime.now()
+
+    def sleep(self, seconds):
+        """Sleep for a number of seconds"""
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def sleep_until(self, timestamp, event=None):
+        """
+        Sleep until a Unix timestamp, using the host's calibrated sleep/spin switch-over
+
+        Returns:
+            True if the optional threading.Event was set first
+        """
+        return precise_sleep_until(timestamp, event)
+
+    def wait(self, event, seconds):
+        """Wait for a threading.Event for up to a number of seconds; True if it was set"""
+        if seconds > 0:
+            return event.wait(seconds)
+        return event.is_set()
+
+
+class SimulatedClock:
+    """
+    A clock that runs faster than real time
+
+    Simulated time advances `scale` times faster than the monotonic clock, so
+    sleeps shrink by the same factor while threads keep their relative timing.
+    """
+
+    def __init__(self, start=None, scale=20.0):
+        """
+        Initialize the simulated clock
+
+        Args:
+            start: Simulated Unix timestamp at creation (defaults to now)
+            scale: How many simulated seconds pass per real second
+        """
+        self.scale = scale
+        self._lock = threading.Lock()
+        self._start = time.time() if start is None else start
+        self._real_start = time.monotonic()
+
+    def time(self):
+        """Current simulated Unix timestamp"""
+        with self._lock:
+            return self._start + (time.monotonic() - self._real_start) * self.scale
+
+    def now(self):
+        """Current simulated local datetime"""
+        return datetime.datetime.fromtimestamp(self.time())
+
+    def sleep(self, seconds):
+        """Sleep for a number of simulated seconds"""
+        if seconds > 0:
+            time.sleep(seconds / self.scale)
+
+    def sleep_until(self, timestamp, event=None):
+        """
+        Sleep until a simulated Unix timestamp
+
+        Returns:
+            True if the optional threading.Event was set first
+        """
+        if event is not None:
+            return self.wait(event, timestamp - self.time())
+        self.sleep(timestamp - self.time())
+        return False
+
+    def wait(self, event, seconds):
+        """Wait for a threading.Event for up to a number of simulated seconds; True if it was set"""
+        if seconds > 0:
+            return event.wait(seconds / self.scale)
+        return event.is_set()
+
+    def set(self, timestamp):
+        """Jump the simulated clock to a Unix timestamp"""
+        with self._lock:
+            self._start = timestamp
+            self._real_start = time.monotonic()
+
+
+SYSTEM_CLOCK = SystemClock()
@@ -1,24 +1,25 @@
 const fs = require('fs');
 const path = require('path');
 
-// Define the source Python files
+// Source and destination directories
+const sourceDir = './';
+const destDir = './src/python';
+
+// Every top-level module is copied, so the bridges' imports resolve in a packaged build
+// (setup.py is the installer for the CLI, not a module)
+const excludedModules = ['setup.py'];
+const pythonModules = fs.readdirSync(sourceDir)
+  .filter(file => file.endsWith('.py') && !excludedModules.includes(file))
+  .sort();
+
+// Define the source files
 const pythonFiles = [
-  'minecraft_auth.py',
-  'name_utils.py',
-  'sniper.py',
-  'notifications.py',
-  'easy_sniper.py',
-  'advanced_sniper.py',
-  'minecraft_sniper.py',
+  ...pythonModules,
   'notification_config.json',
   'requirements.txt',
   '.env.example'
 ];
 
-// Source and destination directories
-const sourceDir = './';
-const destDir = './src/python';
-
 // Ensure the destination directory exists
 if (!fs.existsSync(destDir)) {
   fs.mkdirSync(destDir, { recursive: true });
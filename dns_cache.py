@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper DNS Cache
+
+Every new connection to api.mojang.com or api.minecraftservices.com resolves
+the host through the system resolver, and a slow resolver adds its latency to
+whichever request opens the connection, possibly the claim. install_dns_cache() wraps
+socket.getaddrinfo with an in-process cache, so requests, urllib3 and anything
+else in the process share it.
+
+Entries live for a fixed TTL. A background thread re-resolves the API hosts
+and any recently used entry shortly before it expires, and a failed refresh
+keeps serving the last good answer. During a snipe window the API hosts are
+pinned: their addresses are not refreshed or expired until the window ends,
+so every connection opened during the window goes to the same servers.
+"""
+
+import os
+import time
+import socket
+import logging
+import argparse
+import threading
+import contextlib
+import statistics
+from colorama import Fore, init
+
+from session_recorder import record_event
+
+# Constants
+DNS_CACHE_ENABLED = os.environ.get("SNIPER_DNS_CACHE", "1") != "0"
+DNS_TTL = 60  # seconds an answer is served without refreshing it
+REFRESH_AHEAD = 15  # seconds before expiry the background thread re-resolves an entry
+REFRESH_INTERVAL = 5  # seconds between background refresh passes
+IDLE_EXPIRY = 600  # seconds without a lookup after which an entry is no longer refreshed
+PREFETCH_HOSTS = ("api.mojang.com", "api.minecraftservices.com")
+MAX_TIMINGS = 100  # Resolution times kept per host
+
+# The resolver the cache falls back to
+_system_getaddrinfo = socket.getaddrinfo
+
+
+def _is_address(host):
+    """True for IP literals, which never need resolving"""
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, host)
+            return True
+        except (OSError, TypeError, ValueError):
+            pass
+    return False
+
+
+class DNSCache:
+    """A TTL cache in front of socket.getaddrinfo"""
+
+    def __init__(self, ttl=DNS_TTL, refresh_ahead=REFRESH_AHEAD, prefetch_hosts=PREFETCH_HOSTS):
+        """
+        Initialize the cache
+
+        Args:
+            ttl: Seconds an answer is served before it is resolved again
+            refresh_ahead: Seconds before expiry that background refresh kicks in
+            prefetch_hosts: Hosts kept warm even when nothing has looked them up lately
+        """
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.prefetch_hosts = set(prefetch_hosts)
+        self.lock = threading.Lock()
+        self.entries = {}  # getaddrinfo arguments -> entry dictionary
+        self.pinned = {}  # host -> number of active pins
+        self.timings = {}  # host -> recent resolution times (ms)
+        self.hits = 0
+        self.misses = 0
+        self._refresher = None
+        self._stop = threading.Event()
+
+    def _resolve(self, key):
+        """Ask the system resolver and time it"""
+        host = key[0]
+        start = time.perf_counter()
+        try:
+            result = _system_getaddrinfo(*key)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            with self.lock:
+                timings = self.timings.setdefault(host, [])
+                timings.append(elapsed_ms)
+                del timings[:-MAX_TIMINGS]
+            record_event("dns", host=host, ms=round(elapsed_ms, 3))
+
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                entry = self.entries[key] = {"last_used": now}
+            entry.update(result=result, resolved_at=now, expires_at=now + self.ttl)
+        return result
+
+    def getaddrinfo(self, host, port, family=0, type=0, proto=0, flags=0):
+        """Drop-in replacement for socket.getaddrinfo"""
+        if not isinstance(host, str) or _is_address(host):
+            return _system_getaddrinfo(host, port, family, type, proto, flags)
+
+        key = (host.lower(), port, family, type, proto, flags)
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and "result" in entry and (now < entry["expires_at"] or self.pinned.get(key[0])):
+                entry["last_used"] = now
+                self.hits += 1
+                return list(entry["result"])
+            self.misses += 1
+
+        try:
+            return list(self._resolve(key))
+        except socket.gaierror:
+            # Serve the last good answer rather than fail a request over a resolver hiccup
+            with self.lock:
+                if entry is not None and "result" in entry:
+                    logging.warning(f"{Fore.YELLOW}Couldn't re-resolve {host}; using the cached addresses")
+                    return list(entry["result"])
+            raise
+
+    def prefetch(self, hosts=None, port=443):
+        """
+        Resolve hosts into the cache the way urllib3 will look them up
+
+        Returns:
+            Dictionary mapping each host to (addresses, resolution ms)
+        """
+        resolved = {}
+        for host in hosts or self.prefetch_hosts:
+            start = time.perf_counter()
+            result = self._resolve((host.lower(), port, 0, socket.SOCK_STREAM, 0, 0))
+            resolved[host] = (sorted({info[4][0] for info in result}), (time.perf_counter() - start) * 1000)
+        return resolved
+
+    @contextlib.contextmanager
+    def pin(self, hosts=None):
+        """
+        Keep the cached addresses of hosts fixed for the duration of the block
+
+        Hosts that aren't cached yet are resolved first. Pins nest.
+        """
+        hosts = [host.lower() for host in (hosts or self.prefetch_hosts)]
+        with self.lock:
+            missing = [host for host in hosts if not any(key[0] == host and "result" in entry
+                                                          for key, entry in self.entries.items())]
+        if missing:
+            try:
+                self.prefetch(missing)
+            except socket.gaierror as e:
+                logging.warning(f"{Fore.YELLOW}Couldn't resolve {', '.join(missing)} before pinning: {str(e)}")
+
+        with self.lock:
+            for host in hosts:
+                self.pinned[host] = self.pinned.get(host, 0) + 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                for host in hosts:
+                    self.pinned[host] -= 1
+                    if not self.pinned[host]:
+                        del self.pinned[host]
+
+    def refresh_due(self):
+        """Re-resolve entries that are about to expire and still in use"""
+        now = time.time()
+        with self.lock:
+            due = [
+                key for key, entry in self.entries.items()
+                if "result" in entry and not self.pinned.get(key[0])
+                and entry["expires_at"] - now < self.refresh_ahead
+                and (key[0] in self.prefetch_hosts or now - entry["last_used"] < IDLE_EXPIRY)
+            ]
+        for key in due:
+            try:
+                self._resolve(key)
+            except socket.gaierror as e:
+                logging.debug(f"Background refresh of {key[0]} failed: {str(e)}")
+        return len(due)
+
+    def _refresh_loop(self):
+        while not self._stop.wait(REFRESH_INTERVAL):
+            try:
+                self.refresh_due()
+            except Exception as e:
+                logging.debug(f"DNS refresh pass failed: {str(e)}")
+
+    def start_refresher(self):
+        """Start the background refresh thread if it isn't running"""
+        if self._refresher is None or not self._refresher.is_alive():
+            self._stop.clear()
+            self._refresher = threading.Thread(target=self._refresh_loop, name="dns-refresh", daemon=True)
+            self._refresher.start()
+
+    def stop_refresher(self):
+        self._stop.set()
+        if self._refresher is not None:
+            self._refresher.join()
+            self._refresher = None
+
+    def stats(self):
+        """Cache counters and resolution times per host"""
+        with self.lock:
+            hosts = {
+                host: {
+                    "lookups": len(timings),
+                    "last_ms": timings[-1],
+                    "median_ms": statistics.median(timings),
+                    "max_ms": max(timings),
+                    "pinned": bool(self.pinned.get(host))
+                }
+                for host, timings in self.timings.items() if timings
+            }
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries), "hosts": hosts}
+
+
+# Process-wide cache behind socket.getaddrinfo
+_cache = []
+_install_lock = threading.Lock()
+
+
+def get_dns_cache():
+    """The process-wide DNSCache, created on first use"""
+    with _install_lock:
+        if not _cache:
+            _cache.append(DNSCache())
+        return _cache[0]
+
+def install_dns_cache():
+    """
+    Route socket.getaddrinfo through the process-wide cache and start refreshing it
+
+    Safe to call more than once. Does nothing when SNIPER_DNS_CACHE=0.
+
+    Returns:
+        The DNSCache, or None if caching is disabled
+    """
+    if not DNS_CACHE_ENABLED:
+        return None
+    cache = get_dns_cache()
+    with _install_lock:
+        if socket.getaddrinfo != cache.getaddrinfo:
+            socket.getaddrinfo = cache.getaddrinfo
+            cache.start_refresher()
+    return cache
+
+def uninstall_dns_cache():
+    """Restore the system resolver"""
+    with _install_lock:
+        if _cache and socket.getaddrinfo == _cache[0].getaddrinfo:
+            socket.getaddrinfo = _system_getaddrinfo
+            _cache[0].stop_refresher()
+
+def pin_hosts(hosts=None):
+    """Pin hosts in the process-wide cache; a no-op context when caching is disabled"""
+    if not DNS_CACHE_ENABLED:
+        return contextlib.nullcontext()
+    return get_dns_cache().pin(hosts)
+
+
+if __name__ == "__main__":
+    init(autoreset=True)
+    parser = argparse.ArgumentParser(description="Compare system and cached DNS resolution of the API hosts")
+    parser.add_argument("hosts", nargs="*", default=list(PREFETCH_HOSTS), help="Hosts to resolve")
+    parser.add_argument("-n", "--lookups", type=int, default=20, help="Cached lookups timed per host")
+    args = parser.parse_args()
+
+    cache = DNSCache()
+    print(f"\n{'Host':<30} {'System':>10} {'Cached':>10}  Addresses")
+    for host in args.hosts:
+        try:
+            addresses, system_ms = cache.prefetch([host])[host]
+        except socket.gaierror as e:
+            print(f"{Fore.RED}{host:<30} {str(e)}")
+            continue
+        start = time.perf_counter()
+        for _ in range(args.lookups):
+            cache.getaddrinfo(host, 443, 0, socket.SOCK_STREAM)
+        cached_ms = (time.perf_counter() - start) * 1000 / args.lookups
+        print(f"{host:<30} {system_ms:>8.2f}ms {cached_ms:>8.4f}ms  {', '.join(addresses)}")
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Drop Time Resolver
+
+This module is the single place drop times are worked out, for the CLI and the
+Electron app alike. Sources are tried in order until one can answer: NameMC's
+availability timestamp first, then the Mojang profile plus the legacy name-history
+endpoint with the 37-day rule. Every source caches its answers in the state store
+with its own TTL, so repeated lookups from either UI make no network calls.
+"""
+
+import re
+import time
+import logging
+import datetime
+from bs4 import BeautifulSoup
+from colorama import Fore
+
+from state_store import get_state_store
+from endpoint_health import LOOKUP_ENDPOINTS
+
+# Constants
+NAMEMC_URL = "https://namemc.com/search?q={username}"
+DROPTIME_PATTERN = r'Availability: <span.+?data-datetime="(\d+)"'
+PROFILE_URL = "https://api.mojang.com/users/profiles/minecraft/{username}"
+NAME_HISTORY_URL = "https://api.mojang.com/user/profiles/{uuid}/names"
+PROFILE_STATUSES = LOOKUP_ENDPOINTS["api.mojang.com"]  # Same reading of the profile lookup as the checks
+NAME_RELEASE_DAYS = 37  # Names become available this long after being changed away from
+CACHE_NAMESPACE = "drop_time:{source}"
+
+# Lookup statuses
+STATUS_AVAILABLE = "available"  # Nobody owns the name
+STATUS_DROPPING = "dropping"  # The name has a known drop time
+STATUS_TAKEN = "taken"  # The name is owned and no drop time could be found
+
+# Per-source request timeouts and cache TTLs (seconds)
+SOURCE_TIMEOUTS = {
+    "namemc": 5,
+    "mojang": 3
+}
+SOURCE_TTLS = {
+    ("namemc", STATUS_DROPPING): 3600,
+    ("namemc", None): 600,  # NameMC had no drop time for the name
+    ("mojang", STATUS_AVAILABLE): 60,
+    ("mojang", STATUS_DROPPING): 3600,
+    ("mojang", STATUS_TAKEN): 600
+}
+HISTORY_DISABLED_TTL = 86400  # How long to stop asking once the name-history endpoint is gone
+
+
+class DropTimeResolver:
+    """Resolve drop times through a cached fallback chain of sources"""
+
+    def __init__(self, request, rate_limit=None, store=None):
+        """
+        Initialize the resolver
+
+        Args:
+            request: Callable (url, timeout=...) returning a requests.Response or None,
+                     normally NameChecker.make_request so lookups share its pooled session
+            rate_limit: Optional callable invoked before every Mojang API request
+            store: StateStore used to cache answers
+        """
+        self.request = request
+        self.rate_limit = rate_limit
+        self.store = store or get_state_store()
+        self.sources = [("namemc", self._from_namemc), ("mojang", self._from_mojang)]
+
+    def resolve(self, username, available=None):
+        """
+        Resolve the drop time for a username
+
+        Args:
+            username: The username to look up
+            available: Result of an availability check made moments ago, if any; it
+                       saves the Mojang profile request whenever it settles the answer
+
+        Returns:
+            Dictionary with username, status (available, dropping, taken or None when no
+            source could answer), drop_time (datetime or None) and source
+        """
+        key = username.lower()
+
+        for source, lookup in self.sources:
+            namespace = CACHE_NAMESPACE.format(source=source)
+            cached = self.store.cache_get(namespace, key)
+
+            if cached is None:
+                try:
+                    answer = lookup(username, available)
+                except Exception as e:
+                    logging.error(f"{Fore.RED}Error getting drop time for {username} from {source}: {str(e)}")
+                    continue
+                if answer is None:
+                    continue  # The source couldn't be reached, so don't cache anything
+
+                cached = {"status": answer[0], "drop_time": answer[1]}
+                ttl = SOURCE_TTLS.get((source, cached["status"]))
+                if ttl:
+                    self.store.cache_set(namespace, key, cached, ttl=ttl)
+
+            if cached["status"] is not None:
+                drop_time = cached["drop_time"]
+                return {
+                    "username": username,
+                    "status": cached["status"],
+                    "drop_time": datetime.datetime.fromtimestamp(drop_time) if drop_time else None,
+                    "source": source
+                }
+
+        return {"username": username, "status": None, "drop_time": None, "source": None}
+
+    def _get(self, source, url):
+        return self.request(url, timeout=SOURCE_TIMEOUTS[source])
+
+    def _from_namemc(self, username, available=None):
+        """Read the availability timestamp from NameMC; status None if it shows none"""
+        response = self._get("namemc", NAMEMC_URL.format(username=username))
+        if not response or response.status_code != 200:
+            return None
+
+        drop_timestamp = parse_namemc_drop_time(response.text)
+        if drop_timestamp and drop_timestamp > time.time():
+            return STATUS_DROPPING, drop_timestamp
+        return None, None
+
+    def _from_mojang(self, username, available=None):
+        """Look the profile up and apply the release rule to its name history"""
+        history_disabled = self.store.cache_get(CACHE_NAMESPACE.format(source="mojang"), "#history_disabled")
+        # Only the name history needs the profile's UUID; otherwise a recent check already has the answer
+        if available is True:
+            return STATUS_AVAILABLE, None
+        if available is False and history_disabled:
+            return STATUS_TAKEN, None
+
+        if self.rate_limit:
+            self.rate_limit()
+        response = self._get("mojang", PROFILE_URL.format(username=username))
+        if response is None:
+            return None
+        available = PROFILE_STATUSES.get(response.status_code)
+        if available is None:
+            return None  # Not an answer about the name (a 404 here has meant an API change)
+        if available:
+            return STATUS_AVAILABLE, None
+
+        uuid = response.json().get("id")
+        if not uuid or history_disabled:
+            return STATUS_TAKEN, None
+
+        if self.rate_limit:
+            self.rate_limit()
+        history = self._get("mojang", NAME_HISTORY_URL.format(uuid=uuid))
+        if history is None:
+            return STATUS_TAKEN, None
+        if history.status_code != 200:
+            # Mojang retired this endpoint; stop spending a request on it for every lookup
+            logging.debug(f"Name history endpoint returned {history.status_code}, skipping it for a while")
+            self.store.cache_set(CACHE_NAMESPACE.format(source="mojang"), "#history_disabled", True, ttl=HISTORY_DISABLED_TTL)
+            return STATUS_TAKEN, None
+
+        for record in history.json():
+            if record.get("name", "").lower() == username.lower() and "changedToAt" in record:
+                available_at = record["changedToAt"] / 1000 + NAME_RELEASE_DAYS * 86400
+                if available_at > time.time():
+                    return STATUS_DROPPING, available_at
+                break
+
+        return STATUS_TAKEN, None
+
+
+def parse_namemc_drop_time(html):
+    """
+    Find the availability timestamp on a NameMC search page
+
+    Returns:
+        Unix timestamp or None
+    """
+    # Look for the drop time with a regex first and fall back to BeautifulSoup
+    match = re.search(DROPTIME_PATTERN, html)
+    if match:
+        return int(match.group(1)) / 1000
+
+    soup = BeautifulSoup(html, 'html.parser')
+    availability_row = soup.find('tr', string=lambda t: t and 'Availability' in t)
+    if availability_row:
+        date_span = availability_row.find('span', attrs={'data-datetime': True})
+        if date_span:
+            return int(date_span['data-datetime']) / 1000
+
+    return None
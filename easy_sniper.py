@@ -9,6 +9,7 @@ Updated and verified working as of October 2023.
 import os
 import sys
 import time
+import argparse
 import datetime
 import traceback
 import colorama
@@ -22,6 +23,7 @@ try:
     from minecraft_auth import MinecraftAuth
     from name_utils import NameChecker
     from sniper import Sniper
+    from profiling import enable_profiling, DEFAULT_PROFILE_FILE
     try:
         from notifications import NotificationManager
         notifications_available = True
@@ -226,28 +228,34 @@ def monitor_username_menu():
         start_time = time.time()
         check_count = 0
         
-        def availability_callback(is_available):
-            """Callback for when username becomes available"""
+        def availability_callback(name, is_available):
+            """Runs after every check, on the sniper's event dispatch thread"""
+            nonlocal check_count
+            check_count += 1
             if is_available:
-                print(f"\n{Fore.GREEN}✓ USERNAME FOUND! '{username}' is now available!")
-                
+                print(f"\n{Fore.GREEN}✓ USERNAME FOUND! '{name}' is now available!")
                 if auto_claim:
                     print(f"\n{Fore.YELLOW}Attempting to claim the username automatically...")
-                    return True  # Signal to auto-claim
                 else:
                     print(f"{Fore.YELLOW}You can claim it now by selecting option 3 from the main menu.")
-                    return False  # Don't auto-claim
         
+        if auto_claim and not sniper.authenticate():
+            print(f"\n{Fore.RED}✗ Authentication failed! Monitoring without claiming.")
+            auto_claim = False
+        
+        claims = []
+        claim_subscription = sniper.events.subscribe(lambda event: claims.append(event.data["success"]),
+                                                     topics=("claim_result",))
         try:
             # This will run until the username becomes available or the user presses Ctrl+C
-            result = sniper.monitor_username(username, check_interval, auto_claim, availability_callback)
+            sniper.monitor_username(username, check_interval, auto_claim, availability_callback)
+            claim_subscription.close()
             
-            if result and result.success:
+            if claims and claims[-1]:
                 print(f"\n{Fore.GREEN}✓ SUCCESS! Username '{username}' has been claimed!")
                 print(f"{Fore.GREEN}Your Minecraft username has been changed to '{username}'.")
-            elif result and not result.success:
+            elif auto_claim:
                 print(f"\n{Fore.RED}✗ Failed to claim username '{username}'.")
-                print(f"{Fore.YELLOW}Error: {result.error}")
                 print(f"{Fore.YELLOW}You can try again by selecting option 3 from the main menu.")
         
         except KeyboardInterrupt:
@@ -531,6 +539,13 @@ def main():
             show_help_menu()
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Easy Minecraft Username Sniper")
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_PROFILE_FILE, metavar="FILE",
+                        help=f"Profile the session and write folded stacks for a flame graph (default: {DEFAULT_PROFILE_FILE})")
+    args = parser.parse_args()
+    if args.profile:
+        enable_profiling(args.profile, "easy_sniper")
+    
     try:
         main()
     except KeyboardInterrupt:
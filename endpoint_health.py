@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Endpoint Health
+
+Availability can be looked up on api.mojang.com or on api.minecraftservices.com.
+When one of them stops answering correctly, asking it first on every check
+doubles the cost of each lookup. This module keeps a circuit breaker per
+endpoint: after a few wrong answers in a row the endpoint is skipped, and it is
+only probed again once its cooldown has passed. The state is saved in the state
+store so every process starts from the last known health and `stats` can show it.
+"""
+
+import time
+import logging
+import threading
+from colorama import Fore
+
+from state_store import get_state_store
+
+# Constants
+HEALTH_DOCUMENT = "endpoint_health"
+FAILURE_THRESHOLD = 3  # Wrong answers in a row before an endpoint is skipped
+PROBE_INTERVAL = 120  # Seconds a skipped endpoint waits before it is tried again
+PERSIST_INTERVAL = 30  # Seconds between saves of the counters when no state changed
+
+# Equivalent availability lookups, most preferred first, and the statuses that answer conclusively
+# (True: the name is free, False: it is taken)
+LOOKUP_ENDPOINTS = {
+    "api.mojang.com": {204: True, 200: False},  # 404 here has meant an API change, not a free name
+    "api.minecraftservices.com": {404: True, 200: False}
+}
+
+# Circuit states
+STATE_CLOSED = "healthy"
+STATE_OPEN = "skipped"
+STATE_HALF_OPEN = "probing"
+
+
+class EndpointHealth:
+    """Circuit breakers for a prioritized list of equivalent endpoints"""
+
+    def __init__(self, endpoints, store=None, failure_threshold=FAILURE_THRESHOLD, probe_interval=PROBE_INTERVAL):
+        """
+        Initialize the health tracker
+
+        Args:
+            endpoints: Endpoint names, most preferred first
+            store: StateStore the health is saved to
+            failure_threshold: Consecutive failures that open an endpoint's circuit
+            probe_interval: Seconds an open circuit waits before a probe is allowed
+        """
+        self.endpoints = list(endpoints)
+        self.store = store or get_state_store()
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.lock = threading.Lock()
+        self.last_saved = 0
+
+        saved = self.store.get_document(HEALTH_DOCUMENT, {})
+        self.health = {
+            endpoint: dict(_new_health(), **saved.get(endpoint, {}))
+            for endpoint in self.endpoints
+        }
+
+    def route(self):
+        """
+        Endpoints to try for the next lookup, in order
+
+        Healthy endpoints come first in priority order. A skipped endpoint is
+        included, ahead of the others, once its probe is due, so only one lookup
+        per interval pays for the probe. If every endpoint is skipped, the one
+        whose probe comes up soonest is tried anyway.
+        """
+        now = time.time()
+        with self.lock:
+            probes, closed = [], []
+            for endpoint in self.endpoints:
+                health = self.health[endpoint]
+                if health["state"] == STATE_CLOSED:
+                    closed.append(endpoint)
+                elif health["state"] in (STATE_OPEN, STATE_HALF_OPEN) and now >= health["open_until"]:
+                    # Let a single lookup probe it; the others keep skipping it meanwhile
+                    health["state"] = STATE_HALF_OPEN
+                    health["open_until"] = now + self.probe_interval
+                    probes.append(endpoint)
+            if probes or closed:
+                return probes + closed
+            return [min(self.endpoints, key=lambda endpoint: self.health[endpoint]["open_until"])]
+
+    def record_success(self, endpoint):
+        """Record a conclusive answer from an endpoint"""
+        with self.lock:
+            health = self.health[endpoint]
+            health["successes"] += 1
+            health["consecutive_failures"] = 0
+            health["last_success"] = time.time()
+            changed = health["state"] != STATE_CLOSED
+            if changed:
+                health["state"] = STATE_CLOSED
+                health["open_until"] = 0
+                logging.info(f"{Fore.GREEN}Lookup endpoint {endpoint} is answering again")
+        self._save(changed)
+
+    def record_failure(self, endpoint, status=None):
+        """Record a wrong or missing answer from an endpoint"""
+        with self.lock:
+            health = self.health[endpoint]
+            health["failures"] += 1
+            health["consecutive_failures"] += 1
+            health["last_failure"] = time.time()
+            health["last_status"] = status
+            changed = health["state"] == STATE_HALF_OPEN or (
+                health["state"] == STATE_CLOSED and health["consecutive_failures"] >= self.failure_threshold
+            )
+            if changed:
+                health["state"] = STATE_OPEN
+                health["open_until"] = time.time() + self.probe_interval
+                outcome = f"returned {status}" if status is not None else "failed to respond"
+                logging.warning(f"{Fore.YELLOW}Lookup endpoint {endpoint} {outcome} "
+                                f"{health['consecutive_failures']} times in a row; skipping it for {self.probe_interval}s")
+        self._save(changed)
+
+    def snapshot(self):
+        """Copy of the health of every endpoint"""
+        with self.lock:
+            return {endpoint: dict(health) for endpoint, health in self.health.items()}
+
+    def _save(self, force=False):
+        now = time.time()
+        if not force and now - self.last_saved < PERSIST_INTERVAL:
+            return
+        self.last_saved = now
+        try:
+            self.store.set_document(HEALTH_DOCUMENT, self.snapshot())
+        except Exception as e:
+            logging.debug(f"Couldn't save endpoint health: {str(e)}")
+
+
+def _new_health():
+    return {
+        "state": STATE_CLOSED,
+        "consecutive_failures": 0,
+        "successes": 0,
+        "failures": 0,
+        "open_until": 0,
+        "last_status": None,
+        "last_success": None,
+        "last_failure": None
+    }
+
+def load_endpoint_health(store=None):
+    """Last saved health of every endpoint, for reports"""
+    store = store or get_state_store()
+    return store.get_document(HEALTH_DOCUMENT, {})
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Event Bus
+
+The monitor and snipe loops publish what happens (each check, availability,
+claims, snipe results) instead of calling consumer code themselves. Every
+subscriber gets its own bounded queue and its own dispatch thread, so a slow
+callback only delays its own later events and never the next check. When a
+subscriber's queue is full its oldest pending event is dropped and counted.
+"""
+
+import time
+import queue
+import logging
+import threading
+from colorama import Fore
+
+# Constants
+DEFAULT_QUEUE_SIZE = 256  # Pending events per subscriber
+DRAIN_TIMEOUT = 5.0  # seconds close() waits for a subscriber to finish its pending events
+
+# Queued to stop a dispatch thread
+_STOP = object()
+
+
+class Event:
+    """Something that happened, with the data published alongside it"""
+
+    __slots__ = ("topic", "data", "timestamp")
+
+    def __init__(self, topic, data):
+        self.topic = topic
+        self.data = data
+        self.timestamp = time.time()
+
+    def __repr__(self):
+        return f"Event({self.topic!r}, {self.data!r})"
+
+
+class Subscription:
+    """A handler with its own bounded queue and dispatch thread"""
+
+    def __init__(self, bus, handler, topics=None, max_queue=DEFAULT_QUEUE_SIZE, name=None):
+        """
+        Initialize the subscription and start its dispatch thread
+
+        Args:
+            bus: EventBus the subscription belongs to
+            handler: Called with each Event on the dispatch thread
+            topics: Topics delivered to the handler, or None for all
+            max_queue: Pending events kept before the oldest are dropped
+            name: Name of the dispatch thread
+        """
+        self.bus = bus
+        self.handler = handler
+        self.topics = frozenset(topics) if topics else None
+        self.queue = queue.Queue(max_queue)
+        self.delivered = 0
+        self.dropped = 0
+        self.failed = 0
+        self.closed = False
+        self._thread = threading.Thread(target=self._dispatch, name=name or "event-subscriber", daemon=True)
+        self._thread.start()
+
+    def wants(self, topic):
+        return self.topics is None or topic in self.topics
+
+    def offer(self, item):
+        """Queue an event without blocking, dropping the oldest pending one if the queue is full"""
+        while True:
+            try:
+                self.queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def _dispatch(self):
+        while True:
+            event = self.queue.get()
+            try:
+                if event is _STOP:
+                    return
+                self.handler(event)
+                self.delivered += 1
+            except Exception as e:
+                self.failed += 1
+                logging.error(f"{Fore.RED}Event handler for {event.topic} failed: {str(e)}")
+                logging.debug("Traceback:", exc_info=True)
+            finally:
+                self.queue.task_done()
+
+    def flush(self, timeout=DRAIN_TIMEOUT):
+        """
+        Wait until every queued event has been handled
+
+        Returns:
+            True if the queue drained within the timeout
+        """
+        deadline = time.monotonic() + timeout
+        with self.queue.all_tasks_done:
+            while self.queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, drain=True, timeout=DRAIN_TIMEOUT):
+        """
+        Stop receiving events and stop the dispatch thread
+
+        Args:
+            drain: Handle the events already queued first
+            timeout: Seconds to wait for the pending events
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self.bus.unsubscribe(self)
+        if not drain:
+            while True:
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                except queue.Empty:
+                    break
+        self.offer(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logging.warning(f"{Fore.YELLOW}Event subscriber {self._thread.name} is still busy after {timeout:.0f}s")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.close()
+        return False
+
+
+class EventBus:
+    """Publish events to subscribers without waiting on them"""
+
+    def __init__(self, max_queue=DEFAULT_QUEUE_SIZE):
+        self.max_queue = max_queue
+        self.lock = threading.Lock()
+        self.subscriptions = []
+
+    def subscribe(self, handler, topics=None, max_queue=None, name=None):
+        """
+        Deliver events to a handler on its own dispatch thread
+
+        Args:
+            handler: Called with each Event
+            topics: Topics to deliver, or None for all
+            max_queue: Pending events kept for this handler (defaults to the bus setting)
+            name: Name of the dispatch thread
+
+        Returns:
+            Subscription; close it to stop delivery
+        """
+        subscription = Subscription(self, handler, topics, max_queue or self.max_queue, name)
+        with self.lock:
+            self.subscriptions = self.subscriptions + [subscription]
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            self.subscriptions = [s for s in self.subscriptions if s is not subscription]
+
+    def publish(self, topic, **data):
+        """Queue an event for every subscriber of its topic; never blocks"""
+        subscriptions = self.subscriptions  # Replaced, never mutated, so no lock is needed to read it
+        if not subscriptions:
+            return
+        event = Event(topic, data)
+        for subscription in subscriptions:
+            if subscription.wants(topic):
+                subscription.offer(event)
+
+    def close(self, drain=True):
+        """Close every subscription"""
+        for subscription in list(self.subscriptions):
+            subscription.close(drain)
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper GC Control
+
+The cyclic garbage collector runs whenever enough container objects have been
+allocated, on whichever thread allocated the last one. A full collection of a
+heap holding BeautifulSoup trees, sessions and cached responses can stop every
+thread for several milliseconds, and inside a snipe window that lands in the
+middle of an attempt loop.
+
+Strategies run their attempt loops inside critical_section(): the heap is
+frozen (moved out of the collector's reach), automatic collection is disabled,
+and both are undone when the last section exits. GCPauseMonitor times every
+collection through gc.callbacks so snipe results can report the pauses they
+saw, and profile_attempts() shows what one attempt iteration allocates.
+"""
+
+import gc
+import os
+import time
+import logging
+import argparse
+import datetime
+import threading
+import contextlib
+import tracemalloc
+from colorama import Fore, Style, init
+
+# Constants
+GC_CONTROL_ENABLED = os.environ.get("SNIPER_GC_CONTROL", "1") != "0"
+PAUSE_WARN_MS = 1.0  # Collections longer than this inside a window are logged
+PROFILE_ATTEMPTS = 200
+PROFILE_TOP = 15
+PROFILE_FRAMES = 10
+
+# Critical section state, shared by every thread
+_lock = threading.Lock()
+_depth = 0
+_restore_enabled = True
+
+
+@contextlib.contextmanager
+def critical_section():
+    """
+    Keep the cyclic GC out of a snipe window
+
+    Sections nest and may be entered from several threads; the heap is frozen
+    and collection disabled when the first one enters, and restored when the
+    last one exits. Set SNIPER_GC_CONTROL=0 to leave the collector alone.
+    """
+    global _depth, _restore_enabled
+    if not GC_CONTROL_ENABLED:
+        yield
+        return
+
+    with _lock:
+        _depth += 1
+        if _depth == 1:
+            _restore_enabled = gc.isenabled()
+            gc.disable()
+            gc.freeze()
+    try:
+        yield
+    finally:
+        with _lock:
+            _depth -= 1
+            if _depth == 0:
+                gc.unfreeze()
+                if _restore_enabled:
+                    gc.enable()
+
+def in_critical_section():
+    """True while any thread is inside a critical section"""
+    return _depth > 0
+
+def collect_before_window():
+    """
+    Run a full collection ahead of a snipe, so the frozen heap holds no garbage
+
+    Returns:
+        (objects collected, seconds taken)
+    """
+    start = time.perf_counter()
+    collected = gc.collect()
+    return collected, time.perf_counter() - start
+
+
+class GCPauseMonitor:
+    """
+    Time every garbage collection while active
+
+    gc.callbacks is process-wide, so a monitor also sees collections triggered
+    by other threads, which is what matters: they pause the snipe just the same.
+    """
+
+    def __init__(self):
+        self.pauses = []
+        self._started = None
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._started = time.perf_counter()
+        elif self._started is not None:
+            self.pauses.append({
+                "at": time.time(),
+                "generation": info["generation"],
+                "collected": info["collected"],
+                "duration_ms": (time.perf_counter() - self._started) * 1000,
+                "in_window": in_critical_section()
+            })
+            self._started = None
+
+    @property
+    def total_ms(self):
+        return sum(pause["duration_ms"] for pause in self.pauses)
+
+    def window_pauses(self):
+        """Pauses that hit while a critical section was active"""
+        return [pause for pause in self.pauses if pause["in_window"]]
+
+    def __enter__(self):
+        gc.callbacks.append(self._callback)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        gc.callbacks.remove(self._callback)
+        for pause in self.window_pauses():
+            if pause["duration_ms"] >= PAUSE_WARN_MS:
+                logging.warning(f"{Fore.YELLOW}Generation {pause['generation']} collection paused the snipe window "
+                                f"for {pause['duration_ms']:.2f}ms")
+        return False
+
+
+def profile_attempts(strategy_name="burst", attempts=PROFILE_ATTEMPTS, frames=PROFILE_FRAMES):
+    """
+    Profile the allocations of a strategy's attempt loop with tracemalloc
+
+    The strategy runs against the tuner's simulated endpoint with the name never
+    released, so every iteration is a failed check. The loop is run once to warm
+    up caches, then again under tracemalloc.
+
+    Returns:
+        Dictionary with the attempts made, the peak traced memory and the
+        retained allocations per source line
+    """
+    # Imported here; sniper imports this module
+    import random
+    from clock import SimulatedClock
+    from strategy_tuner import STRATEGY_CLASSES, SimulatedMojangEndpoint, LatencyModel
+
+    params = {
+        "burst": {"burst_count": attempts, "burst_delay": 0.01},
+        "timing": {"pre_checks": 0, "max_post_attempts": attempts},
+        "distributed": {"thread_count": 4, "attempts_per_thread": max(1, attempts // 4)},
+        "precision": {"attempts": attempts, "pre_window": 0.1, "post_window": attempts * 0.2}
+    }[strategy_name]
+
+    def run():
+        clock = SimulatedClock(scale=500.0)
+        # Released long after the run ends, so no attempt succeeds
+        endpoint = SimulatedMojangEndpoint(clock, clock.time() + 3600, LatencyModel(median_ms=20), random.Random(0),
+                                           request_budget=attempts * 10, competitor_delay=None)
+        strategy = STRATEGY_CLASSES[strategy_name](**params)
+        strategy.clock = clock
+        strategy.execute(endpoint, endpoint, "profiled", datetime.datetime.fromtimestamp(clock.time()))
+        return endpoint.requests
+
+    run()
+    tracemalloc.start(frames)
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        requests_made = run()
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    ignore = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+    stats = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+    return {
+        "strategy": strategy_name,
+        "requests": requests_made,
+        "peak_bytes": peak,
+        "lines": [
+            {
+                "location": f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+                "size_diff": stat.size_diff,
+                "count_diff": stat.count_diff
+            }
+            for stat in stats if stat.size_diff > 0
+        ]
+    }
+
+def display_profile(profile, top=PROFILE_TOP):
+    """Print an allocation profile"""
+    requests_made = max(1, profile["requests"])
+    print(f"\n{Fore.CYAN}Allocation profile: {profile['strategy']} strategy, {profile['requests']} requests{Style.RESET_ALL}")
+    print(f"Peak traced memory during the run: {profile['peak_bytes'] / 1024:.1f} KB "
+          f"({profile['peak_bytes'] / requests_made:.0f} B per request)")
+    print(f"\n{'Retained':>10} {'Blocks':>8} {'B/request':>10}  Location")
+    for line in profile["lines"][:top]:
+        print(f"{line['size_diff']:>10} {line['count_diff']:>8} {line['size_diff'] / requests_made:>10.1f}  {line['location']}")
+
+
+if __name__ == "__main__":
+    init(autoreset=True)
+    parser = argparse.ArgumentParser(description="Inspect garbage collection and allocations in the snipe loops")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    profile_parser = subparsers.add_parser("profile", help="Profile the allocations of a strategy's attempt loop")
+    profile_parser.add_argument("-s", "--strategy", choices=["burst", "timing", "distributed", "precision"], default="burst")
+    profile_parser.add_argument("-n", "--attempts", type=int, default=PROFILE_ATTEMPTS, help="Attempts to run")
+    profile_parser.add_argument("--top", type=int, default=PROFILE_TOP, help="Source lines to show")
+
+    subparsers.add_parser("stats", help="Show the collector's thresholds and per-generation counters")
+    args = parser.parse_args()
+
+    if args.command == "profile":
+        display_profile(profile_attempts(args.strategy, args.attempts), args.top)
+    else:
+        print(f"Enabled: {gc.isenabled()}, thresholds: {gc.get_threshold()}, pending: {gc.get_count()}")
+        for generation, stats in enumerate(gc.get_stats()):
+            print(f"Generation {generation}: {stats['collections']} collections, {stats['collected']} collected, "
+                  f"{stats['uncollectable']} uncollectable")
@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper HTTP Transports
+
+NameChecker, MinecraftAuth and the notification manager send their requests
+through a Transport instead of calling requests directly, so the HTTP client
+can be swapped in one place. Three are available:
+
+- requests: a requests.Session; the default and the most forgiving
+- urllib3: a bare urllib3 PoolManager, skipping the requests layers on top of it
+- httpx: an httpx.Client, speaking HTTP/2 when the h2 package is installed
+
+create_transport() picks one from the SNIPER_HTTP_TRANSPORT env var. Every
+transport raises the requests.exceptions error types, so callers catch the same
+errors whichever is active. transport_benchmark.py compares their overhead.
+"""
+
+import os
+import json
+import time
+import logging
+import datetime
+import urllib.parse
+import requests
+import urllib3
+from requests.structures import CaseInsensitiveDict
+from requests.utils import default_headers
+from colorama import Fore
+
+from session_recorder import attach_recorder, get_recorder
+
+try:
+    import httpx
+    httpx_available = True
+except ImportError:
+    httpx_available = False
+
+try:
+    import h2  # noqa: F401 (only needed by httpx for HTTP/2)
+    h2_available = True
+except ImportError:
+    h2_available = False
+
+# Constants
+TRANSPORT_ENV_VAR = "SNIPER_HTTP_TRANSPORT"
+DEFAULT_TRANSPORT = "requests"
+POOL_MAXSIZE = 10  # Connections kept per host, enough for the distributed strategy's threads
+DRAIN_LIMIT = 16 * 1024  # bytes; larger unread bodies close the connection instead of being drained
+# Follow redirects but never retry, like requests' default adapter
+URLLIB3_RETRIES = urllib3.Retry(total=None, connect=0, read=0, status=0, other=0, redirect=5, raise_on_status=False)
+
+
+class Transport:
+    """Common interface of the HTTP clients"""
+
+    name = None
+
+    def __init__(self):
+        self.headers = CaseInsensitiveDict(default_headers())  # Sent with every request
+
+    def request(self, method, url, headers=None, data=None, json=None, timeout=None, proxies=None, stream=False):
+        """
+        Send a request
+
+        Args:
+            method: HTTP method
+            url: Request URL
+            headers: Headers added to the transport's default headers
+            data: Form fields (dict) or a raw body
+            json: Object sent as a JSON body
+            timeout: Seconds allowed for connecting and for each read
+            proxies: requests-style proxies dictionary ({"https": "http://host:port"})
+            stream: Leave the body unread; pass the response to release() if it isn't read
+
+        Returns:
+            Response with status_code, headers, url, elapsed, content, text and json()
+
+        Raises:
+            requests.exceptions.RequestException subclasses on connection errors and timeouts
+        """
+        raise NotImplementedError("Subclasses must implement request()")
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def prepare(self, method, url, headers=None, json=None):
+        """Build a request ahead of time for send(); headers and body are encoded once"""
+        raise NotImplementedError("Subclasses must implement prepare()")
+
+    def send(self, prepared, timeout=None):
+        """Send a request built by prepare()"""
+        raise NotImplementedError("Subclasses must implement send()")
+
+    def release(self, response):
+        """Return a streamed response's connection to the pool without decoding its body"""
+        response.close()
+
+    def close(self):
+        """Close every pooled connection"""
+
+    def _merge_headers(self, headers):
+        merged = CaseInsensitiveDict(self.headers)
+        if headers:
+            merged.update(headers)
+        return merged
+
+    def _encode_body(self, headers, data, json_body):
+        """Encode a request body the way requests does, setting Content-Type if missing"""
+        if json_body is not None:
+            headers.setdefault("Content-Type", "application/json")
+            return json.dumps(json_body).encode("utf-8")
+        if isinstance(data, dict):
+            headers.setdefault("Content-Type", "application/x-www-form-urlencoded")
+            return urllib.parse.urlencode(data).encode("utf-8")
+        if isinstance(data, str):
+            return data.encode("utf-8")
+        return data
+
+    def _record(self, method, url, response):
+        recorder = get_recorder()
+        if recorder is not None:
+            size = response.headers.get("Content-Length")
+            recorder.record_request(method, url, response.status_code, response.elapsed.total_seconds(),
+                                    size=int(size) if size and size.isdigit() else None)
+
+
+class RequestsTransport(Transport):
+    """requests.Session with the session recorder attached"""
+
+    name = "requests"
+
+    def __init__(self):
+        self.session = attach_recorder(requests.Session())
+        adapter = requests.adapters.HTTPAdapter(pool_maxsize=POOL_MAXSIZE)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.headers = self.session.headers
+
+    def request(self, method, url, headers=None, data=None, json=None, timeout=None, proxies=None, stream=False):
+        return self.session.request(method, url, headers=headers, data=data, json=json, timeout=timeout,
+                                    proxies=proxies, stream=stream)
+
+    def prepare(self, method, url, headers=None, json=None):
+        prepared = self.session.prepare_request(requests.Request(method, url, headers=headers, json=json))
+        settings = self.session.merge_environment_settings(prepared.url, {}, None, None, None)
+        return prepared, settings
+
+    def send(self, prepared, timeout=None):
+        prepared, settings = prepared
+        return self.session.send(prepared, timeout=timeout, **settings)
+
+    def release(self, response):
+        if _drainable(response):
+            response.raw.drain_conn()
+            response.raw.release_conn()
+        else:
+            response.close()
+
+    def close(self):
+        self.session.close()
+
+
+class Urllib3Response:
+    """The parts of requests.Response the callers use, over a urllib3 response"""
+
+    def __init__(self, raw, url, elapsed):
+        self.raw = raw
+        self.url = url
+        self.status_code = raw.status
+        self.headers = raw.headers
+        self.elapsed = datetime.timedelta(seconds=elapsed)
+
+    @property
+    def content(self):
+        return self.raw.data
+
+    @property
+    def text(self):
+        return _decode(self.content, self.headers.get("Content-Type"))
+
+    def json(self):
+        return json.loads(self.content)
+
+    def close(self):
+        self.raw.close()
+
+
+class Urllib3Transport(Transport):
+    """A bare urllib3 PoolManager, with one ProxyManager per proxy in use"""
+
+    name = "urllib3"
+
+    def __init__(self):
+        super().__init__()
+        self.pool = urllib3.PoolManager(maxsize=POOL_MAXSIZE, retries=URLLIB3_RETRIES)
+        self.proxy_pools = {}
+
+    def _pool_for(self, url, proxies):
+        proxy = _proxy_for(url, proxies)
+        if not proxy:
+            return self.pool
+        if proxy not in self.proxy_pools:
+            self.proxy_pools[proxy] = urllib3.ProxyManager(proxy, maxsize=POOL_MAXSIZE, retries=URLLIB3_RETRIES)
+        return self.proxy_pools[proxy]
+
+    def _urlopen(self, pool, method, url, body, headers, timeout, stream):
+        start = time.perf_counter()
+        try:
+            raw = pool.urlopen(method, url, body=body, headers=headers, timeout=timeout,
+                               preload_content=not stream, decode_content=True)
+        except urllib3.exceptions.HTTPError as e:
+            raise _requests_error(e, url) from e
+        response = Urllib3Response(raw, url, time.perf_counter() - start)
+        self._record(method, url, response)
+        return response
+
+    def request(self, method, url, headers=None, data=None, json=None, timeout=None, proxies=None, stream=False):
+        headers = self._merge_headers(headers)
+        body = self._encode_body(headers, data, json)
+        return self._urlopen(self._pool_for(url, proxies), method, url, body, dict(headers), timeout, stream)
+
+    def prepare(self, method, url, headers=None, json=None):
+        headers = self._merge_headers(headers)
+        body = self._encode_body(headers, None, json)
+        return method, url, body, dict(headers)
+
+    def send(self, prepared, timeout=None):
+        method, url, body, headers = prepared
+        return self._urlopen(self.pool, method, url, body, headers, timeout, False)
+
+    def release(self, response):
+        if _drainable(response):
+            response.raw.drain_conn()
+            response.raw.release_conn()
+        else:
+            response.raw.close()
+
+    def close(self):
+        self.pool.clear()
+        for pool in self.proxy_pools.values():
+            pool.clear()
+
+
+class HttpxTransport(Transport):
+    """An httpx.Client per proxy, using HTTP/2 where the server and h2 allow it"""
+
+    name = "httpx"
+
+    def __init__(self):
+        if not httpx_available:
+            raise ImportError("The httpx transport needs the httpx package (pip install 'httpx[http2]')")
+        super().__init__()
+        self.clients = {}
+        self.client = self._client_for(None)
+
+    def _client_for(self, proxy):
+        if proxy not in self.clients:
+            limits = httpx.Limits(max_keepalive_connections=POOL_MAXSIZE)
+            # Newer httpx takes proxy=, older versions proxies=
+            proxy_argument = {"proxy": proxy} if "proxy" in httpx.Client.__init__.__code__.co_varnames else {"proxies": proxy}
+            self.clients[proxy] = httpx.Client(http2=h2_available, limits=limits, follow_redirects=True,
+                                               **(proxy_argument if proxy else {}))
+        return self.clients[proxy]
+
+    def _send(self, client, request, timeout, stream):
+        request.extensions["timeout"] = httpx.Timeout(timeout).as_dict()
+        start = time.perf_counter()
+        try:
+            response = client.send(request, stream=stream)
+        except httpx.HTTPError as e:
+            raise _requests_error(e, str(request.url)) from e
+        # Streamed responses only get an elapsed time once closed; time up to the headers like requests does
+        response.elapsed = datetime.timedelta(seconds=time.perf_counter() - start)
+        self._record(request.method, str(request.url), response)
+        return response
+
+    def request(self, method, url, headers=None, data=None, json=None, timeout=None, proxies=None, stream=False):
+        client = self._client_for(_proxy_for(url, proxies))
+        headers = self._merge_headers(headers)
+        body = self._encode_body(headers, data, json)
+        request = client.build_request(method, url, headers=dict(headers), content=body)
+        return self._send(client, request, timeout, stream)
+
+    def prepare(self, method, url, headers=None, json=None):
+        headers = self._merge_headers(headers)
+        body = self._encode_body(headers, None, json)
+        return self.client.build_request(method, url, headers=dict(headers), content=body)
+
+    def send(self, prepared, timeout=None):
+        return self._send(self.client, prepared, timeout, False)
+
+    def release(self, response):
+        if _drainable(response):
+            response.read()
+        response.close()
+
+    def close(self):
+        for client in self.clients.values():
+            client.close()
+
+
+def _proxy_for(url, proxies):
+    """The proxy URL a requests-style proxies dictionary gives for a URL, or None"""
+    if not proxies:
+        return None
+    return proxies.get(urllib.parse.urlsplit(url).scheme) or proxies.get("all") or None
+
+def _drainable(response):
+    """
+    Whether an unread body is small enough to read off the socket, keeping the connection alive
+
+    A large or unknown-length body closes the connection instead.
+    """
+    length = response.headers.get("Content-Length")
+    return response.status_code in (204, 304) or bool(length and length.isdigit() and int(length) <= DRAIN_LIMIT)
+
+def _decode(content, content_type):
+    """Decode a body using the charset of its Content-Type, defaulting to UTF-8"""
+    charset = "utf-8"
+    for parameter in (content_type or "").split(";")[1:]:
+        name, _, value = parameter.strip().partition("=")
+        if name.lower() == "charset" and value:
+            charset = value.strip('"')
+    try:
+        return content.decode(charset, errors="replace")
+    except LookupError:
+        return content.decode("utf-8", errors="replace")
+
+def _requests_error(error, url):
+    """Map a urllib3 or httpx error to the requests exception callers already handle"""
+    exceptions = requests.exceptions
+    if isinstance(error, urllib3.exceptions.MaxRetryError) and error.reason is not None:
+        error = error.reason
+    message = f"{type(error).__name__}: {error} ({url})"
+    if isinstance(error, urllib3.exceptions.ProxyError) or (httpx_available and isinstance(error, httpx.ProxyError)):
+        return exceptions.ProxyError(message)
+    if isinstance(error, urllib3.exceptions.SSLError):
+        return exceptions.SSLError(message)
+    if isinstance(error, urllib3.exceptions.NewConnectionError):
+        return exceptions.ConnectionError(message)
+    if isinstance(error, urllib3.exceptions.ConnectTimeoutError) or (httpx_available and isinstance(error, httpx.ConnectTimeout)):
+        return exceptions.ConnectTimeout(message)
+    if isinstance(error, urllib3.exceptions.TimeoutError) or (httpx_available and isinstance(error, httpx.TimeoutException)):
+        return exceptions.ReadTimeout(message)
+    if httpx_available and isinstance(error, httpx.ConnectError) and "SSL" in str(error):
+        return exceptions.SSLError(message)
+    return exceptions.ConnectionError(message)
+
+
+TRANSPORTS = {
+    "requests": RequestsTransport,
+    "urllib3": Urllib3Transport,
+    "httpx": HttpxTransport
+}
+
+
+def create_transport(kind=None):
+    """
+    Create the configured HTTP transport
+
+    Args:
+        kind: requests, urllib3 or httpx; defaults to SNIPER_HTTP_TRANSPORT, then requests
+
+    Returns:
+        Transport
+    """
+    kind = (kind or os.environ.get(TRANSPORT_ENV_VAR) or DEFAULT_TRANSPORT).lower()
+    if kind not in TRANSPORTS:
+        logging.warning(f"{Fore.YELLOW}Unknown HTTP transport '{kind}', using {DEFAULT_TRANSPORT}")
+        kind = DEFAULT_TRANSPORT
+    if kind == "httpx" and not httpx_available:
+        logging.warning(f"{Fore.YELLOW}httpx isn't installed, using the {DEFAULT_TRANSPORT} transport")
+        kind = DEFAULT_TRANSPORT
+    return TRANSPORTS[kind]()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Logging Setup
+
+Logging calls only put the record on an in-memory queue. A single listener thread
+formats the records and writes them to the console and to a size-rotated, gzipped
+log file, so log I/O never runs on a thread that is about to send a request.
+
+Strategies log through HOT_LOGGER with lazy %-style arguments, so nothing is
+formatted at all when its level is disabled.
+"""
+
+import os
+import sys
+import gzip
+import queue
+import atexit
+import shutil
+import logging
+import logging.handlers
+
+# Constants
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+CONSOLE_FORMAT = '%(message)s'
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 5
+HOT_LOGGER_NAME = "sniper.hot"
+
+# Logger for code inside the snipe window
+HOT_LOGGER = logging.getLogger(HOT_LOGGER_NAME)
+
+_listener = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves all formatting to the listener thread"""
+
+    def prepare(self, record):
+        # The stock handler formats the message here, on the logging thread
+        return record
+
+
+def _gzip_namer(name):
+    return name + ".gz"
+
+def _gzip_rotator(source, dest):
+    """Compress the rotated log file"""
+    with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+def setup_logging(log_file=None, level=logging.INFO, hot_level=None, console=True, console_format=LOG_FORMAT):
+    """
+    Route all logging through a queue to a background listener
+
+    Args:
+        log_file: Optional log file, rotated at LOG_MAX_BYTES and compressed with gzip
+        level: Root logging level
+        hot_level: Level of HOT_LOGGER (defaults to following the root level)
+        console: Whether to also log to stdout
+        console_format: Format string for the console handler
+
+    Returns:
+        The running QueueListener
+    """
+    global _listener
+
+    handlers = []
+    if console:
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(logging.Formatter(console_format))
+        handlers.append(stream_handler)
+
+    if log_file:
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+        file_handler.namer = _gzip_namer
+        file_handler.rotator = _gzip_rotator
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        handlers.append(file_handler)
+
+    # Replace any previous setup so calling this twice doesn't duplicate output
+    stop_logging()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(DeferredQueueHandler(log_queue))
+    root.setLevel(level)
+    HOT_LOGGER.setLevel(hot_level if hot_level is not None else logging.NOTSET)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def stop_logging():
+    """Flush the queue and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(stop_logging)
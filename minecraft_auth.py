@@ -7,18 +7,20 @@ It implements the Microsoft OAuth flow for Minecraft/Xbox authentication.
 Updated with the latest OAuth flow as of 2023.
 """
 
-import os
-import json
 import time
 import urllib.parse
 import webbrowser
-import requests
 import logging
 import threading
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from colorama import Fore, Style
 import socket
 
+from state_store import get_state_store
+from http_transport import create_transport
+from dns_cache import install_dns_cache
+from request_context import DeadlineExceeded, SnipeCancelled, request_timeout
+
 # Constants for Microsoft OAuth
 CLIENT_ID = "1e0a5a15-02ea-472a-b765-7b3a5c5c9d09"  # Official Minecraft Launcher client ID
 REDIRECT_URI = "http://localhost:8000/auth"
@@ -32,8 +34,14 @@ MINECRAFT_AUTH_URL = "https://api.minecraftservices.com/authentication/login_wit
 MINECRAFT_PROFILE_URL = "https://api.minecraftservices.com/minecraft/profile"
 MINECRAFT_NAME_CHANGE_URL = "https://api.minecraftservices.com/minecraft/profile/name/{username}"
 
+# Seconds before an auth or profile request is abandoned; capped by an active deadline
+AUTH_TIMEOUT = 10
+# Seconds a successful token validation is trusted before a claim validates again
+TOKEN_VALIDATION_TTL = 300
+
 # Auth token cache file
 AUTH_CACHE_FILE = "auth_cache.json"
+AUTH_CACHE_KEY = "credentials"
 
 # OAuth server for callback handling
 class AuthCallbackHandler(BaseHTTPRequestHandler):
@@ -125,36 +133,42 @@ class AuthCallbackHandler(BaseHTTPRequestHandler):
 class MinecraftAuth:
     """Handle Minecraft authentication via Microsoft OAuth"""
     
-    def __init__(self, cache_file=AUTH_CACHE_FILE):
+    def __init__(self, cache_file=AUTH_CACHE_FILE, store=None):
         """Initialize the authentication handler"""
         self.access_token = None
         self.refresh_token = None
         self.minecraft_token = None
         self.minecraft_profile = None
         self.token_expires_at = 0
+        self.token_validated_at = 0
+        self.prepared_claims = {}  # Name change requests built ahead of a snipe
         self.cache_file = cache_file
+        self.store = store or get_state_store()
+        install_dns_cache()
+        self.transport = create_transport()
+        
+        # Import a legacy cache file once, then use the state store from here on
+        self.store.migrate_auth_cache(self.cache_file, key=AUTH_CACHE_KEY)
         
         # Try to load cached credentials
         self._load_cached_credentials()
     
     def _load_cached_credentials(self):
-        """Load cached credentials from file if available"""
+        """Load cached credentials from the state store if available"""
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, "r") as f:
-                    data = json.load(f)
-                    
-                    self.access_token = data.get("access_token")
-                    self.refresh_token = data.get("refresh_token")
-                    self.minecraft_token = data.get("minecraft_token")
-                    self.token_expires_at = data.get("expires_at", 0)
-                    
-                    # Check if the token is still valid
-                    if self.token_expires_at > time.time():
-                        # Validate the Minecraft token
-                        if self.minecraft_token and self.validate_minecraft_token():
-                            logging.info(f"{Fore.GREEN}Loaded valid cached credentials")
-                            return True
+            data = self.store.cache_get("auth", AUTH_CACHE_KEY)
+            if data:
+                self.access_token = data.get("access_token")
+                self.refresh_token = data.get("refresh_token")
+                self.minecraft_token = data.get("minecraft_token")
+                self.token_expires_at = data.get("expires_at", 0)
+                
+                # Check if the token is still valid
+                if self.token_expires_at > time.time():
+                    # Validate the Minecraft token
+                    if self.minecraft_token and self.validate_minecraft_token():
+                        logging.info(f"{Fore.GREEN}Loaded valid cached credentials")
+                        return True
         except Exception as e:
             logging.error(f"{Fore.RED}Error loading cached credentials: {str(e)}")
         
@@ -166,15 +180,14 @@ class MinecraftAuth:
         return False
     
     def _save_cached_credentials(self):
-        """Save credentials to cache file"""
+        """Save credentials to the state store"""
         try:
-            with open(self.cache_file, "w") as f:
-                json.dump({
-                    "access_token": self.access_token,
-                    "refresh_token": self.refresh_token,
-                    "minecraft_token": self.minecraft_token,
-                    "expires_at": self.token_expires_at
-                }, f)
+            self.store.cache_set("auth", AUTH_CACHE_KEY, {
+                "access_token": self.access_token,
+                "refresh_token": self.refresh_token,
+                "minecraft_token": self.minecraft_token,
+                "expires_at": self.token_expires_at
+            })
             logging.debug("Credentials cached successfully")
         except Exception as e:
             logging.error(f"{Fore.RED}Error caching credentials: {str(e)}")
@@ -214,7 +227,7 @@ class MinecraftAuth:
                 "grant_type": "refresh_token"
             }
             
-            response = requests.post(MICROSOFT_TOKEN_URL, data=payload)
+            response = self.transport.post(MICROSOFT_TOKEN_URL, data=payload, timeout=request_timeout(AUTH_TIMEOUT))
             
             if response.status_code == 200:
                 token_data = response.json()
@@ -314,7 +327,7 @@ class MinecraftAuth:
             "grant_type": "authorization_code"
         }
         
-        response = requests.post(MICROSOFT_TOKEN_URL, data=payload)
+        response = self.transport.post(MICROSOFT_TOKEN_URL, data=payload, timeout=request_timeout(AUTH_TIMEOUT))
         
         if response.status_code == 200:
             token_data = response.json()
@@ -343,7 +356,7 @@ class MinecraftAuth:
                 "scope": SCOPE
             }
             
-            response = requests.post(MICROSOFT_DEVICE_AUTH_URL, data=payload)
+            response = self.transport.post(MICROSOFT_DEVICE_AUTH_URL, data=payload, timeout=request_timeout(AUTH_TIMEOUT))
             
             if response.status_code != 200:
                 logging.error(f"{Fore.RED}Failed to start device code flow: {response.status_code}")
@@ -390,7 +403,7 @@ class MinecraftAuth:
                     "grant_type": "urn:ietf:params:oauth:grant-type:device_code"
                 }
                 
-                token_response = requests.post(MICROSOFT_TOKEN_URL, data=token_payload)
+                token_response = self.transport.post(MICROSOFT_TOKEN_URL, data=token_payload, timeout=request_timeout(AUTH_TIMEOUT))
                 
                 if token_response.status_code == 200:
                     # Success
@@ -437,7 +450,7 @@ class MinecraftAuth:
         try:
             # Step 1: Authenticate with Xbox Live
             logging.info(f"{Fore.CYAN}Authenticating with Xbox Live...")
-            xbox_response = requests.post(
+            xbox_response = self.transport.post(
                 XBOX_AUTH_URL,
                 json={
                     "Properties": {
@@ -448,7 +461,8 @@ class MinecraftAuth:
                     "RelyingParty": "http://auth.xboxlive.com",
                     "TokenType": "JWT"
                 },
-                headers={"Content-Type": "application/json"}
+                headers={"Content-Type": "application/json"},
+                timeout=request_timeout(AUTH_TIMEOUT)
             )
             
             if xbox_response.status_code != 200:
@@ -461,7 +475,7 @@ class MinecraftAuth:
             
             # Step 2: Get XSTS token
             logging.info(f"{Fore.CYAN}Getting XSTS token...")
-            xsts_response = requests.post(
+            xsts_response = self.transport.post(
                 XSTS_AUTH_URL,
                 json={
                     "Properties": {
@@ -471,7 +485,8 @@ class MinecraftAuth:
                     "RelyingParty": "rp://api.minecraftservices.com/",
                     "TokenType": "JWT"
                 },
-                headers={"Content-Type": "application/json"}
+                headers={"Content-Type": "application/json"},
+                timeout=request_timeout(AUTH_TIMEOUT)
             )
             
             if xsts_response.status_code != 200:
@@ -483,12 +498,13 @@ class MinecraftAuth:
             
             # Step 3: Authenticate with Minecraft
             logging.info(f"{Fore.CYAN}Authenticating with Minecraft services...")
-            minecraft_response = requests.post(
+            minecraft_response = self.transport.post(
                 MINECRAFT_AUTH_URL,
                 json={
                     "identityToken": f"XBL3.0 x={user_hash};{xsts_token}"
                 },
-                headers={"Content-Type": "application/json"}
+                headers={"Content-Type": "application/json"},
+                timeout=request_timeout(AUTH_TIMEOUT)
             )
             
             if minecraft_response.status_code != 200:
@@ -539,14 +555,17 @@ class MinecraftAuth:
                 "Authorization": f"Bearer {self.minecraft_token}"
             }
             
-            response = requests.get(MINECRAFT_PROFILE_URL, headers=headers)
+            response = self.transport.get(MINECRAFT_PROFILE_URL, headers=headers, timeout=request_timeout(AUTH_TIMEOUT))
             
             if response.status_code == 200:
                 # Store profile data for later use
                 self.minecraft_profile = response.json()
+                self.token_validated_at = time.time()
                 return True
                 
             return False
+        except (DeadlineExceeded, SnipeCancelled):
+            raise
         except Exception as e:
             logging.error(f"{Fore.RED}Error validating Minecraft token: {str(e)}")
             return False
@@ -558,11 +577,12 @@ class MinecraftAuth:
             return False
         
         try:
-            response = requests.get(
+            response = self.transport.get(
                 MINECRAFT_PROFILE_URL,
                 headers={
                     "Authorization": f"Bearer {self.minecraft_token}"
-                }
+                },
+                timeout=request_timeout(AUTH_TIMEOUT)
             )
             
             if response.status_code == 200:
@@ -594,20 +614,12 @@ class MinecraftAuth:
                 logging.error(f"{Fore.RED}Not authenticated. Call authenticate() first")
                 return False
             
-            # Validate the token before attempting to change the name
-            if not self.validate_minecraft_token():
+            # Validate the token first, unless that was done recently (e.g. by the readiness checks)
+            if time.time() - self.token_validated_at > TOKEN_VALIDATION_TTL and not self.validate_minecraft_token():
                 logging.error(f"{Fore.RED}Invalid or expired Minecraft token")
                 return False
             
-            # Updated URL construction to avoid 404 errors
-            url = f"https://api.minecraftservices.com/minecraft/profile/name/{new_username}"
-            headers = {
-                "Authorization": f"Bearer {self.minecraft_token}",
-                "Content-Type": "application/json"
-            }
-            
-            # The API requires a PUT request with an empty body
-            response = requests.put(url, headers=headers, json={})
+            response = self.transport.send(self.prepare_name_change(new_username), timeout=request_timeout(AUTH_TIMEOUT))
             
             if response.status_code == 200:
                 logging.info(f"{Fore.GREEN}Successfully changed username to '{new_username}'")
@@ -622,6 +634,7 @@ class MinecraftAuth:
                 return False
             elif response.status_code == 401:
                 logging.error(f"{Fore.RED}Authentication error (401)")
+                self.token_validated_at = 0
                 return False
             elif response.status_code == 403:
                 logging.error(f"{Fore.RED}Not eligible for name change (403)")
@@ -640,10 +653,40 @@ class MinecraftAuth:
                     logging.error(f"{Fore.RED}Response text: {response.text}")
                 return False
                 
+        except (DeadlineExceeded, SnipeCancelled):
+            raise
         except Exception as e:
             logging.error(f"{Fore.RED}Error changing username: {str(e)}")
             return False
     
+    def prepare_name_change(self, new_username):
+        """
+        Build the name change request ahead of time
+        
+        The request is cached per username until the Minecraft token changes, so
+        claims inside the snipe window only have to send it.
+        
+        Returns:
+            Prepared request for transport.send()
+        """
+        key = new_username.lower()
+        cached = self.prepared_claims.get(key)
+        if cached and cached[0] == self.minecraft_token:
+            return cached[1]
+        
+        # The API requires a PUT request with an empty body
+        prepared = self.transport.prepare(
+            "PUT",
+            MINECRAFT_NAME_CHANGE_URL.format(username=new_username),
+            headers={
+                "Authorization": f"Bearer {self.minecraft_token}",
+                "Content-Type": "application/json"
+            },
+            json={}
+        )
+        self.prepared_claims[key] = (self.minecraft_token, prepared)
+        return prepared
+    
     def get_current_username(self):
         """Get the current username of the authenticated account"""
         if not self.minecraft_profile:
@@ -676,7 +719,7 @@ class MinecraftAuth:
             url = "https://api.minecraftservices.com/minecraft/profile/namechange"
             headers = {"Authorization": f"Bearer {self.minecraft_token}"}
             
-            response = requests.get(url, headers=headers)
+            response = self.transport.get(url, headers=headers, timeout=request_timeout(AUTH_TIMEOUT))
             
             if response.status_code == 200:
                 data = response.json()
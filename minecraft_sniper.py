@@ -6,7 +6,6 @@ A tool for checking, monitoring, and claiming Minecraft usernames when they beco
 """
 
 import os
-import sys
 import time
 import json
 import logging
@@ -16,21 +15,16 @@ from colorama import Fore, Style, init
 from dotenv import load_dotenv
 
 from minecraft_auth import MinecraftAuth
+from profiling import enable_profiling, DEFAULT_PROFILE_FILE
+from log_setup import setup_logging
 from name_utils import NameChecker
 from sniper import Sniper
 
 # Initialize colorama
 init(autoreset=True)
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("sniper.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Set up logging on a background thread with a rotating log file
+setup_logging("sniper.log")
 
 def display_banner():
     """Display a cool banner for the tool"""
@@ -143,6 +137,8 @@ Examples:
                     help="Use authentication (requires .env file or interactive login)")
     parser.add_argument("-v", "--verbose", action="store_true", 
                     help="Enable verbose output for debugging")
+    parser.add_argument("--profile", nargs="?", const=DEFAULT_PROFILE_FILE, metavar="FILE",
+                    help=f"Profile the command and write folded stacks for a flame graph (default: {DEFAULT_PROFILE_FILE})")
     
     return parser.parse_args()
 
@@ -167,6 +163,9 @@ def main():
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.profile:
+        enable_profiling(args.profile, args.command)
+    
     # Display banner and disclaimer
     display_banner()
     display_disclaimer()
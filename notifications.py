@@ -10,7 +10,6 @@ import os
 import json
 import smtplib
 import logging
-import requests
 import platform
 import threading
 from email.mime.text import MIMEText
@@ -18,20 +17,31 @@ from email.mime.multipart import MIMEMultipart
 from colorama import Fore
 from datetime import datetime
 
+from state_store import get_state_store
+from http_transport import create_transport
+
 # Constants
 CONFIG_FILE = "notification_config.json"
+CONFIG_DOCUMENT = "notification_config"
 
 class NotificationManager:
     """Handles various notification methods"""
     
-    def __init__(self, config_file=CONFIG_FILE):
+    def __init__(self, config_file=CONFIG_FILE, store=None):
         """Initialize the notification manager with configuration"""
         self.config_file = config_file
+        self.store = store or get_state_store()
         self.config = self._load_config()
         self.notification_threads = []
+        self.transport = create_transport()
+        
+        # Notifications held back while a snipe window is open
+        self.paused = False
+        self.deferred = []
+        self.pause_lock = threading.Lock()
     
     def _load_config(self):
-        """Load notification configuration from file"""
+        """Load notification configuration from the state store or config file"""
         default_config = {
             "discord": {
                 "enabled": False,
@@ -60,41 +70,37 @@ class NotificationManager:
             }
         }
         
-        # Create default config file if it doesn't exist
-        if not os.path.exists(self.config_file):
+        # A hand-edited config file newer than the stored copy takes precedence
+        config = self.store.get_document(CONFIG_DOCUMENT)
+        stored_at = self.store.get_document_updated_at(CONFIG_DOCUMENT) or 0
+        if os.path.exists(self.config_file) and os.path.getmtime(self.config_file) > stored_at:
             try:
-                with open(self.config_file, 'w') as f:
-                    json.dump(default_config, f, indent=4)
-                logging.info(f"{Fore.GREEN}Created default notification configuration at {self.config_file}")
+                with open(self.config_file, 'r') as f:
+                    config = json.load(f)
+                self.store.set_document(CONFIG_DOCUMENT, config)
+                logging.info(f"{Fore.GREEN}Imported notification configuration from {self.config_file}")
             except Exception as e:
-                logging.error(f"{Fore.RED}Failed to create default notification config: {str(e)}")
-            
-            return default_config
+                logging.error(f"{Fore.RED}Error loading notification config: {str(e)}")
         
-        # Load existing config
-        try:
-            with open(self.config_file, 'r') as f:
-                config = json.load(f)
-            
-            # Update with any missing default values
-            for category, settings in default_config.items():
-                if category not in config:
-                    config[category] = settings
-                elif isinstance(settings, dict):
-                    for key, value in settings.items():
-                        if key not in config[category]:
-                            config[category][key] = value
-            
-            return config
-        except Exception as e:
-            logging.error(f"{Fore.RED}Error loading notification config: {str(e)}")
+        if not config:
+            self.store.set_document(CONFIG_DOCUMENT, default_config)
             return default_config
+        
+        # Update with any missing default values
+        for category, settings in default_config.items():
+            if category not in config:
+                config[category] = settings
+            elif isinstance(settings, dict):
+                for key, value in settings.items():
+                    if key not in config[category]:
+                        config[category][key] = value
+        
+        return config
     
     def save_config(self):
-        """Save the current configuration to file"""
+        """Save the current configuration to the state store"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=4)
+            self.store.set_document(CONFIG_DOCUMENT, self.config)
             return True
         except Exception as e:
             logging.error(f"{Fore.RED}Error saving notification config: {str(e)}")
@@ -145,6 +151,11 @@ class NotificationManager:
         
         message = self._format_message(event_type, username, details)
         
+        with self.pause_lock:
+            if self.paused and not immediate:
+                self.deferred.append((event_type, message, username, details))
+                return True
+        
         if immediate:
             return self._send_notifications(event_type, message, username, details)
         else:
@@ -158,6 +169,27 @@ class NotificationManager:
             self.notification_threads.append(thread)
             return True
     
+    def pause(self):
+        """Hold back non-immediate notifications, e.g. while a snipe window is open"""
+        with self.pause_lock:
+            self.paused = True
+    
+    def resume(self):
+        """Send the notifications held back since pause()"""
+        with self.pause_lock:
+            self.paused = False
+            deferred, self.deferred = self.deferred, []
+        
+        for event_type, message, username, details in deferred:
+            thread = threading.Thread(
+                target=self._send_notifications,
+                args=(event_type, message, username, details)
+            )
+            thread.daemon = True
+            thread.start()
+            self.notification_threads.append(thread)
+        return len(deferred)
+    
     def _send_notifications(self, event_type, message, username=None, details=None):
         """Send notifications through all enabled channels"""
         success = False
@@ -273,7 +305,7 @@ class NotificationManager:
                 "embeds": [embed]
             }
             
-            response = requests.post(webhook_url, json=data)
+            response = self.transport.post(webhook_url, json=data)
             
             if response.status_code == 204:
                 logging.debug(f"Discord notification sent successfully for {event_type}")
@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Profiling
+
+The --profile option of the CLIs runs the selected command under a sampling
+profiler. A background thread snapshots every thread's stack a few hundred times
+a second and writes them in the folded format used by flamegraph.pl and
+speedscope. Alongside it, a handful of functions are timed to show where wall
+and CPU time went: startup, authentication, HTML parsing, network waits and
+sleeps.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import atexit
+import logging
+import threading
+import collections
+from colorama import Fore, Style
+
+# Constants
+DEFAULT_PROFILE_FILE = "profile.folded"
+DEFAULT_SAMPLE_INTERVAL = 0.005  # seconds between stack samples
+MAX_STACK_DEPTH = 64
+
+# Keep the real sleep for the sampler so its own waits aren't counted as a phase
+_real_sleep = time.sleep
+
+
+def process_uptime():
+    """Seconds since the process started, or None where /proc isn't available"""
+    try:
+        with open("/proc/self/stat", "r") as f:
+            # The command name can contain spaces; fields after it are fixed
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime", "r") as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StackSampler:
+    """Sample the stacks of all threads into folded-stack counts"""
+
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.counts = collections.Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.is_set():
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                # Merge numbered worker threads (Thread-3, ThreadPoolExecutor-0_1) into one root
+                root = re.sub(r"\d+", "N", names.get(thread_id, "thread"))
+                stack.append(root)
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+            _real_sleep(self.interval)
+
+    def write_folded(self, path):
+        """Write 'frame;frame;frame count' lines"""
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.counts.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class PhaseTimer:
+    """Accumulate wall and CPU time spent inside wrapped functions"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.phases = collections.OrderedDict()
+        self._patches = []
+
+    def add(self, phase, wall, cpu):
+        with self.lock:
+            totals = self.phases.setdefault(phase, {"calls": 0, "wall": 0.0, "cpu": 0.0})
+            totals["calls"] += 1
+            totals["wall"] += wall
+            totals["cpu"] += cpu
+
+    def wrap(self, owner, attribute, phase):
+        """Time every call of owner.attribute as a phase until restore()"""
+        original = getattr(owner, attribute)
+
+        def timed(*args, **kwargs):
+            wall_start, cpu_start = time.perf_counter(), time.thread_time()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.add(phase, time.perf_counter() - wall_start, time.thread_time() - cpu_start)
+
+        setattr(owner, attribute, timed)
+        self._patches.append((owner, attribute, original))
+
+    def restore(self):
+        for owner, attribute, original in reversed(self._patches):
+            setattr(owner, attribute, original)
+        self._patches = []
+
+
+class Profiler:
+    """Sampling profiler plus phase breakdown for one CLI run"""
+
+    def __init__(self, output=DEFAULT_PROFILE_FILE, label=None, interval=DEFAULT_SAMPLE_INTERVAL):
+        """
+        Initialize the profiler
+
+        Args:
+            output: Folded stacks file; the phase breakdown goes next to it as .phases.json
+            label: Name of the profiled command, for the report
+            interval: Seconds between stack samples
+        """
+        self.output = output
+        self.label = label
+        self.sampler = StackSampler(interval)
+        self.timer = PhaseTimer()
+        self.startup = None
+        self._running = False
+
+    def _wrap_phases(self):
+        import requests
+        import http_transport
+        self.timer.wrap(requests.Session, "send", "network wait")
+        self.timer.wrap(http_transport.Urllib3Transport, "_urlopen", "network wait")
+        if http_transport.httpx_available:
+            self.timer.wrap(http_transport.HttpxTransport, "_send", "network wait")
+        self.timer.wrap(time, "sleep", "sleep")
+        try:
+            import bs4
+            self.timer.wrap(bs4.BeautifulSoup, "__init__", "parse")
+        except ImportError:
+            pass
+        try:
+            from minecraft_auth import MinecraftAuth
+            self.timer.wrap(MinecraftAuth, "authenticate", "auth")
+            self.timer.wrap(MinecraftAuth, "refresh_access_token", "auth")
+        except ImportError:
+            pass
+
+    def start(self):
+        """Start sampling and timing"""
+        self.startup = process_uptime()
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        self._wrap_phases()
+        self.sampler.start()
+        self._running = True
+        return self
+
+    def stop(self):
+        """Stop profiling, write the output files and return the report"""
+        if not self._running:
+            return None
+        self._running = False
+        self.sampler.stop()
+        self.timer.restore()
+
+        report = {
+            "command": self.label,
+            "wall": time.perf_counter() - self.wall_start,
+            "cpu": time.process_time() - self.cpu_start,
+            "startup": self.startup,
+            "samples": self.sampler.samples,
+            "phases": self.timer.phases
+        }
+
+        self.sampler.write_folded(self.output)
+        with open(os.path.splitext(self.output)[0] + ".phases.json", "w") as f:
+            json.dump(report, f, indent=4)
+        return report
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, tb):
+        self.print_report(self.stop())
+        return False
+
+    def print_report(self, report):
+        """Print a phase breakdown"""
+        if not report:
+            return
+        print(f"\n{Fore.CYAN}Profile of {report['command'] or 'run'}: "
+              f"{report['wall']:.2f}s wall, {report['cpu']:.2f}s CPU{Style.RESET_ALL}", file=sys.stderr)
+        if report["startup"] is not None:
+            print(f"  {'startup (interpreter + imports)':<34} {report['startup']:>8.3f}s wall", file=sys.stderr)
+        # Phases are summed over threads, so they can add up to more than the wall time
+        for phase, totals in report["phases"].items():
+            print(f"  {phase:<34} {totals['wall']:>8.3f}s wall {totals['cpu']:>8.3f}s CPU  "
+                  f"{totals['calls']:>6} calls", file=sys.stderr)
+        print(f"  {report['samples']} stack samples written to {self.output} "
+              f"(open with speedscope or flamegraph.pl)", file=sys.stderr)
+
+
+def enable_profiling(output, label=None):
+    """Profile the rest of the process and report at exit"""
+    profiler = Profiler(output, label).start()
+    logging.info(f"{Fore.CYAN}Profiling {label or 'run'} to {output}")
+    atexit.register(lambda: profiler.print_report(profiler.stop()))
+    return profiler
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Host Rate Limiter
+
+All sniper processes on this machine share one IP address and therefore one
+Mojang rate limit. This module keeps the limiter state in a small locked file:
+a ring with one slot per request allowed in the window. The slot being
+overwritten is always the oldest request, so acquiring is O(1). A process
+reserves the time at which its request may go out and then sleeps until then,
+outside the lock.
+"""
+
+import os
+import sys
+import time
+import struct
+import tempfile
+import argparse
+import threading
+from colorama import Fore
+
+from log_setup import HOT_LOGGER
+from request_context import DeadlineExceeded, check_can_send, current_deadline, retry_wait
+
+try:
+    import fcntl
+    fcntl_available = True
+except ImportError:
+    fcntl_available = False
+    import msvcrt
+
+# Constants
+RATE_LIMIT_FILE = os.environ.get(
+    "SNIPER_RATE_LIMIT_FILE",
+    os.path.join(tempfile.gettempdir(), "minecraft_sniper_rate_limit.bin")
+)
+FILE_MAGIC = b"MCRL"
+HEADER_FORMAT = "<4sIId"  # magic, capacity, next slot, window seconds
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+SLOT_FORMAT = "<d"
+SLOT_SIZE = struct.calcsize(SLOT_FORMAT)
+
+
+class HostRateLimiter:
+    """Sliding-window rate limiter shared by every process on this host"""
+
+    def __init__(self, requests_per_window, window=60.0, path=RATE_LIMIT_FILE):
+        """
+        Initialize the limiter
+
+        Args:
+            requests_per_window: Requests allowed in any window
+            window: Window length in seconds
+            path: Shared state file
+        """
+        self.capacity = max(1, int(requests_per_window))
+        self.window = float(window)
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o666)
+
+    def _lock(self):
+        if fcntl_available:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+
+    def _unlock(self):
+        if fcntl_available:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+
+    def _read_header(self):
+        """Read the header, (re)initializing the file if it is missing or was sized differently"""
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        header = os.read(self._fd, HEADER_SIZE)
+        if len(header) == HEADER_SIZE:
+            magic, capacity, next_slot, window = struct.unpack(HEADER_FORMAT, header)
+            if magic == FILE_MAGIC and capacity == self.capacity and window == self.window:
+                return next_slot
+
+        self._write_all([0.0] * self.capacity, 0)
+        return 0
+
+    def _write_all(self, slots, next_slot):
+        data = struct.pack(HEADER_FORMAT, FILE_MAGIC, self.capacity, next_slot, self.window)
+        data += b"".join(struct.pack(SLOT_FORMAT, slot) for slot in slots)
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, data)
+        os.ftruncate(self._fd, len(data))
+
+    def _read_slot(self, index):
+        os.lseek(self._fd, HEADER_SIZE + index * SLOT_SIZE, os.SEEK_SET)
+        return struct.unpack(SLOT_FORMAT, os.read(self._fd, SLOT_SIZE))[0]
+
+    def _read_slots(self):
+        os.lseek(self._fd, HEADER_SIZE, os.SEEK_SET)
+        data = os.read(self._fd, self.capacity * SLOT_SIZE)
+        return [slot for (slot,) in struct.iter_unpack(SLOT_FORMAT, data)]
+
+    def reserve(self, latest=None):
+        """
+        Reserve the next request slot
+
+        Args:
+            latest: Latest acceptable send time; the slot is left free if it comes later
+
+        Returns:
+            (slot index, previous slot value, Unix timestamp at which the request may be sent),
+            with a slot index of None if nothing was reserved
+        """
+        with self._thread_lock:
+            self._lock()
+            try:
+                next_slot = self._read_header()
+                oldest = self._read_slot(next_slot)
+                send_at = max(time.time(), oldest + self.window)
+                if latest is not None and send_at > latest:
+                    return None, oldest, send_at
+
+                os.lseek(self._fd, HEADER_SIZE + next_slot * SLOT_SIZE, os.SEEK_SET)
+                os.write(self._fd, struct.pack(SLOT_FORMAT, send_at))
+                os.lseek(self._fd, struct.calcsize("<4sI"), os.SEEK_SET)
+                os.write(self._fd, struct.pack("<I", (next_slot + 1) % self.capacity))
+                return next_slot, oldest, send_at
+            finally:
+                self._unlock()
+
+    def release(self, slot, previous, send_at):
+        """Give back a slot reserved by reserve() whose request was never sent"""
+        with self._thread_lock:
+            self._lock()
+            try:
+                self._read_header()
+                # Only if no later reservation has reused the slot since
+                if self._read_slot(slot) == send_at:
+                    os.lseek(self._fd, HEADER_SIZE + slot * SLOT_SIZE, os.SEEK_SET)
+                    os.write(self._fd, struct.pack(SLOT_FORMAT, previous))
+            finally:
+                self._unlock()
+
+    def acquire(self):
+        """
+        Wait until a request may be sent
+
+        No slot is taken if this thread's snipe is already cancelled or the slot
+        comes after its deadline, and the slot is given back if the snipe is
+        cancelled while waiting.
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            SnipeCancelled: If the snipe was cancelled while waiting
+            DeadlineExceeded: If the slot comes too late for the deadline
+        """
+        check_can_send()
+        deadline = current_deadline()
+        latest = time.time() + deadline.remaining() if deadline else None
+
+        slot, previous, send_at = self.reserve(latest)
+        wait_time = send_at - time.time()
+        if slot is None:
+            raise DeadlineExceeded(f"Next rate limit slot is {wait_time:.2f}s away, past the deadline")
+
+        if wait_time > 0:
+            HOT_LOGGER.info("%sHost rate limit reached, waiting %.2fs", Fore.YELLOW, wait_time)
+            if not retry_wait(wait_time):
+                self.release(slot, previous, send_at)
+                check_can_send()
+                raise DeadlineExceeded(f"Next rate limit slot is {wait_time:.2f}s away, past the deadline")
+            return wait_time
+        return 0.0
+
+    def usage(self):
+        """Get the current usage of the shared window"""
+        with self._thread_lock:
+            self._lock()
+            try:
+                next_slot = self._read_header()
+                slots = self._read_slots()
+            finally:
+                self._unlock()
+
+        now = time.time()
+        in_window = [slot for slot in slots if slot > now - self.window]
+        oldest = slots[next_slot]
+        return {
+            "path": self.path,
+            "limit": self.capacity,
+            "window": self.window,
+            "used": len(in_window),
+            "reserved_ahead": sum(1 for slot in slots if slot > now),
+            "available": self.capacity - len(in_window),
+            "next_free_in": max(0.0, oldest + self.window - now)
+        }
+
+    def reset(self):
+        """Forget all recorded requests"""
+        with self._thread_lock:
+            self._lock()
+            try:
+                self._write_all([0.0] * self.capacity, 0)
+            finally:
+                self._unlock()
+
+    def close(self):
+        os.close(self._fd)
+
+
+# Shared limiter instances, one per state file
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_host_rate_limiter(requests_per_window, window=60.0, path=RATE_LIMIT_FILE):
+    """Get the process-wide HostRateLimiter for a state file"""
+    with _limiters_lock:
+        limiter = _limiters.get(path)
+        if limiter is None or limiter.capacity != int(requests_per_window) or limiter.window != float(window):
+            limiter = HostRateLimiter(requests_per_window, window, path)
+            _limiters[path] = limiter
+        return limiter
+
+
+if __name__ == "__main__":
+    from name_utils import MAX_REQUESTS_PER_MINUTE, RATE_LIMIT_WINDOW, RATE_LIMIT_BUFFER
+
+    parser = argparse.ArgumentParser(description="Inspect the host-wide Mojang request limiter")
+    parser.add_argument("command", nargs="?", choices=["status", "reset"], default="status")
+    parser.add_argument("--file", default=RATE_LIMIT_FILE, help=f"Limiter state file (default: {RATE_LIMIT_FILE})")
+    args = parser.parse_args()
+
+    limiter = HostRateLimiter(int(MAX_REQUESTS_PER_MINUTE * RATE_LIMIT_BUFFER), RATE_LIMIT_WINDOW, args.file)
+
+    if args.command == "reset":
+        limiter.reset()
+        print(f"{Fore.GREEN}Rate limiter reset")
+        sys.exit(0)
+
+    usage = limiter.usage()
+    print(f"Limiter file:   {usage['path']}")
+    print(f"Used:           {usage['used']}/{usage['limit']} requests in the last {usage['window']:.0f}s")
+    print(f"Reserved ahead: {usage['reserved_ahead']}")
+    if usage["available"] > 0:
+        print(f"{Fore.GREEN}Available now:  {usage['available']}")
+    else:
+        print(f"{Fore.YELLOW}Next free slot in {usage['next_free_in']:.2f}s")
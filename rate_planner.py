@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Rate Planner
+
+This module splits the shared Mojang request budget across every scheduled drop.
+Drops less than a rate-limit window apart compete for the same requests, so the
+planner allocates them earliest-deadline-first. It flags drops that can't get
+enough requests before they happen, and hands each snipe a guarded client that
+stops at its allocation.
+"""
+
+import logging
+import datetime
+import threading
+from colorama import Fore
+
+from name_utils import MAX_REQUESTS_PER_MINUTE, RATE_LIMIT_WINDOW, RATE_LIMIT_BUFFER
+from state_store import read_scheduler_journal
+from strategy_selector import estimate_request_cost
+
+# Constants
+MIN_SNIPE_REQUESTS = 5  # Fewer requests than this is not a realistic snipe
+PLAN_WINDOW_BEFORE = 1.0  # seconds before the target the snipe starts spending requests
+PLAN_WINDOW_AFTER = 5.0  # seconds after the target the snipe keeps spending requests
+
+# Methods that send a request to Mojang and count against an allocation
+BUDGETED_METHODS = {"is_username_available", "check_username_availability", "change_username"}
+
+
+class RequestBudgetExceeded(Exception):
+    """Raised when a snipe has used all the requests planned for it"""
+
+
+class TargetAllocation:
+    """The share of the request budget planned for one drop"""
+
+    def __init__(self, username, target_time, requested, strategy=None):
+        self.username = username
+        self.target_time = target_time
+        self.requested = requested
+        self.strategy = strategy
+        self.allocated = requested
+        self.status = "ok"
+        self.reason = None
+        self.conflicts = []
+        self.used = 0
+        self._lock = threading.Lock()
+
+    @property
+    def window_start(self):
+        return self.target_time - datetime.timedelta(seconds=PLAN_WINDOW_BEFORE)
+
+    @property
+    def window_end(self):
+        return self.target_time + datetime.timedelta(seconds=PLAN_WINDOW_AFTER)
+
+    @property
+    def feasible(self):
+        return self.status in ("ok", "reduced")
+
+    @property
+    def remaining(self):
+        return max(0, self.allocated - self.used)
+
+    def consume(self):
+        """Count one request against the allocation"""
+        with self._lock:
+            if self.used >= self.allocated:
+                raise RequestBudgetExceeded(
+                    f"Request budget for {self.username} exhausted ({self.allocated} requests planned)"
+                )
+            self.used += 1
+
+    def guard(self, client):
+        """Wrap a name checker or auth object so its requests count against this allocation"""
+        return BudgetedClient(client, self)
+
+    def to_dict(self):
+        return {
+            "username": self.username,
+            "target_time": self.target_time.isoformat(),
+            "strategy": self.strategy,
+            "requested": self.requested,
+            "allocated": self.allocated,
+            "status": self.status,
+            "reason": self.reason,
+            "conflicts": self.conflicts
+        }
+
+
+class BudgetedClient:
+    """Proxy that charges request-sending methods to an allocation"""
+
+    def __init__(self, client, allocation):
+        self._client = client
+        self._allocation = allocation
+
+    def __getattr__(self, name):
+        attribute = getattr(self._client, name)
+        if name not in BUDGETED_METHODS or not callable(attribute):
+            return attribute
+
+        def budgeted(*args, **kwargs):
+            self._allocation.consume()
+            return attribute(*args, **kwargs)
+        return budgeted
+
+
+class RatePlan:
+    """The result of planning a set of drops"""
+
+    def __init__(self, allocations, budget):
+        self.allocations = allocations
+        self.budget = budget
+        self._by_username = {allocation.username.lower(): allocation for allocation in allocations}
+
+    def get(self, username):
+        """Get the allocation for a username, or None if it wasn't planned"""
+        return self._by_username.get(username.lower())
+
+    @property
+    def infeasible(self):
+        return [allocation for allocation in self.allocations if not allocation.feasible]
+
+    @property
+    def feasible(self):
+        return not self.infeasible
+
+    def to_dict(self):
+        return {
+            "budget_per_window": self.budget,
+            "window_seconds": RATE_LIMIT_WINDOW,
+            "feasible": self.feasible,
+            "allocations": [allocation.to_dict() for allocation in self.allocations]
+        }
+
+
+class RatePlanner:
+    """Allocate the per-minute request budget across scheduled drops"""
+
+    def __init__(self, requests_per_window=None, reserved_per_window=0, min_requests=MIN_SNIPE_REQUESTS):
+        """
+        Initialize the planner
+
+        Args:
+            requests_per_window: Requests allowed per rate-limit window (defaults to the
+                                 NameChecker limit with its safety buffer)
+            reserved_per_window: Requests kept back for monitors and other background checks
+            min_requests: Allocations below this are flagged infeasible
+        """
+        if requests_per_window is None:
+            requests_per_window = int(MAX_REQUESTS_PER_MINUTE * RATE_LIMIT_BUFFER)
+        self.budget = max(0, requests_per_window - reserved_per_window)
+        self.min_requests = min_requests
+
+    def plan(self, targets, now=None):
+        """
+        Plan a set of drops
+
+        Args:
+            targets: Iterable of (username, target_time, requested[, strategy]) tuples
+            now: Current time (defaults to datetime.now())
+
+        Returns:
+            RatePlan with one TargetAllocation per target
+        """
+        now = now or datetime.datetime.now()
+        allocations = sorted(
+            (TargetAllocation(*target) for target in targets),
+            key=lambda allocation: allocation.target_time
+        )
+        window = datetime.timedelta(seconds=RATE_LIMIT_WINDOW)
+
+        # Earliest deadline first: each drop gets what earlier drops that share
+        # a rate-limit window with it have left over. Any window only holds drops
+        # within one window of the latest, so no window can exceed the budget.
+        planned = []
+        for allocation in allocations:
+            if allocation.window_end < now:
+                allocation.allocated = 0
+                allocation.status = "missed"
+                allocation.reason = "Target time has already passed"
+                continue
+
+            neighbours = [
+                other for other in planned
+                if other.window_end > allocation.window_start - window
+            ]
+            used = sum(other.allocated for other in neighbours)
+            allocation.conflicts = [other.username for other in neighbours]
+            allocation.allocated = max(0, min(allocation.requested, self.budget - used))
+
+            if allocation.allocated < min(self.min_requests, allocation.requested):
+                allocation.status = "infeasible"
+                allocation.reason = (
+                    f"Only {allocation.allocated} of {allocation.requested} requests left after "
+                    f"{', '.join(allocation.conflicts) or 'reserved requests'}"
+                )
+            elif allocation.allocated < allocation.requested:
+                allocation.status = "reduced"
+                allocation.reason = f"Shares the rate limit with {', '.join(allocation.conflicts)}"
+
+            planned.append(allocation)
+
+        plan = RatePlan(allocations, self.budget)
+        for allocation in plan.infeasible:
+            logging.warning(f"{Fore.YELLOW}Drop for {allocation.username} at {allocation.target_time} is infeasible: {allocation.reason}")
+        return plan
+
+
+def targets_from_times(target_times, strategy="timing", params=None):
+    """Build planner targets from a username -> target time mapping"""
+    requested = estimate_request_cost(strategy, params or {})
+    return [
+        (username, target_time, requested, strategy)
+        for username, target_time in target_times.items()
+        if target_time
+    ]
+
+def load_scheduled_targets(journal_path=None):
+    """Load scheduled monitors from the Electron scheduler's journal as planner targets"""
+    targets = []
+    for monitor in read_scheduler_journal(journal_path).values():
+        if monitor.get("status") != "scheduled" or not monitor.get("monitorStartTime"):
+            continue
+        start = datetime.datetime.fromisoformat(monitor["monitorStartTime"].replace("Z", "+00:00"))
+        start = start.astimezone().replace(tzinfo=None)  # Local naive time like the rest of the sniper
+        strategy = monitor.get("strategy") or "timing"
+        targets.append((monitor["username"], start, estimate_request_cost(strategy, {}), strategy))
+    return targets
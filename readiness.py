@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Readiness
+
+A SnipeSession prepares for one drop a few minutes before it happens. It
+refreshes the Minecraft token, resolves the API hosts, opens the connections the
+snipe will reuse, estimates how far the local clock is from Mojang's, builds the
+claim request ahead of time and holds back notifications. The outcome is a
+go/no-go report, published before the chosen strategy takes over.
+"""
+
+import time
+import socket
+import logging
+import datetime
+import statistics
+import email.utils
+from colorama import Fore, Style
+
+from clock import SYSTEM_CLOCK
+from state_store import get_state_store
+from session_recorder import record_event
+from gc_control import collect_before_window
+from dns_cache import install_dns_cache
+from sniper import SniperResult, SNIPE_WINDOW_END
+
+# Constants
+READINESS_LEAD_TIME = 120  # seconds before the target the pipeline runs
+READINESS_DOCUMENT = "readiness_report"
+API_HOSTS = ("api.mojang.com", "api.minecraftservices.com")
+WARMUP_TIMEOUT = 5  # seconds
+CLOCK_SAMPLES = 8
+CLOCK_SAMPLE_SPACING = 0.135  # seconds; not a divisor of 1s, so samples land on different sub-second phases
+CLOCK_OFFSET_LIMIT = 2.0  # seconds; larger offsets are corrected but flagged
+TOKEN_MARGIN = 600  # seconds the access token must outlive the snipe window
+
+# Check results
+STATUS_OK = "ok"
+STATUS_WARN = "warn"
+STATUS_FAIL = "fail"
+
+
+class ReadinessReport:
+    """Outcome of the readiness pipeline for one snipe"""
+
+    def __init__(self, username, target_time):
+        self.username = username
+        self.target_time = target_time
+        self.checks = []
+        self.clock_offset = None  # seconds the Mojang clock is ahead of ours
+        self.latency_ms = None  # median warm-connection round trip
+        self.created_at = time.time()
+
+    def add(self, name, status, detail, critical, elapsed):
+        self.checks.append({
+            "name": name,
+            "status": status,
+            "detail": detail,
+            "critical": critical,
+            "elapsed_ms": round(elapsed * 1000, 1)
+        })
+
+    @property
+    def go(self):
+        """True unless a critical check failed"""
+        return not any(check["critical"] and check["status"] == STATUS_FAIL for check in self.checks)
+
+    def to_dict(self):
+        return {
+            "username": self.username,
+            "target_time": self.target_time.timestamp() if self.target_time else None,
+            "go": self.go,
+            "clock_offset": self.clock_offset,
+            "latency_ms": self.latency_ms,
+            "checks": self.checks,
+            "created_at": self.created_at
+        }
+
+    def display(self):
+        """Print the report"""
+        colors = {STATUS_OK: Fore.GREEN, STATUS_WARN: Fore.YELLOW, STATUS_FAIL: Fore.RED}
+        print(f"\n{Fore.CYAN}Readiness for {self.username} (target {self.target_time}){Style.RESET_ALL}")
+        for check in self.checks:
+            print(f"  {colors[check['status']]}{check['status']:<5}{Style.RESET_ALL} {check['name']:<12} "
+                  f"{check['detail']} ({check['elapsed_ms']:.0f}ms)")
+        verdict = f"{Fore.GREEN}GO" if self.go else f"{Fore.RED}NO-GO"
+        print(f"  {verdict}{Style.RESET_ALL}\n")
+
+
+def estimate_clock_offset(samples):
+    """
+    Estimate how far the server clock is ahead of ours from HTTP Date headers
+
+    The Date header only has one-second resolution, but each sample bounds the
+    offset: the server's second started no later than the response arrived and
+    ended no earlier than the request was sent. Intersecting the bounds of
+    samples taken at different sub-second phases narrows it down well below a
+    second.
+
+    Args:
+        samples: List of (sent_at, received_at, server_timestamp)
+
+    Returns:
+        (offset, uncertainty) in seconds, or (None, None) without samples
+    """
+    if not samples:
+        return None, None
+
+    lower = max(server - received for sent, received, server in samples)
+    upper = min(server + 1 - sent for sent, received, server in samples)
+    if lower <= upper:
+        return (lower + upper) / 2, (upper - lower) / 2
+
+    # Inconsistent bounds (e.g. a load balancer across unsynchronized servers)
+    midpoints = [server + 0.5 - (sent + received) / 2 for sent, received, server in samples]
+    return statistics.median(midpoints), 0.5
+
+
+class SnipeSession:
+    """Run the readiness pipeline before a drop, then hand off to the strategy"""
+
+    def __init__(self, sniper, username, target_time, strategy="timing", latency_ms=None,
+                 lead_time=READINESS_LEAD_TIME, store=None):
+        """
+        Initialize the session
+
+        Args:
+            sniper: Authenticated Sniper
+            username: Username to snipe
+            target_time: Drop time (datetime)
+            strategy: Strategy name passed to Sniper.snipe_username
+            latency_ms: Latency for the precision strategy; measured during warm-up if not given
+            lead_time: Seconds before the target to run the readiness pipeline
+            store: StateStore the report is published to
+        """
+        self.sniper = sniper
+        self.username = username
+        self.target_time = target_time
+        self.strategy = strategy
+        self.latency_ms = latency_ms
+        self.lead_time = lead_time
+        self.store = store or get_state_store()
+        self.report = None
+        self.requests_sent = 0  # Warm-up and clock requests, counted against the shared rate limit
+
+    def _step(self, name, critical, function):
+        start = time.perf_counter()
+        try:
+            status, detail = function()
+        except Exception as e:
+            status, detail = STATUS_FAIL, str(e)
+        self.report.add(name, status, detail, critical, time.perf_counter() - start)
+
+    def _check_token(self):
+        auth = self.sniper.auth
+        window_end = self.target_time.timestamp() + SNIPE_WINDOW_END
+        if auth.refresh_token and auth.token_expires_at < window_end + TOKEN_MARGIN:
+            if not auth.refresh_access_token():
+                return STATUS_FAIL, "token refresh failed"
+        if not auth.validate_minecraft_token():
+            return STATUS_FAIL, "Minecraft token rejected"
+        remaining = (auth.token_expires_at - window_end) / 60
+        return STATUS_OK, f"valid as {auth.get_current_username()}, {remaining:.0f} min to spare"
+
+    def _resolve_hosts(self):
+        cache = install_dns_cache()
+        if cache is None:
+            for host in API_HOSTS:
+                socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+            return STATUS_WARN, "resolved without the DNS cache (SNIPER_DNS_CACHE=0)"
+
+        resolved = cache.prefetch(API_HOSTS)
+        return STATUS_OK, ", ".join(
+            f"{host} -> {len(addresses)} address{'es' if len(addresses) != 1 else ''} in {elapsed:.0f}ms"
+            for host, (addresses, elapsed) in resolved.items()
+        )
+
+    def _head(self, transport, host, proxies=None):
+        """
+        HEAD an API host, taking a slot in the shared rate limit like any other request
+
+        Returns:
+            (response, sent, received) with the times taken around the request only
+        """
+        self.sniper.name_checker.rate_limiter.acquire()
+        sent = time.time()
+        response = transport.head(f"https://{host}/", timeout=WARMUP_TIMEOUT, proxies=proxies)
+        received = time.time()
+        self.requests_sent += 1
+        self._add_date_sample(response, sent, received)
+        return response, sent, received
+
+    def _warm_connections(self):
+        """Open the pooled connections both transports will use and time them"""
+        round_trips = []
+        self.date_samples = []
+        # The checks go out through the checker's proxy rotation; the claim is sent directly
+        name_checker = self.sniper.name_checker
+        transports = [(name_checker.transport, host, name_checker._get_next_proxy()) for host in API_HOSTS]
+        transports.append((self.sniper.auth.transport, "api.minecraftservices.com", None))
+
+        for transport, host, proxies in transports:
+            _, sent, received = self._head(transport, host, proxies)
+            round_trips.append((received - sent) * 1000)
+
+        # The first request per host paid for the handshake; time the warm ones
+        for transport, host, proxies in transports[:len(API_HOSTS)]:
+            _, sent, received = self._head(transport, host, proxies)
+            round_trips.append((received - sent) * 1000)
+
+        self.report.latency_ms = statistics.median(round_trips[len(transports):])
+        via = f" via {len(name_checker.proxies)} prox{'ies' if len(name_checker.proxies) != 1 else 'y'}" if name_checker.proxies else ""
+        return STATUS_OK, (f"{len(transports)} connections open{via}, first {statistics.mean(round_trips[:len(transports)]):.0f}ms, "
+                           f"warm {self.report.latency_ms:.0f}ms")
+
+    def _add_date_sample(self, response, sent, received):
+        date = response.headers.get("Date")
+        if date:
+            try:
+                self.date_samples.append((sent, received, email.utils.parsedate_to_datetime(date).timestamp()))
+            except (TypeError, ValueError):
+                pass
+
+    def _estimate_clock(self):
+        for _ in range(CLOCK_SAMPLES):
+            time.sleep(CLOCK_SAMPLE_SPACING)
+            self._head(self.sniper.auth.transport, "api.minecraftservices.com")
+
+        offset, uncertainty = estimate_clock_offset(self.date_samples)
+        if offset is None:
+            return STATUS_WARN, "no Date headers to compare against"
+        self.report.clock_offset = offset
+        detail = f"Mojang is {offset * 1000:+.0f}ms (±{uncertainty * 1000:.0f}ms) from the local clock"
+        return (STATUS_WARN if abs(offset) > CLOCK_OFFSET_LIMIT else STATUS_OK), detail
+
+    def _prebuild_requests(self):
+        self.sniper.auth.prepare_name_change(self.username)
+        return STATUS_OK, f"claim request for {self.username} built on the {self.sniper.auth.transport.name} transport"
+
+    def _pause_background_work(self):
+        notifications = self.sniper.notifications
+        if not notifications:
+            return STATUS_OK, "nothing to pause"
+        notifications.pause()
+        return STATUS_OK, "notifications held until the snipe ends"
+
+    def _collect_garbage(self):
+        # The attempt loops run with the heap frozen; clear out garbage before it is
+        collected, elapsed = collect_before_window()
+        return STATUS_OK, f"{collected} unreachable objects collected in {elapsed * 1000:.1f}ms"
+
+    def prepare(self):
+        """
+        Run the readiness pipeline and publish the report
+
+        Returns:
+            ReadinessReport
+        """
+        self.report = ReadinessReport(self.username, self.target_time)
+        self.date_samples = []
+        self.requests_sent = 0
+
+        self._step("token", True, self._check_token)
+        self._step("dns", True, self._resolve_hosts)
+        self._step("warm-up", False, self._warm_connections)
+        self._step("clock", False, self._estimate_clock)
+        self._step("requests", False, self._prebuild_requests)
+        self._step("background", False, self._pause_background_work)
+        self._step("heap", False, self._collect_garbage)
+
+        report = self.report.to_dict()
+        record_event("readiness", username=self.username, go=report["go"], clock_offset=report["clock_offset"],
+                     requests=self.requests_sent)
+        try:
+            self.store.set_document(READINESS_DOCUMENT, report)
+        except Exception as e:
+            logging.debug(f"Couldn't save the readiness report: {str(e)}")
+
+        if self.report.go:
+            logging.info(f"{Fore.GREEN}Ready to snipe {self.username}")
+        else:
+            failed = ", ".join(check["name"] for check in self.report.checks if check["status"] == STATUS_FAIL)
+            logging.error(f"{Fore.RED}Not ready to snipe {self.username}: {failed} failed")
+        return self.report
+
+    def run(self, force=False):
+        """
+        Wait for the lead time, prepare, and snipe if the report says go
+
+        Args:
+            force: Snipe even on a no-go report
+
+        Returns:
+            SniperResult
+        """
+        now = SYSTEM_CLOCK.time()
+        start_at = self.target_time.timestamp() - self.lead_time
+        if start_at > now:
+            logging.info(f"{Fore.CYAN}Preparing for {self.username} at "
+                         f"{datetime.datetime.fromtimestamp(start_at).strftime('%H:%M:%S')}")
+            SYSTEM_CLOCK.sleep_until(start_at)
+
+        try:
+            report = self.prepare()
+            report.display()
+            if not report.go and not force:
+                result = SniperResult(self.username)
+                result.strategy = self.strategy
+                result.error = "Readiness checks failed: " + ", ".join(
+                    f"{check['name']} ({check['detail']})" for check in report.checks if check["status"] == STATUS_FAIL
+                )
+                return result
+
+            # Aim at the drop on Mojang's clock, not ours
+            target_time = self.target_time
+            if report.clock_offset:
+                target_time -= datetime.timedelta(seconds=report.clock_offset)
+
+            latency_ms = self.latency_ms
+            if latency_ms is None and self.strategy == "precision":
+                latency_ms = report.latency_ms
+
+            return self.sniper.snipe_username(self.username, self.strategy, target_time, latency_ms)
+        finally:
+            if self.sniper.notifications:
+                self.sniper.notifications.resume()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Request Deadlines
+
+A snipe only has a few seconds in which a request is worth anything. Code that
+runs inside a snipe window enters a Deadline, and every HTTP call made on that
+thread shortens its timeout to the time left, waits out Retry-After and backoff
+only when the retry would still start before the deadline, and raises
+DeadlineExceeded once the window has closed.
+
+A CancellationToken is entered the same way and shared by every worker of a
+snipe. Once one worker claims the name (or the caller gives up) the token is
+cancelled: requests that haven't been sent yet raise SnipeCancelled, and waits
+between attempts return immediately.
+
+Deadlines and tokens are thread-local. Threads started for the same snipe pick
+up the caller's through bind_request_context().
+"""
+
+import time
+import random
+import threading
+import functools
+import contextlib
+import email.utils
+
+from clock import SYSTEM_CLOCK
+
+# Constants
+MIN_REQUEST_TIMEOUT = 0.05  # seconds; less than this left and a request isn't worth sending
+RETRY_BACKOFF_BASE = 0.25  # seconds
+RETRY_BACKOFF_MAX = 4.0  # seconds
+
+_local = threading.local()
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request would start after the active deadline"""
+
+
+class SnipeCancelled(Exception):
+    """Raised when a request would start after the active token was cancelled"""
+
+
+class Deadline:
+    """A point in time after which requests are no longer sent"""
+
+    def __init__(self, expires_at, clock=SYSTEM_CLOCK):
+        """
+        Initialize the deadline
+
+        Args:
+            expires_at: Unix timestamp (in the clock's time) the deadline expires at
+            clock: Clock used to read the time and to sleep between retries
+        """
+        self.expires_at = expires_at
+        self.clock = clock
+
+    @classmethod
+    def after(cls, seconds, clock=SYSTEM_CLOCK):
+        """A deadline a number of seconds from now"""
+        return cls(clock.time() + seconds, clock)
+
+    def remaining(self):
+        """Seconds left before the deadline (negative once it has passed)"""
+        return self.expires_at - self.clock.time()
+
+    def expired(self):
+        return self.remaining() < MIN_REQUEST_TIMEOUT
+
+    def timeout(self, default):
+        """
+        Timeout for a request sent now
+
+        Args:
+            default: Timeout to use if the deadline is further away
+
+        Raises:
+            DeadlineExceeded: If there's no time left to send the request
+        """
+        remaining = self.remaining()
+        if remaining < MIN_REQUEST_TIMEOUT:
+            raise DeadlineExceeded(f"Deadline passed {-remaining:.3f}s ago" if remaining < 0 else "Deadline reached")
+        return remaining if default is None else min(default, remaining)
+
+    def __enter__(self):
+        stack = _stack()
+        # A nested deadline can only tighten the one it runs under
+        parent = stack[-1] if stack else None
+        stack.append(self if parent is None or self.expires_at < parent.expires_at else parent)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        _stack().pop()
+        return False
+
+    def __repr__(self):
+        return f"Deadline(remaining={self.remaining():.3f}s)"
+
+
+class CancellationToken:
+    """A stop signal shared by all workers of a snipe"""
+
+    def __init__(self, parent=None):
+        """
+        Initialize the token
+
+        Args:
+            parent: Token whose cancellation also cancels this one, e.g. a batch of snipes
+        """
+        self.reason = None
+        self._event = threading.Event()
+        self._children = []
+        self._lock = threading.Lock()
+        if parent is not None:
+            parent._adopt(self)
+
+    def _adopt(self, child):
+        with self._lock:
+            if not self._event.is_set():
+                self._children.append(child)
+                return
+        child.cancel(self.reason)
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def cancel(self, reason="cancelled"):
+        """Cancel the token and its children; later calls keep the first reason"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            children, self._children = self._children, []
+        for child in children:
+            child.cancel(reason)
+
+    def check(self):
+        """
+        Raises:
+            SnipeCancelled: If the token has been cancelled
+        """
+        if self._event.is_set():
+            raise SnipeCancelled(f"Snipe cancelled: {self.reason}")
+
+    def wait(self, seconds, clock=SYSTEM_CLOCK):
+        """
+        Sleep for a number of seconds on the given clock, waking up as soon as the token is cancelled
+
+        Returns:
+            True if the token was cancelled
+        """
+        return clock.wait(self._event, seconds)
+
+    def sleep_until(self, timestamp, clock=SYSTEM_CLOCK):
+        """
+        Sleep until a timestamp on the given clock, waking up as soon as the token is cancelled
+
+        Returns:
+            True if the token was cancelled
+        """
+        return clock.sleep_until(timestamp, self._event)
+
+    def __enter__(self):
+        _token_stack().append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        _token_stack().pop()
+        return False
+
+    def __repr__(self):
+        return f"CancellationToken(cancelled={self.cancelled}, reason={self.reason!r})"
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+def _token_stack():
+    if not hasattr(_local, "tokens"):
+        _local.tokens = []
+    return _local.tokens
+
+def current_deadline():
+    """The deadline active on this thread, or None"""
+    stack = _stack()
+    return stack[-1] if stack else None
+
+def current_token():
+    """The cancellation token active on this thread, or None"""
+    tokens = _token_stack()
+    return tokens[-1] if tokens else None
+
+def check_can_send():
+    """
+    Fail fast before queueing a request that would never be sent
+
+    Raises:
+        SnipeCancelled: If the active token has been cancelled
+        DeadlineExceeded: If the active deadline has passed
+    """
+    request_timeout(None)
+
+def request_timeout(default):
+    """
+    Timeout for a request sent now on this thread
+
+    Raises:
+        SnipeCancelled: If the active token has been cancelled
+        DeadlineExceeded: If the active deadline leaves no time for the request
+    """
+    token = current_token()
+    if token is not None:
+        token.check()
+    deadline = current_deadline()
+    return default if deadline is None else deadline.timeout(default)
+
+def retry_wait(seconds, clock=None):
+    """
+    Sleep before a retry or the next attempt, unless that would push it past the active deadline
+
+    The sleep ends early if the active token is cancelled.
+
+    Args:
+        seconds: Time to wait
+        clock: Clock to sleep on (defaults to the deadline's, or the system clock)
+
+    Returns:
+        True if the caller should retry, False if it should give up
+    """
+    deadline = current_deadline()
+    if deadline is not None and deadline.remaining() - seconds < MIN_REQUEST_TIMEOUT:
+        return False
+    clock = clock or (deadline.clock if deadline is not None else SYSTEM_CLOCK)
+    token = current_token()
+    if token is not None:
+        return not token.wait(seconds, clock)
+    clock.sleep(seconds)
+    return True
+
+def wait_until(timestamp, clock=SYSTEM_CLOCK):
+    """
+    Sleep until a timestamp, e.g. the start of a snipe window, ending early if the active token is cancelled
+
+    Returns:
+        True once the timestamp is reached, False if the token was cancelled first
+    """
+    token = current_token()
+    if token is not None:
+        return not token.sleep_until(timestamp, clock)
+    clock.sleep_until(timestamp)
+    return True
+
+def retry_backoff(retry_count):
+    """Exponential backoff with full jitter for the given retry number"""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** retry_count))
+
+def parse_retry_after(value, default):
+    """
+    Seconds to wait according to a Retry-After header
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+        default: Seconds to use if the header is missing or malformed
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return default
+
+def bind_request_context(function):
+    """Wrap a function so it runs under the caller's deadline and token, e.g. in a worker thread"""
+    deadline, token = current_deadline(), current_token()
+    if deadline is None and token is None:
+        return function
+
+    @functools.wraps(function)
+    def bound(*args, **kwargs):
+        with contextlib.ExitStack() as stack:
+            if deadline is not None:
+                stack.enter_context(deadline)
+            if token is not None:
+                stack.enter_context(token)
+            return function(*args, **kwargs)
+    return bound
@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Session Recorder
+
+This module records what every HTTP request during a real session looked like:
+when it was sent, how long it took and what status came back. Headers, bodies,
+query strings and tokens are never written, so recordings are safe to share.
+
+Recordings are JSON lines. They can be summarized, turned into a latency file for
+the strategy tuner, or replayed against any strategy at the recorded timing to see
+how it would have done on a real drop.
+
+Recording is enabled with start_recording() or the SNIPER_RECORD_SESSION env var.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import queue
+import atexit
+import logging
+import argparse
+import statistics
+import threading
+import urllib.parse
+from colorama import Fore, Style, init
+
+# Constants
+RECORD_ENV_VAR = "SNIPER_RECORD_SESSION"
+CHECK_PATH_PREFIXES = ("/users/profiles/minecraft/", "/minecraft/profile/lookup/name/")
+CLAIM_PATH_PREFIX = "/minecraft/profile/name/"
+AVAILABLE_STATUSES = (204, 404)  # Profile lookups that mean nobody owns the name
+QUERY_STRING_PATTERN = re.compile(r"\?[^\s'\")]*")  # Query strings quoted inside error messages
+
+
+def classify_request(method, url):
+    """
+    Work out what a request was for from its method and URL
+
+    Returns:
+        (kind, username) where kind is check, claim or other
+    """
+    path = urllib.parse.urlsplit(url).path
+    for prefix in CHECK_PATH_PREFIXES:
+        if path.startswith(prefix):
+            return "check", path[len(prefix):].strip("/")
+    if method.upper() == "PUT" and path.startswith(CLAIM_PATH_PREFIX):
+        return "claim", path[len(CLAIM_PATH_PREFIX):].strip("/")
+    return "other", None
+
+def sanitize_url(url):
+    """Drop the query string and fragment, which may carry codes or tokens"""
+    parts = urllib.parse.urlsplit(url)
+    return f"{parts.scheme}://{parts.hostname}{parts.path}"
+
+
+class SessionRecorder:
+    """Append request metadata to a JSON lines file from a background thread"""
+
+    def __init__(self, path):
+        """
+        Initialize the recorder
+
+        Args:
+            path: Recording file, appended to if it exists
+        """
+        self.path = path
+        self.started_at = time.time()
+        self._queue = queue.SimpleQueue()
+        self._file = open(path, "a", encoding="utf-8")
+        self._writer = threading.Thread(target=self._write_loop, name="session-recorder", daemon=True)
+        self._writer.start()
+        self.mark("session", pid=os.getpid())
+
+    def _write_loop(self):
+        while True:
+            record = self._queue.get()
+            if record is None:
+                break
+            self._file.write(json.dumps(record) + "\n")
+            if self._queue.empty():
+                self._file.flush()
+
+    def _put(self, record):
+        record["t"] = round(record["wall"] - self.started_at, 6)
+        self._queue.put(record)
+
+    def record_request(self, method, url, status, elapsed, sent_at=None, size=None, error=None):
+        """
+        Record a single request
+
+        Args:
+            method: HTTP method
+            url: Request URL (the query string is dropped)
+            status: Response status code, or None if the request failed
+            elapsed: Seconds from sending the request to receiving the response headers
+            sent_at: Unix timestamp the request was sent (defaults to now - elapsed)
+            size: Response body size in bytes, if known
+            error: Error message for failed requests
+        """
+        kind, username = classify_request(method, url)
+        record = {
+            "wall": sent_at if sent_at is not None else time.time() - elapsed,
+            "kind": kind,
+            "method": method.upper(),
+            "url": sanitize_url(url),
+            "status": status,
+            "elapsed": round(elapsed, 6)
+        }
+        if username:
+            record["username"] = username
+        if size is not None:
+            record["bytes"] = size
+        if error:
+            record["error"] = QUERY_STRING_PATTERN.sub("", error)
+        self._put(record)
+
+    def response_hook(self, response, *args, **kwargs):
+        """requests response hook; attach with attach_recorder(session)"""
+        size = response.headers.get("Content-Length")
+        self.record_request(
+            response.request.method,
+            response.url,
+            response.status_code,
+            response.elapsed.total_seconds(),
+            size=int(size) if size and size.isdigit() else None
+        )
+
+    def mark(self, event, **data):
+        """Record a session event such as the start of a snipe"""
+        record = {"wall": time.time(), "kind": "event", "event": event}
+        record.update(data)
+        self._put(record)
+
+    def close(self):
+        """Flush pending records and close the file"""
+        self._queue.put(None)
+        self._writer.join()
+        self._file.close()
+
+
+# The active recorder, if recording is enabled
+_recorder = None
+_recorder_lock = threading.Lock()
+
+
+def start_recording(path):
+    """Start recording every attached session to a file"""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is None or _recorder.path != path:
+            if _recorder is not None:
+                _recorder.close()
+            _recorder = SessionRecorder(path)
+            logging.info(f"{Fore.CYAN}Recording requests to {path}")
+        return _recorder
+
+def stop_recording():
+    """Stop the active recorder"""
+    global _recorder
+    with _recorder_lock:
+        if _recorder is not None:
+            _recorder.close()
+            _recorder = None
+
+def get_recorder():
+    """Get the active recorder, starting one from SNIPER_RECORD_SESSION if it's set"""
+    if _recorder is None and os.environ.get(RECORD_ENV_VAR):
+        return start_recording(os.environ[RECORD_ENV_VAR])
+    return _recorder
+
+def attach_recorder(session):
+    """Record every response a requests.Session receives, if recording is enabled"""
+    recorder = get_recorder()
+    if recorder is not None:
+        session.hooks["response"].append(recorder.response_hook)
+    return session
+
+def record_failed_request(method, url, error):
+    """Record a request that got no response, if recording is enabled"""
+    recorder = get_recorder()
+    if recorder is not None:
+        recorder.record_request(method, url, None, 0.0, error=str(error))
+
+def record_event(event, **data):
+    """Mark a session event if recording is enabled"""
+    recorder = get_recorder()
+    if recorder is not None:
+        recorder.mark(event, **data)
+
+
+atexit.register(stop_recording)
+
+
+# Reading recordings
+
+def load_recording(path):
+    """Load the records of a recording file, oldest first"""
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    records.sort(key=lambda record: record["wall"])
+    return records
+
+def recorded_latencies(records, kinds=("check", "claim")):
+    """Round-trip times in milliseconds of the successful Mojang requests, in order"""
+    return [
+        record["elapsed"] * 1000 for record in records
+        if record["kind"] in kinds and record.get("status") is not None
+    ]
+
+def extract_drops(records):
+    """
+    Reconstruct each recorded snipe
+
+    Returns:
+        List of dictionaries with username, started_at, target_time, release_time
+        (first time the name was seen available, or None), taken_time (first time it
+        was seen taken again after release, or None), latencies and the recorded outcome
+    """
+    drops = []
+    snipes = [record for record in records if record["kind"] == "event" and record["event"] == "snipe"]
+
+    for index, snipe in enumerate(snipes):
+        username = snipe["username"].lower()
+        end = snipes[index + 1]["wall"] if index + 1 < len(snipes) else float("inf")
+        requests = [
+            record for record in records
+            if record["kind"] in ("check", "claim") and (record.get("username") or "").lower() == username
+            and snipe["wall"] <= record["wall"] < end
+        ]
+
+        release_time = taken_time = None
+        for record in requests:
+            arrival = record["wall"] + record["elapsed"] / 2
+            if record["kind"] == "check" and record.get("status") in AVAILABLE_STATUSES:
+                release_time = release_time or arrival
+            elif record["kind"] == "claim" and record.get("status") == 200:
+                release_time = release_time or arrival
+            elif release_time and record["kind"] == "check" and record.get("status") == 200:
+                taken_time = taken_time or arrival
+
+        outcome = next(
+            (record for record in records if record["kind"] == "event" and record["event"] == "snipe_result"
+             and record.get("username", "").lower() == username and snipe["wall"] <= record["wall"] < end),
+            {}
+        )
+        drops.append({
+            "username": snipe["username"],
+            "strategy": snipe.get("strategy"),
+            "started_at": snipe["wall"],
+            "target_time": snipe.get("target_time") or snipe["wall"],
+            "release_time": release_time,
+            "taken_time": taken_time,
+            "latencies": [record["elapsed"] for record in requests if record.get("status") is not None],
+            "requests": len(requests),
+            "success": outcome.get("success"),
+            "attempts": outcome.get("attempts")
+        })
+
+    return drops
+
+
+def print_summary(records):
+    """Print what a recording contains"""
+    requests = [record for record in records if record["kind"] != "event"]
+    if not requests:
+        print(f"{Fore.YELLOW}No requests recorded")
+        return
+
+    duration = requests[-1]["wall"] - requests[0]["wall"]
+    print(f"{Fore.CYAN}{len(requests)} requests over {duration:.1f}s")
+
+    for kind in ("check", "claim", "other"):
+        of_kind = [record for record in requests if record["kind"] == kind]
+        if not of_kind:
+            continue
+        statuses = {}
+        for record in of_kind:
+            statuses[record.get("status") or "error"] = statuses.get(record.get("status") or "error", 0) + 1
+        latencies = sorted(record["elapsed"] * 1000 for record in of_kind if record.get("status") is not None)
+        line = f"  {kind:<6} {len(of_kind):>5}  statuses {statuses}"
+        if latencies:
+            line += f"  median {statistics.median(latencies):.1f}ms  max {latencies[-1]:.1f}ms"
+        print(line)
+
+    for drop in extract_drops(records):
+        released = f"{drop['release_time'] - drop['target_time']:+.3f}s" if drop["release_time"] else "never seen"
+        print(f"  snipe {drop['username']} ({drop['strategy']}): {drop['requests']} requests, "
+              f"released {released} from target, recorded success: {drop['success']}")
+
+
+if __name__ == "__main__":
+    init(autoreset=True)
+    parser = argparse.ArgumentParser(description="Inspect and replay recorded sniper sessions")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    summary_parser = subparsers.add_parser("summary", help="Summarize a recording")
+    summary_parser.add_argument("recording")
+
+    latency_parser = subparsers.add_parser("latencies", help="Write recorded latencies for strategy_tuner.py --latency-file")
+    latency_parser.add_argument("recording")
+    latency_parser.add_argument("-o", "--output", required=True)
+
+    replay_parser = subparsers.add_parser("replay", help="Replay recorded snipes against a strategy")
+    replay_parser.add_argument("recording")
+    replay_parser.add_argument("-s", "--strategy", default="timing", help="Strategy to replay (default: timing)")
+    replay_parser.add_argument("--params", default="{}", help="Strategy parameters as JSON")
+    replay_parser.add_argument("--scale", type=float, default=20.0, help="Replay speed-up factor (default: 20)")
+
+    args = parser.parse_args()
+    records = load_recording(args.recording)
+
+    if args.command == "summary":
+        print_summary(records)
+
+    elif args.command == "latencies":
+        samples = recorded_latencies(records)
+        with open(args.output, "w") as f:
+            json.dump({"samples": samples}, f)
+        print(f"{Fore.GREEN}Wrote {len(samples)} latency samples to {args.output}")
+
+    elif args.command == "replay":
+        from strategy_tuner import replay_drop, STRATEGY_CLASSES
+
+        if args.strategy not in STRATEGY_CLASSES:
+            print(f"{Fore.RED}Unknown strategy: {args.strategy}")
+            sys.exit(1)
+
+        logging.basicConfig(level=logging.WARNING, format="%(message)s")
+        params = json.loads(args.params)
+        drops = extract_drops(records)
+        if not drops:
+            print(f"{Fore.YELLOW}The recording has no snipes to replay")
+            sys.exit(1)
+
+        for drop in drops:
+            replayed = replay_drop(drop, args.strategy, params, scale=args.scale)
+            outcome = f"{Fore.GREEN}claimed after {replayed.time_to_claim:.3f}s" if replayed.success else f"{Fore.RED}not claimed"
+            print(f"{drop['username']}: recorded success {drop['success']} in {drop['requests']} requests; "
+                  f"{args.strategy} would have {outcome}{Style.RESET_ALL} in {replayed.requests} requests")
@@ -8,17 +8,30 @@ This module handles the core sniping functionality with high-precision timing.
 import os
 import time
 import json
+import copy
 import random
+import itertools
+import contextlib
 import logging
 import datetime
 import threading
 import statistics
-import traceback
+from array import array
 from concurrent.futures import ThreadPoolExecutor
 from colorama import Fore, Style
 
 from minecraft_auth import MinecraftAuth
 from name_utils import NameChecker
+from clock import SYSTEM_CLOCK
+from log_setup import HOT_LOGGER, CONSOLE_FORMAT, setup_logging
+from state_store import get_state_store, STATS_COUNTERS
+from strategy_selector import ThompsonStrategySelector
+from session_recorder import record_event
+from endpoint_health import load_endpoint_health
+from gc_control import critical_section, GCPauseMonitor
+from dns_cache import pin_hosts
+from event_bus import EventBus
+from request_context import Deadline, DeadlineExceeded, SnipeCancelled, CancellationToken, current_token, bind_request_context, retry_wait, wait_until
 try:
     from notifications import NotificationManager
     notifications_available = True
@@ -33,182 +46,164 @@ SNIPE_WINDOW_START = 1.0  # seconds before target time
 SNIPE_WINDOW_END = 5.0  # seconds after target time
 STATS_FILE = "sniper_stats.json"
 ATTACK_PATTERNS_FILE = "attack_patterns.json"
+REQUEST_TIMELINE_CAPACITY = 256  # Request timestamps kept per result
+
+# Hand-picked strategy parameters; strategy_tuner.py can search for better ones
+DEFAULT_ATTACK_PATTERNS = {
+    "time_of_day": {
+        "morning": {"strategy": "timing", "params": {"pre_checks": 4, "max_post_attempts": 12}},
+        "afternoon": {"strategy": "distributed", "params": {"thread_count": 4, "attempts_per_thread": 6}},
+        "evening": {"strategy": "burst", "params": {"burst_count": 8, "burst_delay": 0.15}},
+        "night": {"strategy": "precision", "params": {"latency_ms": 120, "attempts": 15}}
+    },
+    "name_length": {
+        "short": {"strategy": "burst", "params": {"burst_count": 12, "burst_delay": 0.1}},
+        "medium": {"strategy": "distributed", "params": {"thread_count": 4, "attempts_per_thread": 5}},
+        "long": {"strategy": "timing", "params": {"pre_checks": 3, "max_post_attempts": 10}}
+    },
+    "known_successes": {}
+}
+
+class RequestTimeline:
+    """Ring of request timestamps, keeping the most recent ones"""
+    
+    __slots__ = ("_times", "_next", "capacity", "total")
+    
+    # Shared by every timeline; appends are rare and short, and most results never make one
+    _lock = threading.Lock()
+    
+    def __init__(self, capacity=REQUEST_TIMELINE_CAPACITY):
+        self._times = None  # Allocated on the first request, grown up to capacity
+        self._next = 0
+        self.capacity = capacity
+        self.total = 0  # Every request recorded, including ones pushed out of the ring
+    
+    def append(self, timestamp):
+        """Record a request time (Unix timestamp)"""
+        with self._lock:
+            if self._times is None:
+                self._times = array("d")
+            if len(self._times) < self.capacity:
+                self._times.append(timestamp)
+            else:
+                self._times[self._next] = timestamp
+                self._next = (self._next + 1) % self.capacity
+            self.total += 1
+    
+    def __len__(self):
+        return len(self._times) if self._times is not None else 0
+    
+    def __iter__(self):
+        """Iterate over the kept timestamps, oldest first"""
+        if self._times is None:
+            return iter(())
+        return itertools.chain(self._times[self._next:], self._times[:self._next])
+
 
 class SniperResult:
     """Container for sniper results"""
     
+    __slots__ = (
+        "username", "success", "attempts", "time_taken", "error", "created_at",
+        "strategy", "latency", "requests", "claim_time", "availability_detected", "gc_pauses"
+    )
+    
     def __init__(self, username, success=False, attempts=0, time_taken=0, error=None):
         self.username = username
         self.success = success
         self.attempts = attempts
         self.time_taken = time_taken
         self.error = error
-        self.timestamp = datetime.datetime.now()
+        self.created_at = time.time()
         self.strategy = None
         self.latency = None
-        self.requests = []  # Store timestamps of all requests
+        self.requests = RequestTimeline()  # Timestamps of the most recent requests
         self.claim_time = None  # When the claim was successful
+        self.availability_detected = False
+        self.gc_pauses = []  # Garbage collections seen during the snipe
+    
+    @property
+    def timestamp(self):
+        """When the result was created, as a datetime"""
+        return datetime.datetime.fromtimestamp(self.created_at)
+    
+    def to_row(self):
+        """The result as a snipe_results row, in StateStore.record_snipe_result argument order"""
+        return (
+            self.username,
+            self.strategy or "unknown",
+            self.success,
+            self.attempts,
+            self.time_taken,
+            self.error,
+            self.created_at
+        )
 
 
 class SniperStats:
     """Track and analyze sniper statistics"""
     
-    def __init__(self, stats_file=STATS_FILE):
+    def __init__(self, stats_file=STATS_FILE, store=None):
         self.stats_file = stats_file
-        self.stats = self._load_stats()
-    
-    def _load_stats(self):
-        """Load statistics from file"""
-        default_stats = {
-            "total_attempts": 0,
-            "successful_claims": 0,
-            "failed_claims": 0,
-            "usernames_checked": 0,
-            "total_requests": 0,
-            "rate_limited_count": 0,
-            "avg_response_time": 0,
-            "strategy_stats": {},
-            "recent_results": [],
-            "claim_history": []
-        }
+        self.store = store or get_state_store()
         
-        if os.path.exists(self.stats_file):
-            try:
-                with open(self.stats_file, 'r') as f:
-                    stats = json.load(f)
-                    
-                    # Add any missing fields from default_stats
-                    for key, value in default_stats.items():
-                        if key not in stats:
-                            stats[key] = value
-                    
-                    return stats
-            except Exception as e:
-                logging.error(f"{Fore.RED}Error loading stats: {str(e)}")
-        
-        return default_stats
+        # Import the legacy JSON stats file once; the file itself is left in place
+        self.store.migrate_stats_file(self.stats_file)
     
-    def save_stats(self):
-        """Save statistics to file"""
-        try:
-            with open(self.stats_file, 'w') as f:
-                json.dump(self.stats, f, indent=4, default=self._json_serializer)
-            return True
-        except Exception as e:
-            logging.error(f"{Fore.RED}Error saving stats: {str(e)}")
-            return False
+    @property
+    def stats(self):
+        """Snapshot of the statistics in the legacy dictionary layout"""
+        counters = self.store.get_counters(STATS_COUNTERS)
+        samples = counters.pop("response_time_samples")
+        total_response_time = counters.pop("response_time_total")
+        
+        stats = {name: int(value) for name, value in counters.items()}
+        stats["avg_response_time"] = total_response_time / samples if samples else 0
+        stats["strategy_stats"] = self.store.get_strategy_stats()
+        stats["recent_results"] = self.store.get_snipe_results(limit=20)
+        stats["claim_history"] = self.store.get_snipe_results(limit=100, success=True)
+        return stats
     
-    def _json_serializer(self, obj):
-        """Helper to serialize datetime objects in JSON"""
-        if isinstance(obj, (datetime.datetime, datetime.date)):
-            return obj.isoformat()
-        raise TypeError(f"Type {type(obj)} not serializable")
+    def save_stats(self):
+        """Statistics are written to the state store as they change; kept for compatibility"""
+        return True
     
     def update_check_stats(self, username, is_available):
         """Update statistics for username checks"""
-        self.stats["usernames_checked"] += 1
-        self.stats["total_requests"] += 1
-        self.save_stats()
+        self.store.record_check(username, is_available)
     
     def update_attempt_stats(self, attempts, rate_limited=False, response_time=None):
         """Update statistics for snipe attempts"""
-        self.stats["total_attempts"] += 1
-        self.stats["total_requests"] += attempts
-        
-        if rate_limited:
-            self.stats["rate_limited_count"] += 1
-        
-        if response_time:
-            # Update average response time
-            current_avg = self.stats["avg_response_time"]
-            current_count = self.stats["total_requests"] - attempts
+        with self.store.transaction():
+            self.store.increment("total_attempts")
+            self.store.increment("total_requests", attempts)
             
-            if current_count > 0:
-                new_avg = ((current_avg * current_count) + response_time) / (current_count + 1)
-                self.stats["avg_response_time"] = new_avg
-        
-        self.save_stats()
+            if rate_limited:
+                self.store.increment("rate_limited_count")
+            
+            if response_time:
+                self.store.increment("response_time_total", response_time)
+                self.store.increment("response_time_samples")
     
     def record_snipe_result(self, result):
         """Record the result of a snipe attempt"""
-        strategy_name = result.strategy if result.strategy else "unknown"
-        
-        # Initialize strategy stats if not present
-        if strategy_name not in self.stats["strategy_stats"]:
-            self.stats["strategy_stats"][strategy_name] = {
-                "attempts": 0,
-                "successes": 0,
-                "failures": 0,
-                "avg_attempts": 0,
-                "avg_time": 0
-            }
-        
-        # Update strategy stats
-        strategy_stats = self.stats["strategy_stats"][strategy_name]
-        strategy_stats["attempts"] += 1
-        
-        if result.success:
-            self.stats["successful_claims"] += 1
-            strategy_stats["successes"] += 1
-            
-            # Add to claim history
-            self.stats["claim_history"].append({
-                "username": result.username,
-                "timestamp": result.timestamp.isoformat(),
-                "strategy": strategy_name,
-                "attempts": result.attempts,
-                "time_taken": result.time_taken
-            })
-            
-            # Limit claim history to last 100 entries
-            if len(self.stats["claim_history"]) > 100:
-                self.stats["claim_history"] = self.stats["claim_history"][-100:]
-        else:
-            self.stats["failed_claims"] += 1
-            strategy_stats["failures"] += 1
-        
-        # Update average attempts and time
-        old_avg_attempts = strategy_stats["avg_attempts"]
-        old_count = strategy_stats["attempts"] - 1
-        strategy_stats["avg_attempts"] = (old_avg_attempts * old_count + result.attempts) / strategy_stats["attempts"]
-        
-        old_avg_time = strategy_stats["avg_time"]
-        strategy_stats["avg_time"] = (old_avg_time * old_count + result.time_taken) / strategy_stats["attempts"]
-        
-        # Add to recent results
-        result_dict = {
-            "username": result.username,
-            "success": result.success,
-            "strategy": strategy_name,
-            "attempts": result.attempts,
-            "time_taken": result.time_taken,
-            "timestamp": result.timestamp.isoformat()
-        }
-        
-        if result.error:
-            result_dict["error"] = result.error
-        
-        self.stats["recent_results"].append(result_dict)
-        
-        # Limit recent results to last 20 entries
-        if len(self.stats["recent_results"]) > 20:
-            self.stats["recent_results"] = self.stats["recent_results"][-20:]
-        
-        self.save_stats()
+        self.store.record_snipe_result(*result.to_row())
     
     def get_success_rate(self):
         """Calculate the overall success rate"""
-        total = self.stats["successful_claims"] + self.stats["failed_claims"]
+        counters = self.store.get_counters(["successful_claims", "failed_claims"])
+        total = counters["successful_claims"] + counters["failed_claims"]
         if total == 0:
             return 0
-        return (self.stats["successful_claims"] / total) * 100
+        return (counters["successful_claims"] / total) * 100
     
     def get_strategy_success_rate(self, strategy_name):
         """Calculate the success rate for a specific strategy"""
-        if strategy_name not in self.stats["strategy_stats"]:
+        strategy_stats = self.store.get_strategy_stats()
+        if strategy_name not in strategy_stats:
             return 0
         
-        stats = self.stats["strategy_stats"][strategy_name]
+        stats = strategy_stats[strategy_name]
         total = stats["successes"] + stats["failures"]
         
         if total == 0:
@@ -221,7 +216,7 @@ class SniperStats:
         best_strategy = None
         best_rate = -1
         
-        for strategy, stats in self.stats["strategy_stats"].items():
+        for strategy, stats in self.store.get_strategy_stats().items():
             total = stats["successes"] + stats["failures"]
             if total < 5:  # Require at least 5 attempts for meaningful data
                 continue
@@ -235,24 +230,26 @@ class SniperStats:
     
     def generate_report(self):
         """Generate a comprehensive statistics report"""
+        snapshot = self.stats
         report = {
             "summary": {
-                "total_usernames_checked": self.stats["usernames_checked"],
-                "total_snipe_attempts": self.stats["total_attempts"],
-                "successful_claims": self.stats["successful_claims"],
-                "failed_claims": self.stats["failed_claims"],
+                "total_usernames_checked": snapshot["usernames_checked"],
+                "total_snipe_attempts": snapshot["total_attempts"],
+                "successful_claims": snapshot["successful_claims"],
+                "failed_claims": snapshot["failed_claims"],
                 "overall_success_rate": self.get_success_rate(),
-                "total_api_requests": self.stats["total_requests"],
-                "average_response_time_ms": self.stats["avg_response_time"],
-                "rate_limited_count": self.stats["rate_limited_count"]
+                "total_api_requests": snapshot["total_requests"],
+                "average_response_time_ms": snapshot["avg_response_time"],
+                "rate_limited_count": snapshot["rate_limited_count"]
             },
             "strategies": {},
-            "recent_results": self.stats["recent_results"][-5:],  # Last 5 results
-            "recent_claims": [c for c in self.stats["claim_history"][-5:] if c]  # Last 5 claims
+            "recent_results": snapshot["recent_results"][-5:],  # Last 5 results
+            "recent_claims": [c for c in snapshot["claim_history"][-5:] if c],  # Last 5 claims
+            "endpoints": load_endpoint_health(self.store)
         }
         
         # Add strategy-specific stats
-        for strategy, stats in self.stats["strategy_stats"].items():
+        for strategy, stats in snapshot["strategy_stats"].items():
             total = stats["successes"] + stats["failures"]
             success_rate = 0
             if total > 0:
@@ -284,6 +281,50 @@ class SnipeStrategy:
     def __init__(self, name, description):
         self.name = name
         self.description = description
+        self.clock = SYSTEM_CLOCK  # Swapped for a SimulatedClock when tuning
+        self.window_end = SNIPE_WINDOW_END  # Seconds after the target time that requests are still useful
+    
+    def snipe_deadline(self, target_time):
+        """Deadline after which requests made by this strategy are abandoned"""
+        if not target_time:
+            return Deadline.after(SNIPE_WINDOW_START + self.window_end, self.clock)
+        return Deadline(target_time.timestamp() + self.window_end, self.clock)
+    
+    @contextlib.contextmanager
+    def attempt_window(self):
+        """
+        Run the attempt loop with the API hosts' addresses pinned and the GC held off
+        
+        The pin starts here rather than before the pre-window wait, which can
+        last hours, so the DNS cache keeps refreshing the addresses until the
+        requests are about to go out. Simulated runs open no connections and
+        skip the pin.
+        """
+        pin = pin_hosts() if self.clock is SYSTEM_CLOCK else contextlib.nullcontext()
+        with pin, critical_section():
+            yield
+    
+    def pause(self, seconds):
+        """
+        Wait between attempts, waking up as soon as the snipe is cancelled
+        
+        Returns:
+            False if the snipe was cancelled, or the wait would outlast its deadline
+        """
+        return retry_wait(seconds, self.clock)
+    
+    def wait_for_window(self, timestamp):
+        """Sleep until the attempts should start; False if the snipe was cancelled first"""
+        return wait_until(timestamp, self.clock)
+    
+    def _stopped(self, result, attempts, start_time):
+        """Finish the result of a snipe that was cancelled before its attempts ran out"""
+        token = current_token()
+        result.attempts = attempts
+        result.time_taken = self.clock.time() - start_time
+        result.error = f"Snipe cancelled: {token.reason}" if token is not None and token.cancelled else "Snipe window ended"
+        HOT_LOGGER.info("%s%s for %s stopped: %s", Fore.YELLOW, self.name, result.username, result.error)
+        return result
     
     def execute(self, auth, name_checker, username, target_time):
         """Execute the strategy"""
@@ -304,77 +345,81 @@ class BurstStrategy(SnipeStrategy):
     def execute(self, auth, name_checker, username, target_time=None):
         result = SniperResult(username)
         result.strategy = self.name
-        start_time = time.time()
+        start_time = self.clock.time()
         
         # If no target time, use current time
         if not target_time:
-            target_time = datetime.datetime.now()
+            target_time = self.clock.now()
         
         # Calculate wait time until just before target
-        now = datetime.datetime.now()
+        now = self.clock.now()
         time_diff = (target_time - now).total_seconds()
         
         # If target time is in the future, wait until just before
         if time_diff > SNIPE_WINDOW_START:
             wait_time = time_diff - SNIPE_WINDOW_START
-            logging.info(f"{Fore.CYAN}Waiting {wait_time:.2f} seconds until snipe window...")
-            time.sleep(wait_time)
+            HOT_LOGGER.info("%sWaiting %.2f seconds until snipe window...", Fore.CYAN, wait_time)
+            if not self.wait_for_window(target_time.timestamp() - SNIPE_WINDOW_START):
+                return self._stopped(result, 0, start_time)
         
         # Start the burst attempts
-        logging.info(f"{Fore.GREEN}Starting burst snipe for {username}...")
+        HOT_LOGGER.info("%sStarting burst snipe for %s...", Fore.GREEN, username)
         
         success = False
         attempts = 0
         
-        try:
-            # Check if available first
-            if name_checker.is_username_available(username):
-                for i in range(self.burst_count):
-                    attempts += 1
-                    result.requests.append(time.time())
-                    
-                    # Try to claim
-                    if auth.change_username(username):
-                        success = True
-                        result.claim_time = time.time()
-                        break
-                    
-                    # Brief delay between attempts
-                    time.sleep(self.burst_delay)
-            else:
-                # If not available yet, keep checking and attempt to claim when available
-                max_wait = SNIPE_WINDOW_START + SNIPE_WINDOW_END
-                attempt_start = time.time()
-                
-                while time.time() - attempt_start < max_wait and attempts < MAX_ATTEMPTS:
-                    attempts += 1
-                    check_time = time.time()
-                    result.requests.append(check_time)
-                    
-                    if name_checker.is_username_available(username):
+        with self.attempt_window():
+            try:
+                # Check if available first
+                if name_checker.is_username_available(username):
+                    for i in range(self.burst_count):
+                        attempts += 1
+                        result.requests.append(self.clock.time())
+                        
+                        # Try to claim
                         if auth.change_username(username):
                             success = True
-                            result.claim_time = time.time()
+                            result.claim_time = self.clock.time()
                             break
+                        
+                        # Brief delay between attempts
+                        if not self.pause(self.burst_delay):
+                            break
+                else:
+                    # If not available yet, keep checking and attempt to claim when available
+                    max_wait = SNIPE_WINDOW_START + SNIPE_WINDOW_END
+                    attempt_start = self.clock.time()
                     
-                    # Brief delay between checks
-                    time.sleep(self.burst_delay)
-        
-        except Exception as e:
-            result.error = str(e)
-            logging.error(f"{Fore.RED}Error during burst snipe: {str(e)}")
-            logging.debug(traceback.format_exc())
+                    while self.clock.time() - attempt_start < max_wait and attempts < MAX_ATTEMPTS:
+                        attempts += 1
+                        check_time = self.clock.time()
+                        result.requests.append(check_time)
+                        
+                        if name_checker.is_username_available(username):
+                            if auth.change_username(username):
+                                success = True
+                                result.claim_time = self.clock.time()
+                                break
+                        
+                        # Brief delay between checks
+                        if not self.pause(self.burst_delay):
+                            break
+            
+            except Exception as e:
+                result.error = str(e)
+                HOT_LOGGER.error("%sError during burst snipe: %s", Fore.RED, e)
+                HOT_LOGGER.debug("Traceback:", exc_info=True)
         
-        time_taken = time.time() - start_time
+        time_taken = self.clock.time() - start_time
         
         result.success = success
         result.attempts = attempts
         result.time_taken = time_taken
         
         if success:
-            logging.info(f"{Fore.GREEN}Successfully claimed {username} using Burst Strategy!")
+            HOT_LOGGER.info("%sSuccessfully claimed %s using Burst Strategy!", Fore.GREEN, username)
         else:
-            logging.info(f"{Fore.RED}Failed to claim {username} after {attempts} attempts ({time_taken:.2f}s)")
+            HOT_LOGGER.info("%sFailed to claim %s after %d attempts (%.2fs)", Fore.RED, username, attempts, time_taken)
         
         return result
 
@@ -394,14 +439,14 @@ class TimingStrategy(SnipeStrategy):
     def execute(self, auth, name_checker, username, target_time=None):
         result = SniperResult(username)
         result.strategy = self.name
-        start_time = time.time()
+        start_time = self.clock.time()
         
         # If no target time, use current time
         if not target_time:
-            target_time = datetime.datetime.now()
+            target_time = self.clock.now()
         
         # Calculate wait time until just before target
-        now = datetime.datetime.now()
+        now = self.clock.now()
         time_diff = (target_time - now).total_seconds()
         
         attempts = 0
@@ -413,71 +458,75 @@ class TimingStrategy(SnipeStrategy):
                 wait_between_checks = time_diff / (self.pre_checks + 2)
                 
                 for i in range(self.pre_checks):
-                    logging.info(f"{Fore.CYAN}Pre-check {i+1}/{self.pre_checks} for {username}...")
-                    check_time = time.time()
+                    HOT_LOGGER.info("%sPre-check %d/%d for %s...", Fore.CYAN, i+1, self.pre_checks, username)
+                    check_time = self.clock.time()
                     result.requests.append(check_time)
                     available = name_checker.is_username_available(username)
                     
                     if available:
-                        logging.info(f"{Fore.GREEN}Username {username} is already available! Attempting to claim...")
+                        HOT_LOGGER.info("%sUsername %s is already available! Attempting to claim...", Fore.GREEN, username)
                         if auth.change_username(username):
                             success = True
-                            result.claim_time = time.time()
+                            result.claim_time = self.clock.time()
                             attempts += 1
                             break
                     
-                    time.sleep(wait_between_checks)
+                    if not self.pause(wait_between_checks):
+                        return self._stopped(result, attempts, start_time)
                 
                 # If not claimed during pre-checks, wait until just before target
                 if not success:
-                    now = datetime.datetime.now()
+                    now = self.clock.now()
                     remaining = (target_time - now).total_seconds() - SNIPE_WINDOW_START/2
                     if remaining > 0:
-                        logging.info(f"{Fore.CYAN}Waiting {remaining:.2f}s until final snipe window...")
-                        time.sleep(remaining)
+                        HOT_LOGGER.info("%sWaiting %.2fs until final snipe window...", Fore.CYAN, remaining)
+                        if not self.wait_for_window(target_time.timestamp() - SNIPE_WINDOW_START/2):
+                            return self._stopped(result, attempts, start_time)
             
-            # Main snipe attempt near target time
-            if not success:
-                # Try rapid-fire attempts around the drop time
-                logging.info(f"{Fore.CYAN}Starting main snipe attempts for {username}...")
-                
-                # Keep trying until max attempts or success
-                retry_delay = 0.2
-                for i in range(self.max_post_attempts):
-                    attempts += 1
-                    check_time = time.time()
-                    result.requests.append(check_time)
+            with self.attempt_window():
+                # Main snipe attempt near target time
+                if not success:
+                    # Try rapid-fire attempts around the drop time
+                    HOT_LOGGER.info("%sStarting main snipe attempts for %s...", Fore.CYAN, username)
                     
-                    # Check if available
-                    if name_checker.is_username_available(username):
-                        # Try to claim
-                        if auth.change_username(username):
-                            success = True
-                            result.claim_time = time.time()
+                    # Keep trying until max attempts or success
+                    retry_delay = 0.2
+                    for i in range(self.max_post_attempts):
+                        attempts += 1
+                        check_time = self.clock.time()
+                        result.requests.append(check_time)
+                        
+                        # Check if available
+                        if name_checker.is_username_available(username):
+                            # Try to claim
+                            if auth.change_username(username):
+                                success = True
+                                result.claim_time = self.clock.time()
+                                break
+                            else:
+                                # If claim failed but it's available, try again faster
+                                retry_delay = 0.1
+                        
+                        # Add some jitter to avoid pattern detection
+                        jitter = random.uniform(0, 0.1)
+                        if not self.pause(retry_delay + jitter):
                             break
-                        else:
-                            # If claim failed but it's available, try again faster
-                            retry_delay = 0.1
-                    
-                    # Add some jitter to avoid pattern detection
-                    jitter = random.uniform(0, 0.1)
-                    time.sleep(retry_delay + jitter)
             
         except Exception as e:
             result.error = str(e)
-            logging.error(f"{Fore.RED}Error during timing snipe: {str(e)}")
-            logging.debug(traceback.format_exc())
+            HOT_LOGGER.error("%sError during timing snipe: %s", Fore.RED, e)
+            HOT_LOGGER.debug("Traceback:", exc_info=True)
         
-        time_taken = time.time() - start_time
+        time_taken = self.clock.time() - start_time
         
         result.success = success
         result.attempts = attempts
         result.time_taken = time_taken
         
         if success:
-            logging.info(f"{Fore.GREEN}Successfully claimed {username} using Timing Strategy!")
+            HOT_LOGGER.info("%sSuccessfully claimed %s using Timing Strategy!", Fore.GREEN, username)
         else:
-            logging.info(f"{Fore.RED}Failed to claim {username} after {attempts} attempts ({time_taken:.2f}s)")
+            HOT_LOGGER.info("%sFailed to claim %s after %d attempts (%.2fs)", Fore.RED, username, attempts, time_taken)
         
         return result
 
@@ -492,119 +541,130 @@ class DistributedStrategy(SnipeStrategy):
         )
         self.thread_count = min(thread_count, MAX_THREADS)
         self.attempts_per_thread = attempts_per_thread
-        self._stop_flag = threading.Event()
-        self._success_flag = threading.Event()
     
-    def _snipe_worker(self, auth, name_checker, username, result_dict, thread_id, result):
+    def _snipe_worker(self, auth, name_checker, username, result_dict, thread_id, result, token):
         """Worker function for threaded sniping"""
         attempts = 0
+        start_time = self.clock.time()
         
         try:
-            start_time = time.time()
-            
             # Add some slight offset to distribute thread timing
-            time.sleep(thread_id * 0.05)
+            token.wait(thread_id * 0.05, self.clock)
             
             for i in range(self.attempts_per_thread):
-                # Stop if another thread succeeded or we should stop
-                if self._stop_flag.is_set() or self._success_flag.is_set():
+                # Stop as soon as another thread claimed the name or the snipe was cancelled
+                if token.cancelled:
                     break
                 
                 attempts += 1
-                check_time = time.time()
+                check_time = self.clock.time()
                 result.requests.append(check_time)
                 
                 # Check if available
                 if name_checker.is_username_available(username):
                     # Try to claim
                     if auth.change_username(username):
-                        self._success_flag.set()  # Signal other threads to stop
-                        result.claim_time = time.time()
+                        token.cancel("claimed")  # Stop the other threads, including their waits
+                        result.claim_time = self.clock.time()
                         result_dict[thread_id] = {
                             "success": True,
                             "attempts": attempts,
-                            "time": time.time() - start_time
+                            "time": self.clock.time() - start_time
                         }
                         return
                 
-                # Brief delay between attempts with jitter
+                # Brief delay between attempts with jitter, cut short by cancellation
                 jitter = random.uniform(0, 0.1)
-                time.sleep(0.2 + jitter)
+                if token.wait(0.2 + jitter, self.clock):
+                    break
             
             result_dict[thread_id] = {
                 "success": False,
                 "attempts": attempts,
-                "time": time.time() - start_time
+                "time": self.clock.time() - start_time
+            }
+            
+        except SnipeCancelled:
+            # Another thread claimed the name before this one's request went out
+            result_dict[thread_id] = {
+                "success": False,
+                "attempts": attempts,
+                "time": self.clock.time() - start_time
             }
             
         except Exception as e:
+            if isinstance(e, DeadlineExceeded):
+                token.cancel("window ended")
+
             result_dict[thread_id] = {
                 "success": False,
                 "attempts": attempts,
-                "time": time.time() - start_time,
+                "time": self.clock.time() - start_time,
                 "error": str(e)
             }
     
     def execute(self, auth, name_checker, username, target_time=None):
         result = SniperResult(username)
         result.strategy = self.name
-        start_time = time.time()
+        start_time = self.clock.time()
         
-        # Reset flags
-        self._stop_flag.clear()
-        self._success_flag.clear()
+        # Shared by this snipe's threads; also cancelled with any batch this snipe belongs to
+        token = CancellationToken(parent=current_token())
         
         # If no target time, use current time
         if not target_time:
-            target_time = datetime.datetime.now()
+            target_time = self.clock.now()
         
         # Calculate wait time until just before target
-        now = datetime.datetime.now()
+        now = self.clock.now()
         time_diff = (target_time - now).total_seconds()
         
         # If target time is in the future, wait until just before
         if time_diff > SNIPE_WINDOW_START:
             wait_time = time_diff - SNIPE_WINDOW_START
-            logging.info(f"{Fore.CYAN}Waiting {wait_time:.2f} seconds until snipe window...")
-            time.sleep(wait_time)
+            HOT_LOGGER.info("%sWaiting %.2f seconds until snipe window...", Fore.CYAN, wait_time)
+            if not self.wait_for_window(target_time.timestamp() - SNIPE_WINDOW_START):
+                return self._stopped(result, 0, start_time)
         
-        logging.info(f"{Fore.GREEN}Starting distributed snipe for {username} with {self.thread_count} threads...")
+        HOT_LOGGER.info("%sStarting distributed snipe for %s with %d threads...", Fore.GREEN, username, self.thread_count)
         
         thread_results = {}
         threads = []
         
-        try:
-            # Create and start threads
-            for i in range(self.thread_count):
-                thread = threading.Thread(
-                    target=self._snipe_worker,
-                    args=(auth, name_checker, username, thread_results, i, result)
-                )
-                thread.start()
-                threads.append(thread)
-            
-            # Wait for all threads to complete
-            for thread in threads:
-                thread.join()
-            
-            # Collect results
-            total_attempts = sum(r.get("attempts", 0) for r in thread_results.values())
-            success = any(r.get("success", False) for r in thread_results.values())
-            
-            result.success = success
-            result.attempts = total_attempts
-            result.time_taken = time.time() - start_time
-            
-            if success:
-                logging.info(f"{Fore.GREEN}Successfully claimed {username} using Distributed Strategy!")
-            else:
-                logging.info(f"{Fore.RED}Failed to claim {username} after {total_attempts} attempts ({result.time_taken:.2f}s)")
-            
-        except Exception as e:
-            result.error = str(e)
-            logging.error(f"{Fore.RED}Error during distributed snipe: {str(e)}")
-            logging.debug(traceback.format_exc())
-            self._stop_flag.set()  # Signal all threads to stop
+        with self.attempt_window():
+            try:
+                # Create and start threads
+                with token:
+                    for i in range(self.thread_count):
+                        thread = threading.Thread(
+                            target=bind_request_context(self._snipe_worker),
+                            args=(auth, name_checker, username, thread_results, i, result, token)
+                        )
+                        thread.start()
+                        threads.append(thread)
+                
+                # Wait for all threads to complete
+                for thread in threads:
+                    thread.join()
+                
+                # Collect results
+                total_attempts = sum(r.get("attempts", 0) for r in thread_results.values())
+                success = any(r.get("success", False) for r in thread_results.values())
+                
+                result.success = success
+                result.attempts = total_attempts
+                result.time_taken = self.clock.time() - start_time
+                
+                if success:
+                    HOT_LOGGER.info("%sSuccessfully claimed %s using Distributed Strategy!", Fore.GREEN, username)
+                else:
+                    HOT_LOGGER.info("%sFailed to claim %s after %d attempts (%.2fs)", Fore.RED, username, total_attempts, result.time_taken)
+                
+            except Exception as e:
+                result.error = str(e)
+                HOT_LOGGER.error("%sError during distributed snipe: %s", Fore.RED, e)
+                HOT_LOGGER.debug("Traceback:", exc_info=True)
+                token.cancel("error")  # Signal all threads to stop
         
         return result
 
@@ -623,20 +683,21 @@ class PrecisionStrategy(SnipeStrategy):
         self.latency_ms = latency_ms / 1000.0  # Convert to seconds
         self.pre_window = pre_window
         self.post_window = post_window
+        self.window_end = post_window
         self.max_attempts = attempts
     
     def execute(self, auth, name_checker, username, target_time=None):
         result = SniperResult(username)
         result.strategy = self.name
         result.latency = self.latency_ms
-        start_time = time.time()
+        start_time = self.clock.time()
         
         # If no target time, use current time
         if not target_time:
-            target_time = datetime.datetime.now()
+            target_time = self.clock.now()
         
         # Calculate wait time until just before target, compensating for latency
-        now = datetime.datetime.now()
+        now = self.clock.now()
         time_diff = (target_time - now).total_seconds()
         
         attempts = 0
@@ -648,71 +709,75 @@ class PrecisionStrategy(SnipeStrategy):
                 # Wait until just before target time, accounting for latency
                 wait_time = time_diff - self.pre_window - self.latency_ms
                 if wait_time > 0:
-                    logging.info(f"{Fore.CYAN}Precision waiting {wait_time:.3f}s until snipe window...")
-                    time.sleep(wait_time)
-            
-            # Start precise sniping attempts
-            logging.info(f"{Fore.CYAN}Starting precision snipe with latency compensation of {self.latency_ms*1000:.1f}ms")
-            
-            # Pre-window attempts (before expected drop)
-            pre_start = time.time()
-            while time.time() - pre_start < self.pre_window and attempts < self.max_attempts / 2:
-                attempts += 1
-                check_time = time.time()
-                result.requests.append(check_time)
-                
-                if name_checker.is_username_available(username):
-                    if auth.change_username(username):
-                        success = True
-                        result.claim_time = time.time()
-                        logging.info(f"{Fore.GREEN}Successfully claimed in pre-window!")
-                        break
-                
-                # Exponentially decrease delay as we approach target time
-                remaining = self.pre_window - (time.time() - pre_start)
-                delay = max(0.05, remaining / 4)  # Minimum 50ms delay
-                time.sleep(delay)
+                    HOT_LOGGER.info("%sPrecision waiting %.3fs until snipe window...", Fore.CYAN, wait_time)
+                    if not self.wait_for_window(target_time.timestamp() - self.pre_window - self.latency_ms):
+                        return self._stopped(result, attempts, start_time)
             
-            # If we haven't succeeded yet, continue with post-window attempts
-            if not success:
-                # Critical period - try rapid-fire attempts
-                post_start = time.time()
-                attempt_delay = 0.1
+            with self.attempt_window():
+                # Start precise sniping attempts
+                HOT_LOGGER.info("%sStarting precision snipe with latency compensation of %.1fms", Fore.CYAN, self.latency_ms*1000)
                 
-                while time.time() - post_start < self.post_window and attempts < self.max_attempts:
+                # Pre-window attempts (before expected drop)
+                pre_start = self.clock.time()
+                while self.clock.time() - pre_start < self.pre_window and attempts < self.max_attempts / 2:
                     attempts += 1
-                    check_time = time.time()
+                    check_time = self.clock.time()
                     result.requests.append(check_time)
                     
                     if name_checker.is_username_available(username):
                         if auth.change_username(username):
                             success = True
-                            result.claim_time = time.time()
-                            logging.info(f"{Fore.GREEN}Successfully claimed in post-window!")
+                            result.claim_time = self.clock.time()
+                            HOT_LOGGER.info("%sSuccessfully claimed in pre-window!", Fore.GREEN)
                             break
-                        else:
-                            # If we found it's available but claim failed, try even faster
-                            attempt_delay = 0.05
                     
-                    # Brief delay with slight jitter
-                    jitter = random.uniform(0, 0.02)
-                    time.sleep(attempt_delay + jitter)
+                    # Exponentially decrease delay as we approach target time
+                    remaining = self.pre_window - (self.clock.time() - pre_start)
+                    delay = max(0.05, remaining / 4)  # Minimum 50ms delay
+                    if not self.pause(delay):
+                        return self._stopped(result, attempts, start_time)
+                
+                # If we haven't succeeded yet, continue with post-window attempts
+                if not success:
+                    # Critical period - try rapid-fire attempts
+                    post_start = self.clock.time()
+                    attempt_delay = 0.1
+                    
+                    while self.clock.time() - post_start < self.post_window and attempts < self.max_attempts:
+                        attempts += 1
+                        check_time = self.clock.time()
+                        result.requests.append(check_time)
+                        
+                        if name_checker.is_username_available(username):
+                            if auth.change_username(username):
+                                success = True
+                                result.claim_time = self.clock.time()
+                                HOT_LOGGER.info("%sSuccessfully claimed in post-window!", Fore.GREEN)
+                                break
+                            else:
+                                # If we found it's available but claim failed, try even faster
+                                attempt_delay = 0.05
+                        
+                        # Brief delay with slight jitter
+                        jitter = random.uniform(0, 0.02)
+                        if not self.pause(attempt_delay + jitter):
+                            break
             
         except Exception as e:
             result.error = str(e)
-            logging.error(f"{Fore.RED}Error during precision snipe: {str(e)}")
-            logging.debug(traceback.format_exc())
+            HOT_LOGGER.error("%sError during precision snipe: %s", Fore.RED, e)
+            HOT_LOGGER.debug("Traceback:", exc_info=True)
         
-        time_taken = time.time() - start_time
+        time_taken = self.clock.time() - start_time
         
         result.success = success
         result.attempts = attempts
         result.time_taken = time_taken
         
         if success:
-            logging.info(f"{Fore.GREEN}Successfully claimed {username} using Precision Strategy!")
+            HOT_LOGGER.info("%sSuccessfully claimed %s using Precision Strategy!", Fore.GREEN, username)
         else:
-            logging.info(f"{Fore.RED}Failed to claim {username} after {attempts} attempts ({time_taken:.2f}s)")
+            HOT_LOGGER.info("%sFailed to claim %s after %d attempts (%.2fs)", Fore.RED, username, attempts, time_taken)
         
         return result
 
@@ -723,31 +788,41 @@ class AdaptiveStrategy(SnipeStrategy):
     based on past successes, time of day, and Mojang API behavior
     """
     
-    def __init__(self, patterns_file=ATTACK_PATTERNS_FILE):
+    def __init__(self, patterns_file=ATTACK_PATTERNS_FILE, store=None):
         super().__init__(
             "Adaptive Strategy",
             "Self-tuning strategy that analyzes historical data"
         )
         self.patterns_file = patterns_file
+        self.store = store or get_state_store()
         self.patterns = self._load_attack_patterns()
         self.selected_strategy = None
+        
+        # Known successes are learned at runtime and live in the state store;
+        # the patterns file is read-only configuration
+        self.store.migrate_known_successes(self.patterns_file)
+        
+        # The pattern tables list the strategy/parameter arms to choose between
+        arms = []
+        for table in ("time_of_day", "name_length"):
+            for entry in self.patterns[table].values():
+                if (entry["strategy"], entry["params"]) not in arms:
+                    arms.append((entry["strategy"], entry["params"]))
+        
+        self.selector = ThompsonStrategySelector(arms, store=self.store)
+        self.selector.seed_from_strategy_stats(self.store.get_strategy_stats(), {
+            name: [strategy_class().name, f"Adaptive ({name})"]
+            for name, strategy_class in (
+                ("burst", BurstStrategy),
+                ("timing", TimingStrategy),
+                ("distributed", DistributedStrategy),
+                ("precision", PrecisionStrategy)
+            )
+        })
     
     def _load_attack_patterns(self):
         """Load attack patterns from file or use defaults"""
-        default_patterns = {
-            "time_of_day": {
-                "morning": {"strategy": "timing", "params": {"pre_checks": 4, "max_post_attempts": 12}},
-                "afternoon": {"strategy": "distributed", "params": {"thread_count": 4, "attempts_per_thread": 6}},
-                "evening": {"strategy": "burst", "params": {"burst_count": 8, "burst_delay": 0.15}},
-                "night": {"strategy": "precision", "params": {"latency_ms": 120, "attempts": 15}}
-            },
-            "name_length": {
-                "short": {"strategy": "burst", "params": {"burst_count": 12, "burst_delay": 0.1}},
-                "medium": {"strategy": "distributed", "params": {"thread_count": 4, "attempts_per_thread": 5}},
-                "long": {"strategy": "timing", "params": {"pre_checks": 3, "max_post_attempts": 10}}
-            },
-            "known_successes": {}
-        }
+        default_patterns = copy.deepcopy(DEFAULT_ATTACK_PATTERNS)
         
         if os.path.exists(self.patterns_file):
             try:
@@ -765,63 +840,33 @@ class AdaptiveStrategy(SnipeStrategy):
         
         return default_patterns
     
-    def _save_attack_patterns(self):
-        """Save attack patterns to file"""
-        try:
-            with open(self.patterns_file, 'w') as f:
-                json.dump(self.patterns, f, indent=4)
-            return True
-        except Exception as e:
-            logging.error(f"{Fore.RED}Error saving attack patterns: {str(e)}")
-            return False
+    def _get_known_success(self, username):
+        """Get the strategy that previously claimed a username, if any"""
+        return self.store.cache_get("known_successes", username)
     
     def _update_known_successes(self, username, strategy_name, params):
         """Update the known successes with a new successful strategy"""
-        self.patterns["known_successes"][username] = {
+        self.store.cache_set("known_successes", username, {
             "strategy": strategy_name,
             "params": params,
             "timestamp": datetime.datetime.now().isoformat()
-        }
-        self._save_attack_patterns()
+        })
     
     def _select_best_strategy(self, username, target_time=None):
         """
-        Select the best strategy based on historical data,
-        time of day, and username characteristics
+        Select the best strategy for a username
+        
+        A strategy that already claimed this username is reused; otherwise the
+        selector samples the arm with the best expected claims per request.
         """
         # Check if we have a known successful strategy for this username
-        if username in self.patterns["known_successes"]:
-            known = self.patterns["known_successes"][username]
-            logging.info(f"{Fore.CYAN}Using previously successful strategy for {username}")
+        known = self._get_known_success(username)
+        if known:
+            HOT_LOGGER.info("%sUsing previously successful strategy for %s", Fore.CYAN, username)
             return known["strategy"], known["params"]
         
-        # Determine time of day
-        current_hour = datetime.datetime.now().hour
-        time_of_day = "night"
-        if 5 <= current_hour < 12:
-            time_of_day = "morning"
-        elif 12 <= current_hour < 17:
-            time_of_day = "afternoon"
-        elif 17 <= current_hour < 22:
-            time_of_day = "evening"
-        
-        # Determine username length category
-        length = len(username)
-        length_category = "medium"
-        if length <= 5:
-            length_category = "short"
-        elif length >= 10:
-            length_category = "long"
-        
-        # Get strategies based on time of day and name length
-        time_strategy = self.patterns["time_of_day"][time_of_day]
-        length_strategy = self.patterns["name_length"][length_category]
-        
-        # Select strategy (prioritize time of day)
-        strategy_name = time_strategy["strategy"]
-        params = time_strategy["params"]
-        
-        logging.info(f"{Fore.CYAN}Selected {strategy_name} strategy based on time ({time_of_day}) and name length ({length_category})")
+        strategy_name, params = self.selector.select()
+        HOT_LOGGER.info("%sSelected %s strategy by Thompson sampling over past results", Fore.CYAN, strategy_name)
         return strategy_name, params
     
     def execute(self, auth, name_checker, username, target_time=None):
@@ -841,10 +886,12 @@ class AdaptiveStrategy(SnipeStrategy):
         else:
             strategy = TimingStrategy()  # Default fallback
         
-        # Execute the selected strategy
-        result = strategy.execute(auth, name_checker, username, target_time)
+        # Execute the selected strategy, within its own window if that's tighter
+        with strategy.snipe_deadline(target_time):
+            result = strategy.execute(auth, name_checker, username, target_time)
         
-        # Record successful strategies
+        # Learn from every outcome, and remember what claimed this username
+        self.selector.update(strategy_name, params, result.success, result.attempts)
         if result.success:
             self._update_known_successes(username, strategy_name, params)
         
@@ -863,6 +910,8 @@ class Sniper:
         self.name_checker = NameChecker(base_delay=base_delay, proxies=proxies)
         self.authenticated = False
         self.stats = SniperStats()
+        # Monitor and snipe events; subscribers run on their own threads, never the polling loop's
+        self.events = EventBus()
         self.strategies = {
             "burst": BurstStrategy(),
             "timing": TimingStrategy(),
@@ -907,25 +956,33 @@ class Sniper:
     
     def check_username(self, username):
         """Check if a username is available"""
-        return self.name_checker.check_username_availability(username)
+        is_available = self.name_checker.check_username_availability(username)
+        self.stats.update_check_stats(username, is_available)
+        return is_available
     
     def check_usernames(self, usernames):
         """Check multiple usernames at once (more efficient)"""
         if len(usernames) > 10:
             logging.warning(f"{Fore.YELLOW}Checking more than 10 usernames at once may exceed rate limits.")
         
-        results = {}
-        # Process in batches of 10 to utilize bulk API efficiently
-        for i in range(0, len(usernames), 10):
-            batch = usernames[i:i+10]
+        return dict(self.iter_check_usernames(usernames))
+    
+    def iter_check_usernames(self, usernames):
+        """
+        Check usernames from any iterable, yielding (username, is_available) as each check finishes
+        
+        Usernames are consumed lazily in batches of 10 with a small delay between batches.
+        """
+        usernames = iter(usernames)
+        batch = list(itertools.islice(usernames, 10))
+        while batch:
             for username in batch:
-                results[username] = self.name_checker.check_username_availability(username)
+                yield username, self.check_username(username)
             
             # Small delay between batches
-            if i + 10 < len(usernames):
+            batch = list(itertools.islice(usernames, 10))
+            if batch:
                 time.sleep(1)
-        
-        return results
     
     def get_drop_time(self, username):
         """Get the estimated drop time for a username"""
@@ -965,6 +1022,7 @@ class Sniper:
         
         # Attempt to claim
         success = self.auth.change_username(username)
+        self.events.publish("claim_result", username=username, success=success)
         
         # Send notification
         if success and self.notifications:
@@ -972,7 +1030,7 @@ class Sniper:
         
         return success
     
-    def snipe_username(self, username, strategy_name="timing", target_time=None, latency_ms=None):
+    def snipe_username(self, username, strategy_name="timing", target_time=None, latency_ms=None, allocation=None):
         """
         Snipe a username with the specified strategy.
         
@@ -981,10 +1039,15 @@ class Sniper:
             strategy_name: The strategy to use (burst, timing, distributed, precision, adaptive)
             target_time: Optional target time for the snipe (datetime object)
             latency_ms: Optional network latency in milliseconds for precise timing
+            allocation: Optional TargetAllocation from rate_planner capping the requests spent
         
         Returns:
             SniperResult object with the results
         """
+        if allocation is not None and not allocation.feasible:
+            logging.error(f"{Fore.RED}Skipping {username}: {allocation.reason}")
+            return SniperResult(username, error=allocation.reason)
+        
         if not self.authenticated:
             logging.error(f"{Fore.RED}Authentication required to snipe username")
             return SniperResult(username, error="Not authenticated")
@@ -1011,9 +1074,28 @@ class Sniper:
                 target_time = drop_time
                 logging.info(f"{Fore.CYAN}Using NameMC drop time: {target_time}")
         
+        # Requests beyond the planned allocation raise inside the strategy and end the snipe
+        auth, name_checker = self.auth, self.name_checker
+        if allocation is not None:
+            auth, name_checker = allocation.guard(auth), allocation.guard(name_checker)
+            logging.info(f"{Fore.CYAN}Planned request budget for {username}: {allocation.allocated}")
+        
         # Execute the strategy
         logging.info(f"{Fore.CYAN}Starting snipe for {username} using {strategy.name}...")
-        result = strategy.execute(self.auth, self.name_checker, username, target_time)
+        record_event("snipe", username=username, strategy=strategy_name,
+                     target_time=target_time.timestamp() if target_time else None)
+        self.events.publish("snipe_started", username=username, strategy=strategy_name, target_time=target_time)
+        with strategy.snipe_deadline(target_time), GCPauseMonitor() as gc_monitor:
+            result = strategy.execute(auth, name_checker, username, target_time)
+        result.gc_pauses = gc_monitor.pauses
+        window_pauses = gc_monitor.window_pauses()
+        record_event("snipe_result", username=username, success=result.success, attempts=result.attempts,
+                     gc_pauses=len(gc_monitor.pauses), gc_pause_ms=round(gc_monitor.total_ms, 3),
+                     gc_window_pauses=len(window_pauses))
+        if gc_monitor.pauses:
+            logging.info(f"{Fore.CYAN}{len(gc_monitor.pauses)} garbage collections during the snipe "
+                         f"({gc_monitor.total_ms:.2f}ms, {len(window_pauses)} inside the window)")
+        self.events.publish("snipe_result", username=username, result=result)
         
         # Record statistics
         self.stats.record_snipe_result(result)
@@ -1033,61 +1115,74 @@ class Sniper:
         """
         Monitor a username until it becomes available.
         
+        Every check is published as a "monitor_check" event and the hit as
+        "username_available"; subscribe to self.events to follow them. The
+        loop never waits on subscribers.
+        
         Args:
             username: The username to monitor
             check_interval: How often to check (in seconds)
             auto_claim: Whether to automatically claim when available
-            callback: Optional callback function to call when status changes
+            callback: Optional callback(username, is_available) run after every check,
+                on a dispatch thread rather than the polling loop
+        
+        Returns:
+            True once the username is available
         """
         logging.info(f"{Fore.CYAN}Starting to monitor username: {username}")
         
+        subscription = None
+        if callback:
+            def deliver(event):
+                if event.data["username"] == username:
+                    callback(username, event.data["available"])
+            subscription = self.events.subscribe(deliver, topics=("monitor_check",), name=f"monitor-callback-{username}")
+        
         checks = 0
         start_time = time.time()
         
-        while True:
-            checks += 1
-            current_time = datetime.datetime.now().strftime("%H:%M:%S")
-            
-            # Check if available
-            is_available = self.check_username(username)
-            
-            if is_available:
-                logging.info(f"{Fore.GREEN}[{current_time}] Username {username} is AVAILABLE!")
-                
-                # Send notification
-                if self.notifications:
-                    self.notifications.notify("username_available", username=username)
-                
-                # Call callback if provided
-                if callback:
-                    callback(username, True)
+        try:
+            while True:
+                checks += 1
                 
-                # Attempt to claim if requested
-                if auto_claim and self.authenticated:
-                    if self.claim_username(username):
-                        logging.info(f"{Fore.GREEN}Successfully claimed {username}!")
-                        
-                        # Send notification
-                        if self.notifications:
-                            self.notifications.notify("username_claimed", username=username)
-                        
-                        return True
-                    else:
-                        logging.error(f"{Fore.RED}Failed to claim {username}")
+                # Check if available
+                is_available = self.check_username(username)
+                self.events.publish("monitor_check", username=username, available=is_available, checks=checks)
                 
-                return True
-            else:
-                if checks % 10 == 0:  # Only log every 10 checks to avoid spam
-                    elapsed = time.time() - start_time
-                    logging.info(f"{Fore.RED}[{current_time}] Username {username} is taken. (Check #{checks}, elapsed: {elapsed:.1f}s)")
+                if is_available:
+                    HOT_LOGGER.info("%s[%s] Username %s is AVAILABLE!", Fore.GREEN, datetime.datetime.now().strftime("%H:%M:%S"), username)
+                    self.events.publish("username_available", username=username, checks=checks)
+                    
+                    # Send notification
+                    if self.notifications:
+                        self.notifications.notify("username_available", username=username)
+                    
+                    # Attempt to claim if requested
+                    if auto_claim and self.authenticated:
+                        if self.claim_username(username):
+                            logging.info(f"{Fore.GREEN}Successfully claimed {username}!")
+                            
+                            # Send notification
+                            if self.notifications:
+                                self.notifications.notify("username_claimed", username=username)
+                            
+                            return True
+                        else:
+                            logging.error(f"{Fore.RED}Failed to claim {username}")
+                    
+                    return True
+                else:
+                    if checks % 10 == 0:  # Only log every 10 checks to avoid spam
+                        elapsed = time.time() - start_time
+                        HOT_LOGGER.info("%s[%s] Username %s is taken. (Check #%d, elapsed: %.1fs)", Fore.RED, datetime.datetime.now().strftime("%H:%M:%S"), username, checks, elapsed)
                 
-                # Call callback if provided
-                if callback:
-                    callback(username, False)
-            
-            # Add jitter to the delay
-            jitter = random.uniform(0, 0.5)
-            time.sleep(check_interval + jitter)
+                # Add jitter to the delay
+                jitter = random.uniform(0, 0.5)
+                time.sleep(check_interval + jitter)
+        finally:
+            # Let the callback see the final check before returning
+            if subscription is not None:
+                subscription.close()
     
     def test_network_latency(self, iterations=10):
         """Test network latency to Mojang API for timing calibration"""
@@ -1169,7 +1264,7 @@ class Sniper:
 
 if __name__ == "__main__":
     # Simple test of the sniper
-    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    setup_logging(console_format=CONSOLE_FORMAT)
     
     sniper = Sniper()
     
@@ -21,10 +21,22 @@ const store = new Store();
 let monitoringProcess = null;
 let claimingProcess = null;
 let authProcess = null;
+let batchCheckProcess = null;
 
 // Keep track of active scheduled monitor ID
 let activeScheduledMonitorId = null;
 
+/**
+ * Get the environment for Python scripts, pointing them at the shared state database
+ * @returns {Object} - Environment variables
+ */
+function pythonEnv() {
+  return {
+    ...process.env,
+    SNIPER_STATE_DB: path.join(app.getPath('userData'), 'sniper_state.db')
+  };
+}
+
 // Set up logging for auto-updater
 autoUpdater.logger = require('electron-log');
 autoUpdater.logger.transports.file.level = 'info';
@@ -190,6 +202,7 @@ app.on('before-quit', () => {
   stopMonitoring();
   stopClaiming();
   stopAuthentication();
+  stopBatchCheck();
   cancelAllScheduledMonitors();
 });
 
@@ -226,6 +239,18 @@ function stopClaiming() {
   }
 }
 
+// Stop any active batch check process
+function stopBatchCheck() {
+  if (batchCheckProcess) {
+    try {
+      batchCheckProcess.kill();
+      batchCheckProcess = null;
+    } catch (error) {
+      console.error('Error stopping batch check process:', error);
+    }
+  }
+}
+
 // Stop any active authentication process
 function stopAuthentication() {
   if (authProcess) {
@@ -246,6 +271,7 @@ ipcMain.handle('check-username', async (event, username) => {
       pythonPath: 'python', // Adjust if using specific Python path
       pythonOptions: ['-u'], // unbuffered
       scriptPath: path.join(__dirname, '../../src/python'),
+      env: pythonEnv(),
       args: [username]
     };
 
@@ -268,6 +294,56 @@ ipcMain.handle('check-username', async (event, username) => {
   });
 });
 
+// Check many usernames, streaming each result to the renderer as it is ready
+ipcMain.handle('check-usernames-stream', async (event, usernames) => {
+  // Only one batch runs at a time
+  stopBatchCheck();
+
+  const options = {
+    mode: 'text',
+    pythonPath: 'python', // Adjust if using specific Python path
+    pythonOptions: ['-u'], // unbuffered
+    scriptPath: path.join(__dirname, '../../src/python'),
+    env: pythonEnv()
+  };
+
+  const shell = new PythonShell('check_usernames_stream.py', options);
+  batchCheckProcess = shell;
+
+  shell.on('message', (message) => {
+    try {
+      mainWindow.webContents.send('batch-check-update', JSON.parse(message));
+    } catch (error) {
+      console.error('Failed to parse batch check output:', error);
+    }
+  });
+
+  shell.on('close', () => {
+    if (batchCheckProcess === shell) {
+      batchCheckProcess = null;
+      mainWindow.webContents.send('batch-check-update', { type: 'closed' });
+    }
+  });
+
+  shell.on('error', (err) => {
+    mainWindow.webContents.send('batch-check-update', {
+      type: 'error',
+      error: err.message || 'Unknown error'
+    });
+  });
+
+  // Feed usernames through stdin so large batches don't hit argument limits
+  usernames.forEach(username => shell.send(username));
+  shell.end(() => {});
+
+  return { success: true, count: usernames.length };
+});
+
+ipcMain.handle('stop-batch-check', async () => {
+  stopBatchCheck();
+  return { success: true };
+});
+
 // Create a helper function to send notifications to all channels
 async function notifyUser(message, severity = 'info') {
   // Map severity to notification type
@@ -347,6 +423,7 @@ async function monitorUsername(username, interval, autoClaim = false, strategy =
         pythonPath: 'python', // Adjust if using specific Python path
         pythonOptions: ['-u'], // unbuffered
         scriptPath: path.join(__dirname, '../../src/python'),
+        env: pythonEnv(),
         args: [username, interval.toString()]
       };
       
@@ -370,6 +447,7 @@ async function monitorUsername(username, interval, autoClaim = false, strategy =
               break;
               
             case 'check':
+            case 'heartbeat':
               mainWindow.webContents.send('monitoring-update', { 
                 status: 'checking',
                 details: data
@@ -584,6 +662,7 @@ ipcMain.handle('get-drop-time', async (event, username) => {
       pythonPath: 'python',
       pythonOptions: ['-u'],
       scriptPath: path.join(__dirname, '../../src/python'),
+      env: pythonEnv(),
       args: [username]
     };
 
@@ -617,6 +696,7 @@ async function claimUsername(username, strategy, authToken = null) {
       pythonPath: 'python',
       pythonOptions: ['-u'],
       scriptPath: path.join(__dirname, '../../src/python'),
+      env: pythonEnv(),
       args: [username, strategy]
     };
     
@@ -698,6 +778,7 @@ async function authenticateWithMicrosoft(useStoredToken = false, email = null, p
       pythonPath: 'python',
       pythonOptions: ['-u'],
       scriptPath: path.join(__dirname, '../../src/python'),
+      env: pythonEnv(),
       args: [useStoredToken.toString()]
     };
     
@@ -8,6 +8,12 @@ contextBridge.exposeInMainWorld(
     checkUsername: (username) => {
       return ipcRenderer.invoke('check-username', username);
     },
+    checkUsernamesStream: (usernames) => {
+      return ipcRenderer.invoke('check-usernames-stream', usernames);
+    },
+    stopBatchCheck: () => {
+      return ipcRenderer.invoke('stop-batch-check');
+    },
     monitorUsername: (username, interval, autoClaim = false, strategy = 'timing') => {
       return ipcRenderer.invoke('monitor-username', username, interval, autoClaim, strategy);
     },
@@ -70,7 +76,8 @@ contextBridge.exposeInMainWorld(
         'notification',
         'themeChanged',
         'update-status',
-        'scheduler-update'
+        'scheduler-update',
+        'batch-check-update'
       ];
       if (validChannels.includes(channel)) {
         // Deliberately strip event as it includes `sender` 
@@ -89,7 +96,8 @@ contextBridge.exposeInMainWorld(
         'notification',
         'themeChanged',
         'update-status',
-        'scheduler-update'
+        'scheduler-update',
+        'batch-check-update'
       ];
       if (validChannels.includes(channel)) {
         ipcRenderer.removeAllListeners(channel);
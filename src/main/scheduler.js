@@ -1,29 +1,228 @@
+const fs = require('fs');
+const path = require('path');
+const { app } = require('electron');
 const Store = require('electron-store');
 const { notifyUser } = require('./notifications');
 
-// Initialize storage for scheduled monitors
+// Legacy storage for scheduled monitors (migrated into the journal)
 const store = new Store();
 
-// Keep track of active scheduler timers
-const schedulerTimers = new Map();
+// The journal (userData/scheduled-monitors.jsonl) is the only store of scheduled
+// monitors. Each line is {"op": "put", "monitor": {...}} or {"op": "delete", "id": ...};
+// the Python side (state_store.read_scheduler_journal) reads it but never writes it.
+
+// setTimeout overflows for delays above 2^31 - 1 ms (~24.8 days)
+const MAX_TIMER_DELAY_MS = 2147483647;
+
+// Rewrite the journal once it holds this many stale records
+const COMPACTION_MIN_RECORDS = 100;
+
+// Scheduled monitors by ID
+const monitors = new Map();
+
+// Due times sorted ascending; entries whose due time no longer matches
+// dueTimes are stale and skipped when they reach the head
+const dueQueue = [];
+const dueTimes = new Map();
+
+// The single wake-up timer
+let wakeTimer = null;
+let schedulerWindow = null;
+
+// Journal state
+let journalPath = null;
+let journalRecords = 0;
+
+/**
+ * Get the path of the scheduled monitors journal
+ * @returns {string} - Journal file path
+ */
+function getJournalPath() {
+  if (!journalPath) {
+    journalPath = path.join(app.getPath('userData'), 'scheduled-monitors.jsonl');
+  }
+  return journalPath;
+}
+
+/**
+ * Append records to the journal
+ * @param {Array} records - Records to append
+ */
+function appendJournal(records) {
+  if (records.length === 0) {
+    return;
+  }
+
+  const lines = records.map(record => JSON.stringify(record)).join('\n') + '\n';
+  fs.appendFileSync(getJournalPath(), lines);
+  journalRecords += records.length;
+
+  // Compact when most of the journal is superseded records
+  if (journalRecords > COMPACTION_MIN_RECORDS && journalRecords > monitors.size * 2) {
+    compactJournal();
+  }
+}
+
+/**
+ * Rewrite the journal with one record per monitor
+ */
+function compactJournal() {
+  const file = getJournalPath();
+  const tempFile = `${file}.tmp`;
+  const lines = Array.from(monitors.values())
+    .map(monitor => JSON.stringify({ op: 'put', monitor }))
+    .join('\n');
+
+  fs.writeFileSync(tempFile, lines ? lines + '\n' : '');
+  fs.renameSync(tempFile, file);
+  journalRecords = monitors.size;
+}
+
+/**
+ * Load monitors from the journal, migrating the legacy electron-store key once
+ */
+function loadJournal() {
+  const file = getJournalPath();
+  monitors.clear();
+  journalRecords = 0;
+
+  if (fs.existsSync(file)) {
+    const lines = fs.readFileSync(file, 'utf8').split('\n');
+
+    for (const line of lines) {
+      if (!line.trim()) {
+        continue;
+      }
+
+      try {
+        const record = JSON.parse(line);
+        if (record.op === 'put') {
+          monitors.set(record.monitor.id, record.monitor);
+        } else if (record.op === 'delete') {
+          monitors.delete(record.id);
+        }
+        journalRecords++;
+      } catch (error) {
+        // A torn final write is expected after a crash; skip it
+        console.error('Skipping unreadable scheduler journal record:', error.message);
+      }
+    }
+  }
+
+  const legacyMonitors = store.get('scheduledMonitors');
+  if (Array.isArray(legacyMonitors)) {
+    legacyMonitors.forEach(monitor => monitors.set(monitor.id, monitor));
+    appendJournal(legacyMonitors.map(monitor => ({ op: 'put', monitor })));
+    store.delete('scheduledMonitors');
+    console.log(`Migrated ${legacyMonitors.length} scheduled monitors to ${file}`);
+  }
+}
+
+/**
+ * Insert a due time into the sorted queue
+ * @param {string} id - Monitor ID
+ * @param {number} dueAt - Due time in milliseconds since the epoch
+ */
+function enqueue(id, dueAt) {
+  let low = 0;
+  let high = dueQueue.length;
+
+  while (low < high) {
+    const mid = (low + high) >>> 1;
+    if (dueQueue[mid].dueAt <= dueAt) {
+      low = mid + 1;
+    } else {
+      high = mid;
+    }
+  }
+
+  dueQueue.splice(low, 0, { id, dueAt });
+  dueTimes.set(id, dueAt);
+}
+
+/**
+ * Remove a monitor from the queue (its queue entry becomes stale)
+ * @param {string} id - Monitor ID
+ */
+function dequeue(id) {
+  dueTimes.delete(id);
+
+  // Drop stale entries once they outnumber the live ones
+  if (dueQueue.length > dueTimes.size * 2 + 32) {
+    const live = dueQueue.filter(entry => dueTimes.get(entry.id) === entry.dueAt);
+    dueQueue.splice(0, dueQueue.length, ...live);
+  }
+}
+
+/**
+ * Drop stale entries from the head of the queue
+ */
+function pruneQueueHead() {
+  while (dueQueue.length > 0 && dueTimes.get(dueQueue[0].id) !== dueQueue[0].dueAt) {
+    dueQueue.shift();
+  }
+}
+
+/**
+ * Arm the wake-up timer for the earliest due monitor
+ */
+function armWakeTimer() {
+  if (wakeTimer) {
+    clearTimeout(wakeTimer);
+    wakeTimer = null;
+  }
+
+  pruneQueueHead();
+  if (dueQueue.length === 0) {
+    return;
+  }
+
+  // Long horizons are covered by waking early and re-arming
+  const delay = Math.min(Math.max(dueQueue[0].dueAt - Date.now(), 0), MAX_TIMER_DELAY_MS);
+  wakeTimer = setTimeout(onWake, delay);
+}
+
+/**
+ * Start every monitor that is due and re-arm for the next one
+ */
+function onWake() {
+  wakeTimer = null;
+  const now = Date.now();
+
+  pruneQueueHead();
+  while (dueQueue.length > 0 && dueQueue[0].dueAt <= now) {
+    const { id } = dueQueue.shift();
+    dueTimes.delete(id);
+
+    const monitor = monitors.get(id);
+    if (monitor && monitor.status === 'scheduled') {
+      startMonitoring(monitor, schedulerWindow);
+    }
+    pruneQueueHead();
+  }
+
+  armWakeTimer();
+}
 
 /**
  * Initialize the scheduler service
  * @param {BrowserWindow} mainWindow - The main application window
  */
 function initializeScheduler(mainWindow) {
+  schedulerWindow = mainWindow;
+
   // Load existing scheduled monitors
-  const scheduledMonitors = getScheduledMonitors();
-  
+  loadJournal();
+
   // Schedule all active monitors
-  scheduledMonitors.forEach(monitor => {
+  for (const monitor of monitors.values()) {
     if (monitor.status === 'scheduled') {
       scheduleMonitor(monitor, mainWindow);
     }
-  });
-  
+  }
+
   // Log initialization
-  console.log(`Scheduler initialized with ${scheduledMonitors.length} monitors`);
+  console.log(`Scheduler initialized with ${monitors.size} monitors`);
 }
 
 /**
@@ -31,7 +230,7 @@ function initializeScheduler(mainWindow) {
  * @returns {Array} - Array of scheduled monitors
  */
 function getScheduledMonitors() {
-  return store.get('scheduledMonitors', []);
+  return Array.from(monitors.values());
 }
 
 /**
@@ -40,22 +239,9 @@ function getScheduledMonitors() {
  * @returns {Object} - The saved monitor
  */
 function saveScheduledMonitor(monitor) {
-  const monitors = getScheduledMonitors();
-  
-  // Find if monitor already exists
-  const index = monitors.findIndex(m => m.id === monitor.id);
-  
-  if (index >= 0) {
-    // Update existing monitor
-    monitors[index] = monitor;
-  } else {
-    // Add new monitor
-    monitors.push(monitor);
-  }
-  
-  // Save to store
-  store.set('scheduledMonitors', monitors);
-  
+  monitors.set(monitor.id, monitor);
+  appendJournal([{ op: 'put', monitor }]);
+
   return monitor;
 }
 
@@ -65,28 +251,17 @@ function saveScheduledMonitor(monitor) {
  * @returns {boolean} - Whether the monitor was deleted
  */
 function deleteScheduledMonitor(id) {
-  const monitors = getScheduledMonitors();
-  
-  // Find monitor
-  const index = monitors.findIndex(m => m.id === id);
-  
-  if (index >= 0) {
-    // Cancel any active timers for this monitor
-    if (schedulerTimers.has(id)) {
-      clearTimeout(schedulerTimers.get(id));
-      schedulerTimers.delete(id);
-    }
-    
-    // Remove from array
-    monitors.splice(index, 1);
-    
-    // Save to store
-    store.set('scheduledMonitors', monitors);
-    
-    return true;
+  if (!monitors.has(id)) {
+    return false;
   }
-  
-  return false;
+
+  // Cancel any pending start for this monitor
+  dequeue(id);
+  monitors.delete(id);
+  appendJournal([{ op: 'delete', id }]);
+  armWakeTimer();
+
+  return true;
 }
 
 /**
@@ -96,51 +271,46 @@ function deleteScheduledMonitor(id) {
  * @returns {Object} - The scheduled monitor
  */
 function scheduleMonitor(monitor, mainWindow) {
-  // If monitor is already scheduled, cancel it first
-  if (schedulerTimers.has(monitor.id)) {
-    clearTimeout(schedulerTimers.get(monitor.id));
-    schedulerTimers.delete(monitor.id);
+  if (mainWindow) {
+    schedulerWindow = mainWindow;
   }
-  
+
+  // If monitor is already scheduled, cancel it first
+  dequeue(monitor.id);
+
   // Calculate time until monitoring starts
   const monitorStartTime = new Date(monitor.monitorStartTime);
-  const now = new Date();
-  const timeUntilStart = monitorStartTime - now;
-  
+  const timeUntilStart = monitorStartTime.getTime() - Date.now();
+
   // If the start time is in the past, update monitor status to missed
-  if (timeUntilStart <= 0) {
+  if (!(timeUntilStart > 0)) {
     monitor.status = 'missed';
     saveScheduledMonitor(monitor);
-    
+    armWakeTimer();
+
     // Notify user
     notifyUser(`Scheduled monitoring for "${monitor.username}" was missed.`, 'warning');
-    
+
     // Send update to renderer
     if (mainWindow && !mainWindow.isDestroyed()) {
       mainWindow.webContents.send('scheduler-update', monitor);
     }
-    
+
     return monitor;
   }
-  
-  // Set up timer for when monitoring should start
-  const timerId = setTimeout(() => {
-    // Start monitoring
-    startMonitoring(monitor, mainWindow);
-  }, timeUntilStart);
-  
-  // Store timer ID for cancellation if needed
-  schedulerTimers.set(monitor.id, timerId);
-  
+
+  enqueue(monitor.id, monitorStartTime.getTime());
+  armWakeTimer();
+
   // Send notification for long intervals
   if (timeUntilStart > 5 * 60 * 1000) { // More than 5 minutes
     const minutesUntilStart = Math.round(timeUntilStart / (60 * 1000));
     notifyUser(`Username "${monitor.username}" will be monitored in ${minutesUntilStart} minutes.`, 'info');
   }
-  
+
   // Log scheduling
   console.log(`Monitoring for "${monitor.username}" scheduled to start at ${monitorStartTime}`);
-  
+
   return monitor;
 }
 
@@ -154,15 +324,15 @@ async function startMonitoring(monitor, mainWindow) {
     // Update monitor status
     monitor.status = 'active';
     saveScheduledMonitor(monitor);
-    
+
     // Send update to renderer
     if (mainWindow && !mainWindow.isDestroyed()) {
       mainWindow.webContents.send('scheduler-update', monitor);
     }
-    
+
     // Notify user
     notifyUser(`Scheduled monitoring for "${monitor.username}" has started.`, 'info');
-    
+
     // Request the main process to start monitoring
     const result = {
       type: 'scheduled-monitor-start',
@@ -171,27 +341,27 @@ async function startMonitoring(monitor, mainWindow) {
       strategy: monitor.strategy,
       monitorId: monitor.id
     };
-    
+
     // Send to main window as a custom event
     if (mainWindow && !mainWindow.isDestroyed()) {
       mainWindow.webContents.send('scheduler-monitor-start', result);
     }
-    
+
     // Log start
     console.log(`Monitoring for "${monitor.username}" started at ${new Date()}`);
   } catch (error) {
     console.error(`Failed to start monitoring for "${monitor.username}":`, error);
-    
+
     // Update monitor status
     monitor.status = 'failed';
     monitor.error = error.message || 'Unknown error';
     saveScheduledMonitor(monitor);
-    
+
     // Send update to renderer
     if (mainWindow && !mainWindow.isDestroyed()) {
       mainWindow.webContents.send('scheduler-update', monitor);
     }
-    
+
     // Notify user
     notifyUser(`Failed to start monitoring for "${monitor.username}": ${error.message || 'Unknown error'}`, 'error');
   }
@@ -205,14 +375,13 @@ async function startMonitoring(monitor, mainWindow) {
  */
 function handleMonitoringResult(monitorId, result, mainWindow) {
   // Find the monitor
-  const monitors = getScheduledMonitors();
-  const monitor = monitors.find(m => m.id === monitorId);
-  
+  const monitor = monitors.get(monitorId);
+
   if (!monitor) {
     console.error(`Monitor with ID ${monitorId} not found`);
     return;
   }
-  
+
   // Update monitor status based on result
   if (result.success) {
     monitor.status = 'completed';
@@ -221,15 +390,15 @@ function handleMonitoringResult(monitorId, result, mainWindow) {
     monitor.status = 'failed';
     monitor.error = result.error || 'Unknown error';
   }
-  
+
   // Save updated monitor
   saveScheduledMonitor(monitor);
-  
+
   // Send update to renderer
   if (mainWindow && !mainWindow.isDestroyed()) {
     mainWindow.webContents.send('scheduler-update', monitor);
   }
-  
+
   // Notify user
   if (result.success) {
     notifyUser(`Scheduled monitoring for "${monitor.username}" completed successfully.`, 'success');
@@ -242,14 +411,15 @@ function handleMonitoringResult(monitorId, result, mainWindow) {
  * Cancel all scheduled monitors
  */
 function cancelAllScheduledMonitors() {
-  // Clear all timers
-  for (const timerId of schedulerTimers.values()) {
-    clearTimeout(timerId);
+  // Clear the wake-up timer and the queue
+  if (wakeTimer) {
+    clearTimeout(wakeTimer);
+    wakeTimer = null;
   }
-  
-  // Clear the map
-  schedulerTimers.clear();
-  
+
+  dueQueue.length = 0;
+  dueTimes.clear();
+
   console.log('All scheduled monitors cancelled');
 }
 
@@ -261,4 +431,4 @@ module.exports = {
   scheduleMonitor,
   handleMonitoringResult,
   cancelAllScheduledMonitors
-}; 
\ No newline at end of file
+};
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Batch Check Usernames Adapter
+
+This script serves as a bridge between the Electron app and the existing Python codebase.
+It reads usernames from stdin (one per line) and prints one JSON line per result as soon
+as each username has been checked, followed by a final "done" message.
+"""
+
+import os
+import sys
+import json
+import signal
+import datetime
+import traceback
+
+# Add the parent directory to the path so we can import the original modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+try:
+    from name_utils import NameChecker
+    from sniper import Sniper
+except ImportError as e:
+    print(json.dumps({
+        "type": "error",
+        "error": f"Failed to import required modules: {str(e)}"
+    }))
+    sys.exit(1)
+
+def emit(message):
+    """Print a JSON line and flush it to the Electron app immediately"""
+    print(json.dumps(message))
+    sys.stdout.flush()
+
+def read_usernames(stream, name_checker):
+    """Yield usernames from stdin, reporting invalid ones without checking them"""
+    for line in stream:
+        username = line.strip()
+        if not username:
+            continue
+
+        if name_checker.is_valid_minecraft_username(username):
+            yield username
+        else:
+            emit({
+                "type": "result",
+                "success": False,
+                "username": username,
+                "error": "Invalid username format"
+            })
+
+def check_usernames(stream):
+    """Check every username read from stream, reporting each result as it finishes"""
+    name_checker = NameChecker()
+    sniper = Sniper()
+    checked = 0
+
+    for username, is_available in sniper.iter_check_usernames(read_usernames(stream, name_checker)):
+        result = {
+            "type": "result",
+            "success": True,
+            "username": username,
+            "available": is_available
+        }
+
+        # If not available, try to get the drop time
+        if not is_available:
+            drop_time = sniper.get_drop_time(username)
+
+            if drop_time:
+                time_until = drop_time - datetime.datetime.now()
+                days = time_until.days
+                hours, remainder = divmod(time_until.seconds, 3600)
+                minutes, seconds = divmod(remainder, 60)
+
+                result["drop_time"] = drop_time.strftime('%Y-%m-%d %H:%M:%S')
+                result["time_until"] = {
+                    "days": days,
+                    "hours": hours,
+                    "minutes": minutes,
+                    "seconds": seconds
+                }
+                result["soon_available"] = days < 0 or (days == 0 and hours == 0 and minutes < 5)
+
+        emit(result)
+        checked += 1
+
+    emit({"type": "done", "checked": checked})
+
+if __name__ == "__main__":
+    # Stop cleanly when the app cancels the batch
+    signal.signal(signal.SIGTERM, lambda sig, frame: sys.exit(0))
+
+    try:
+        check_usernames(sys.stdin)
+    except Exception as e:
+        emit({
+            "type": "error",
+            "error": str(e),
+            "traceback": traceback.format_exc()
+        })
@@ -1,17 +1,36 @@
 #!/usr/bin/env python3
-import json
+"""
+Get Drop Time Adapter
+
+This script serves as a bridge between the Electron app and the existing Python codebase.
+It resolves when a username will become available through the same cached resolver the
+CLI uses and returns the result in JSON format.
+"""
+
+import os
 import sys
-import requests
-import time
-from datetime import datetime, timedelta
+import json
+
+# Add the parent directory to the path so we can import the original modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+try:
+    from name_utils import NameChecker
+    from drop_time import STATUS_AVAILABLE, STATUS_DROPPING
+except ImportError as e:
+    print(json.dumps({
+        "success": False,
+        "message": f"Failed to import required modules: {str(e)}"
+    }))
+    sys.exit(1)
 
 def get_drop_time(username):
     """
     Check when a username will become available.
-    
+
     Args:
         username (str): The Minecraft username to check
-        
+
     Returns:
         dict: Result containing success status and drop time if available
     """
@@ -22,82 +41,26 @@ def get_drop_time(username):
                 "success": False,
                 "message": "Invalid username provided"
             }
-            
+
         # Strip any spaces and convert to lowercase
         username = username.strip().lower()
-        
+
         # Check if username meets Minecraft requirements
         if not (3 <= len(username) <= 16):
             return {
-                "success": False, 
+                "success": False,
                 "message": "Username must be between 3 and 16 characters"
             }
-            
+
         if not all(c.isalnum() or c == '_' for c in username):
             return {
                 "success": False,
                 "message": "Username can only contain letters, numbers, and underscores"
             }
-        
-        # Make request to Mojang API to check name availability
-        api_url = f"https://api.mojang.com/users/profiles/minecraft/{username}"
-        
-        response = requests.get(api_url)
-        
-        if response.status_code == 200:
-            # Username is taken, check if it will be available soon
-            profile_data = response.json()
-            
-            # Now check when the name will become available
-            names_api_url = f"https://api.mojang.com/user/profiles/{profile_data['id']}/names"
-            names_response = requests.get(names_api_url)
-            
-            if names_response.status_code == 200:
-                names_data = names_response.json()
-                
-                # Find the current name record
-                current_name = None
-                for name_record in names_data:
-                    if 'name' in name_record and name_record['name'].lower() == username:
-                        current_name = name_record
-                        break
-                
-                if current_name and 'changedToAt' in current_name:
-                    # Calculate when the name will become available
-                    # Names become available 37 days after being changed
-                    changed_at = datetime.fromtimestamp(current_name['changedToAt'] / 1000)
-                    available_at = changed_at + timedelta(days=37)
-                    
-                    # If the available time is in the past, it's already available for name change
-                    now = datetime.now()
-                    if available_at < now:
-                        return {
-                            "success": True,
-                            "dropTime": None,
-                            "message": "Username is currently taken but available for name change",
-                            "username": username
-                        }
-                    
-                    return {
-                        "success": True,
-                        "dropTime": available_at.isoformat(),
-                        "message": f"Username will be available on {available_at.strftime('%Y-%m-%d %H:%M:%S')}",
-                        "username": username
-                    }
-                
-                return {
-                    "success": True,
-                    "dropTime": None,
-                    "message": "Username is taken and no drop time could be determined",
-                    "username": username
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": f"Failed to retrieve name history: {names_response.status_code}"
-                }
-        elif response.status_code == 404:
-            # Username is not taken, it's already available
+
+        info = NameChecker().get_drop_time_info(username)
+
+        if info["status"] == STATUS_AVAILABLE:
             return {
                 "success": True,
                 "dropTime": None,
@@ -105,12 +68,27 @@ def get_drop_time(username):
                 "message": "Username is already available",
                 "username": username
             }
+        elif info["status"] == STATUS_DROPPING:
+            available_at = info["drop_time"]
+            return {
+                "success": True,
+                "dropTime": available_at.isoformat(),
+                "message": f"Username will be available on {available_at.strftime('%Y-%m-%d %H:%M:%S')}",
+                "username": username
+            }
+        elif info["status"] is not None:
+            return {
+                "success": True,
+                "dropTime": None,
+                "message": "Username is taken and no drop time could be determined",
+                "username": username
+            }
         else:
             return {
                 "success": False,
-                "message": f"Error checking username availability: {response.status_code}"
+                "message": "Could not reach NameMC or the Mojang API to check the drop time"
             }
-            
+
     except Exception as e:
         return {
             "success": False,
@@ -126,6 +104,6 @@ if __name__ == "__main__":
     else:
         username = sys.argv[1]
         result = get_drop_time(username)
-    
+
     # Print the result as JSON
-    print(json.dumps(result)) 
\ No newline at end of file
+    print(json.dumps(result))
@@ -11,6 +11,7 @@ import sys
 import json
 import time
 import signal
+import threading
 import traceback
 import datetime
 
@@ -28,22 +29,30 @@ except ImportError as e:
     print(json.dumps(result))
     sys.exit(1)
 
-# Flag to handle graceful shutdown
-monitoring_active = True
+# Default seconds between heartbeat messages while nothing changes
+DEFAULT_HEARTBEAT_INTERVAL = 60.0
+
+# Set to stop monitoring; waiting on it wakes up immediately on shutdown
+stop_event = threading.Event()
 
 def signal_handler(sig, frame):
     """Handle interrupt signals to exit gracefully"""
-    global monitoring_active
-    monitoring_active = False
-    print(json.dumps({"type": "status", "status": "stopping"}))
-    sys.exit(0)
+    if not stop_event.is_set():
+        stop_event.set()
+        print(json.dumps({"type": "status", "status": "stopping"}))
+        sys.stdout.flush()
 
 # Set up signal handler for graceful exit
 signal.signal(signal.SIGINT, signal_handler)
 signal.signal(signal.SIGTERM, signal_handler)
 
-def monitor_username(username, interval=3.0):
-    """Monitor a username continuously and report status updates"""
+def monitor_username(username, interval=3.0, heartbeat_interval=DEFAULT_HEARTBEAT_INTERVAL):
+    """
+    Monitor a username continuously and report status updates
+
+    Only state changes are reported, plus a heartbeat every heartbeat_interval
+    seconds so the app can show the monitor is still alive.
+    """
     try:
         # Initialize the required objects
         name_checker = NameChecker()
@@ -91,9 +100,11 @@ def monitor_username(username, interval=3.0):
             pass
         
         check_count = 0
+        last_state = None
+        last_emit_time = time.time()
         
         # Main monitoring loop
-        while monitoring_active:
+        while not stop_event.is_set():
             check_count += 1
             check_start_time = time.time()
             
@@ -110,31 +121,32 @@ def monitor_username(username, interval=3.0):
                 }))
                 # Exit after finding username is available
                 break
-            else:
-                # Status update for regular check
+            
+            now = time.time()
+            if last_state is not False:
+                # State changed: report the first unavailable check
                 print(json.dumps({
                     "type": "check",
                     "available": False,
                     "check_count": check_count,
                     "timestamp": datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
                 }))
-                sys.stdout.flush()  # Ensure output is sent immediately
+                sys.stdout.flush()
+                last_emit_time = now
+            elif now - last_emit_time >= heartbeat_interval:
+                print(json.dumps({
+                    "type": "heartbeat",
+                    "available": False,
+                    "check_count": check_count,
+                    "timestamp": datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                }))
+                sys.stdout.flush()
+                last_emit_time = now
+            last_state = False
             
-            # Calculate sleep time to maintain consistent interval
+            # Wait out the rest of the interval; returns early when stopped
             check_duration = time.time() - check_start_time
-            sleep_time = max(0.1, interval - check_duration)
-            
-            # Sleep in smaller chunks to allow for quicker interruption
-            sleep_chunk = 0.1
-            for _ in range(int(sleep_time / sleep_chunk)):
-                if not monitoring_active:
-                    break
-                time.sleep(sleep_chunk)
-            
-            # Sleep any remaining time
-            remaining_sleep = sleep_time % sleep_chunk
-            if remaining_sleep > 0 and monitoring_active:
-                time.sleep(remaining_sleep)
+            stop_event.wait(max(0.1, interval - check_duration))
         
         # Final status update on exit
         print(json.dumps({
@@ -177,5 +189,15 @@ if __name__ == "__main__":
                 "warning": f"Invalid interval '{sys.argv[2]}', using default of 3.0 seconds"
             }))
     
+    heartbeat_interval = DEFAULT_HEARTBEAT_INTERVAL
+    if len(sys.argv) >= 4:
+        try:
+            heartbeat_interval = max(interval, float(sys.argv[3]))
+        except ValueError:
+            print(json.dumps({
+                "type": "warning",
+                "warning": f"Invalid heartbeat interval '{sys.argv[3]}', using default of {DEFAULT_HEARTBEAT_INTERVAL} seconds"
+            }))
+    
     # Start monitoring
-    monitor_username(username, interval) 
\ No newline at end of file
+    monitor_username(username, interval, heartbeat_interval) 
\ No newline at end of file
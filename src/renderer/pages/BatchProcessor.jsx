@@ -132,6 +132,24 @@ function BatchProcessor({ settings, setNotification }) {
     setResults({});
   };
 
+  // Stop listening for batch results when the page unmounts
+  useEffect(() => {
+    return () => {
+      window.api.removeAllListeners('batch-check-update');
+    };
+  }, []);
+
+  // Finish a batch run and report how many usernames were processed
+  const finishProcessing = (message, severity) => {
+    window.api.removeAllListeners('batch-check-update');
+    setProcessing(false);
+    setNotification({
+      open: true,
+      message,
+      severity
+    });
+  };
+
   // Process the usernames
   const handleProcessUsernames = async () => {
     if (usernames.length === 0) {
@@ -143,49 +161,40 @@ function BatchProcessor({ settings, setNotification }) {
     setCurrentIndex(0);
     setResults({});
 
-    for (let i = 0; i < usernames.length; i++) {
-      setCurrentIndex(i);
-      
-      const username = usernames[i];
-      
-      try {
-        // Skip empty usernames
-        if (!username.trim()) continue;
-        
-        // Check username
-        const response = await window.api.checkUsername(username);
-        
+    // Results stream in one at a time as each username is checked
+    window.api.removeAllListeners('batch-check-update');
+    window.api.on('batch-check-update', (update) => {
+      if (update.type === 'result') {
+        const { type, ...result } = update;
         setResults(prev => ({
           ...prev,
-          [username]: response
-        }));
-        
-      } catch (err) {
-        console.error(`Error checking ${username}:`, err);
-        setResults(prev => ({
-          ...prev,
-          [username]: {
-            success: false,
-            error: err.message || 'Unknown error',
-            username
-          }
+          [result.username]: result
         }));
+        setCurrentIndex(prev => prev + 1);
+      } else if (update.type === 'done') {
+        finishProcessing(`Processed ${update.checked} usernames`, 'success');
+      } else if (update.type === 'error') {
+        setError(update.error || 'Unknown error');
+        finishProcessing('Batch check failed', 'error');
+      } else if (update.type === 'closed') {
+        setProcessing(false);
       }
-      
-      // Small delay to avoid rate limiting
-      await new Promise(resolve => setTimeout(resolve, 500));
-    }
-    
-    setProcessing(false);
-    setNotification({
-      open: true,
-      message: `Processed ${usernames.length} usernames`,
-      severity: 'success'
     });
+
+    try {
+      const names = usernames.map(name => name.trim()).filter(name => name);
+      await window.api.checkUsernamesStream(names);
+    } catch (err) {
+      console.error('Error starting batch check:', err);
+      setError(err.message || 'Unknown error');
+      finishProcessing('Batch check failed', 'error');
+    }
   };
 
   // Cancel processing
   const handleCancelProcess = () => {
+    window.api.stopBatchCheck();
+    window.api.removeAllListeners('batch-check-update');
     setProcessing(false);
   };
 
@@ -143,7 +143,7 @@ function MonitorUsername({ settings, setNotification }) {
     if (data.status === 'checking') {
       setStatus('monitoring');
       setCheckCount(data.details.check_count);
-      if (data.details.check_count % 10 === 0) { // Log every 10 checks to avoid spamming
+      if (data.details.type === 'heartbeat') { // Only state changes and periodic heartbeats arrive here
         addLogMessage(`Check #${data.details.check_count}: Username still unavailable`);
       }
       return;
@@ -0,0 +1,667 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper State Store
+
+This module keeps the sniper's local state (statistics, snipe history, watchlists,
+caches and configuration documents) in a single SQLite database.
+The database lives in the Electron app's user data directory (or at
+$SNIPER_STATE_DB) and runs in WAL mode so the CLI tools and the Electron app's
+Python scripts can read and write it at the same time.
+
+The Electron app's scheduled monitors are not stored here. The scheduler
+(src/main/scheduler.js) owns them and appends them to scheduled-monitors.jsonl
+in its user data directory, one {"op": "put", "monitor": {...}} or
+{"op": "delete", "id": ...} record per line. Python reads that journal with
+read_scheduler_journal() and never writes to it.
+"""
+
+import os
+import sys
+import json
+import time
+import sqlite3
+import logging
+import argparse
+import datetime
+import threading
+from contextlib import contextmanager
+from colorama import Fore
+
+# Constants
+STATE_DB_NAME = "sniper_state.db"
+SCHEMA_VERSION = 1
+BUSY_TIMEOUT_MS = 5000
+ELECTRON_APP_NAME = "OpenMC Username Sniper"
+SCHEDULER_JOURNAL_FILE = "scheduled-monitors.jsonl"
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS counters (
+        name TEXT PRIMARY KEY,
+        value REAL NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS check_history (
+        id INTEGER PRIMARY KEY,
+        username TEXT NOT NULL,
+        available INTEGER NOT NULL,
+        checked_at REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_check_history_username ON check_history (username, checked_at)",
+    """CREATE TABLE IF NOT EXISTS snipe_results (
+        id INTEGER PRIMARY KEY,
+        username TEXT NOT NULL,
+        strategy TEXT NOT NULL,
+        success INTEGER NOT NULL,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        time_taken REAL NOT NULL DEFAULT 0,
+        error TEXT,
+        created_at REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_snipe_results_created ON snipe_results (created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_snipe_results_success ON snipe_results (success, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_snipe_results_strategy ON snipe_results (strategy, created_at)",
+    """CREATE TABLE IF NOT EXISTS strategy_stats (
+        strategy TEXT PRIMARY KEY,
+        attempts INTEGER NOT NULL DEFAULT 0,
+        successes INTEGER NOT NULL DEFAULT 0,
+        failures INTEGER NOT NULL DEFAULT 0,
+        avg_attempts REAL NOT NULL DEFAULT 0,
+        avg_time REAL NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS watchlist (
+        id TEXT PRIMARY KEY,
+        username TEXT NOT NULL,
+        status TEXT NOT NULL,
+        target_time REAL,
+        data TEXT,
+        updated_at REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_watchlist_status ON watchlist (status, target_time)",
+    "CREATE INDEX IF NOT EXISTS idx_watchlist_username ON watchlist (username)",
+    """CREATE TABLE IF NOT EXISTS cache_entries (
+        namespace TEXT NOT NULL,
+        key TEXT NOT NULL,
+        value TEXT,
+        expires_at REAL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (namespace, key)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_cache_entries_expires ON cache_entries (expires_at)",
+    """CREATE TABLE IF NOT EXISTS documents (
+        name TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        updated_at REAL NOT NULL
+    )""",
+]
+
+# Counters that used to live at the top level of sniper_stats.json
+STATS_COUNTERS = [
+    "total_attempts",
+    "successful_claims",
+    "failed_claims",
+    "usernames_checked",
+    "total_requests",
+    "rate_limited_count",
+    "response_time_total",
+    "response_time_samples",
+]
+
+
+def _to_timestamp(value):
+    """Convert an ISO string, datetime or number into a Unix timestamp"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    try:
+        return datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+def _to_isoformat(timestamp):
+    """Convert a Unix timestamp into a local ISO string"""
+    return datetime.datetime.fromtimestamp(timestamp).isoformat()
+
+
+def default_electron_data_dir():
+    """Get the Electron app's user data directory"""
+    if sys.platform == "win32":
+        base = os.environ.get("APPDATA", os.path.expanduser("~"))
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_CONFIG_HOME", os.path.expanduser("~/.config"))
+    return os.path.join(base, ELECTRON_APP_NAME)
+
+def default_scheduler_journal_path():
+    """Get the path of the Electron scheduler's journal"""
+    return os.path.join(default_electron_data_dir(), SCHEDULER_JOURNAL_FILE)
+
+def default_state_db_path():
+    """Get the state database path shared by the CLI and the Electron app"""
+    return os.environ.get("SNIPER_STATE_DB") or os.path.join(default_electron_data_dir(), STATE_DB_NAME)
+
+STATE_DB_FILE = default_state_db_path()
+
+def read_scheduler_journal(path=None):
+    """
+    Replay the Electron scheduler's journal
+
+    Args:
+        path: Journal path (defaults to the Electron app's user data directory)
+
+    Returns:
+        Dictionary of scheduled monitors by ID, as the scheduler last saved them
+    """
+    path = path or default_scheduler_journal_path()
+    monitors = {}
+    if not os.path.exists(path):
+        return monitors
+
+    with open(path, "r") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # A torn final write after a crash
+            if record.get("op") == "put":
+                monitors[record["monitor"]["id"]] = record["monitor"]
+            elif record.get("op") == "delete":
+                monitors.pop(record.get("id"), None)
+    return monitors
+
+
+class StateStore:
+    """SQLite-backed local state shared by the CLI tools and the Electron scripts"""
+
+    def __init__(self, path=STATE_DB_FILE):
+        """
+        Open (and create if needed) the state database
+
+        Args:
+            path: Path to the SQLite database file
+        """
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._init_schema()
+
+    def _connect(self):
+        """Get the connection for the current thread"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self):
+        """Run a block of statements as one write transaction"""
+        conn = self._connect()
+        if conn.in_transaction:
+            # Nested use joins the outer transaction
+            yield conn
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _init_schema(self):
+        """Create tables and indexes if they don't exist yet"""
+        with self.transaction() as db:
+            for statement in SCHEMA:
+                db.execute(statement)
+            db.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('schema_version', ?)",
+                (str(SCHEMA_VERSION),)
+            )
+
+    def close(self):
+        """Close the current thread's connection"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # Counters
+
+    def increment(self, name, amount=1):
+        """Add to a named counter"""
+        with self.transaction() as db:
+            db.execute(
+                "INSERT INTO counters (name, value) VALUES (?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                (name, amount)
+            )
+
+    def get_counters(self, names=None):
+        """Get counters as a dictionary (missing counters read as 0)"""
+        rows = self._connect().execute("SELECT name, value FROM counters").fetchall()
+        counters = {row["name"]: row["value"] for row in rows}
+        if names is None:
+            return counters
+        return {name: counters.get(name, 0) for name in names}
+
+    # Check history
+
+    def record_check(self, username, available, checked_at=None):
+        """Record a single availability check"""
+        with self.transaction() as db:
+            db.execute(
+                "INSERT INTO check_history (username, available, checked_at) VALUES (?, ?, ?)",
+                (username, int(bool(available)), checked_at or time.time())
+            )
+            for name in ("usernames_checked", "total_requests"):
+                db.execute(
+                    "INSERT INTO counters (name, value) VALUES (?, 1) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+                    (name,)
+                )
+
+    def get_check_history(self, username=None, limit=100):
+        """Get the most recent checks, optionally for a single username"""
+        if username:
+            rows = self._connect().execute(
+                "SELECT username, available, checked_at FROM check_history "
+                "WHERE username = ? ORDER BY checked_at DESC LIMIT ?",
+                (username, limit)
+            ).fetchall()
+        else:
+            rows = self._connect().execute(
+                "SELECT username, available, checked_at FROM check_history "
+                "ORDER BY id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [
+            {
+                "username": row["username"],
+                "available": bool(row["available"]),
+                "timestamp": _to_isoformat(row["checked_at"])
+            }
+            for row in rows
+        ]
+
+    # Snipe results
+
+    def record_snipe_result(self, username, strategy, success, attempts, time_taken, error=None, created_at=None):
+        """Record a snipe result and update the per-strategy and overall counters"""
+        with self.transaction() as db:
+            db.execute(
+                "INSERT INTO snipe_results (username, strategy, success, attempts, time_taken, error, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (username, strategy, int(bool(success)), attempts, time_taken, error, created_at or time.time())
+            )
+            db.execute(
+                "INSERT INTO strategy_stats (strategy, attempts, successes, failures, avg_attempts, avg_time) "
+                "VALUES (?, 1, ?, ?, ?, ?) "
+                "ON CONFLICT(strategy) DO UPDATE SET "
+                "avg_attempts = (avg_attempts * attempts + excluded.avg_attempts) / (attempts + 1), "
+                "avg_time = (avg_time * attempts + excluded.avg_time) / (attempts + 1), "
+                "attempts = attempts + 1, "
+                "successes = successes + excluded.successes, "
+                "failures = failures + excluded.failures",
+                (strategy, int(bool(success)), int(not success), attempts, time_taken)
+            )
+            db.execute(
+                "INSERT INTO counters (name, value) VALUES (?, 1) "
+                "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+                ("successful_claims" if success else "failed_claims",)
+            )
+
+    def get_snipe_results(self, limit=20, success=None):
+        """Get the most recent snipe results, newest last"""
+        if success is None:
+            rows = self._connect().execute(
+                "SELECT * FROM snipe_results ORDER BY created_at DESC, id DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        else:
+            rows = self._connect().execute(
+                "SELECT * FROM snipe_results WHERE success = ? ORDER BY created_at DESC, id DESC LIMIT ?",
+                (int(bool(success)), limit)
+            ).fetchall()
+
+        results = []
+        for row in reversed(rows):
+            result = {
+                "username": row["username"],
+                "success": bool(row["success"]),
+                "strategy": row["strategy"],
+                "attempts": row["attempts"],
+                "time_taken": row["time_taken"],
+                "timestamp": _to_isoformat(row["created_at"])
+            }
+            if row["error"]:
+                result["error"] = row["error"]
+            results.append(result)
+        return results
+
+    def get_strategy_stats(self):
+        """Get aggregated statistics per strategy"""
+        rows = self._connect().execute("SELECT * FROM strategy_stats").fetchall()
+        return {
+            row["strategy"]: {
+                "attempts": row["attempts"],
+                "successes": row["successes"],
+                "failures": row["failures"],
+                "avg_attempts": row["avg_attempts"],
+                "avg_time": row["avg_time"]
+            }
+            for row in rows
+        }
+
+    # Watchlist
+
+    def upsert_watchlist(self, entry_id, username, status, target_time=None, data=None):
+        """Add or update a single watchlist entry"""
+        with self.transaction() as db:
+            db.execute(
+                "INSERT INTO watchlist (id, username, status, target_time, data, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(id) DO UPDATE SET username = excluded.username, status = excluded.status, "
+                "target_time = excluded.target_time, data = excluded.data, updated_at = excluded.updated_at",
+                (
+                    str(entry_id),
+                    username,
+                    status,
+                    _to_timestamp(target_time),
+                    json.dumps(data, default=str) if data is not None else None,
+                    time.time()
+                )
+            )
+
+    def delete_watchlist(self, entry_id):
+        """Remove a watchlist entry"""
+        with self.transaction() as db:
+            cursor = db.execute("DELETE FROM watchlist WHERE id = ?", (str(entry_id),))
+            return cursor.rowcount > 0
+
+    def get_watchlist(self, status=None):
+        """Get watchlist entries ordered by target time"""
+        if status:
+            rows = self._connect().execute(
+                "SELECT * FROM watchlist WHERE status = ? ORDER BY target_time",
+                (status,)
+            ).fetchall()
+        else:
+            rows = self._connect().execute("SELECT * FROM watchlist ORDER BY target_time").fetchall()
+
+        return [
+            {
+                "id": row["id"],
+                "username": row["username"],
+                "status": row["status"],
+                "target_time": datetime.datetime.fromtimestamp(row["target_time"]) if row["target_time"] else None,
+                "data": json.loads(row["data"]) if row["data"] else None
+            }
+            for row in rows
+        ]
+
+    # Cache entries
+
+    def cache_get(self, namespace, key, default=None):
+        """Get a cached value, ignoring expired entries"""
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+            (namespace, key)
+        ).fetchone()
+
+        if row is None or (row["expires_at"] is not None and row["expires_at"] <= time.time()):
+            return default
+        return json.loads(row["value"])
+
+    def cache_set(self, namespace, key, value, ttl=None, expires_at=None):
+        """Store a value in the cache with an optional time-to-live in seconds"""
+        if ttl is not None:
+            expires_at = time.time() + ttl
+
+        with self.transaction() as db:
+            db.execute(
+                "INSERT INTO cache_entries (namespace, key, value, expires_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(namespace, key) DO UPDATE SET value = excluded.value, "
+                "expires_at = excluded.expires_at, updated_at = excluded.updated_at",
+                (namespace, key, json.dumps(value, default=str), expires_at, time.time())
+            )
+
+    def cache_delete(self, namespace, key):
+        """Remove a cached value"""
+        with self.transaction() as db:
+            db.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def cache_items(self, namespace):
+        """Get all unexpired (key, value) pairs in a namespace"""
+        rows = self._connect().execute(
+            "SELECT key, value FROM cache_entries WHERE namespace = ? "
+            "AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, time.time())
+        ).fetchall()
+        return [(row["key"], json.loads(row["value"])) for row in rows]
+
+    def purge_expired(self):
+        """Delete expired cache entries"""
+        with self.transaction() as db:
+            cursor = db.execute(
+                "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                (time.time(),)
+            )
+            return cursor.rowcount
+
+    # Documents (small JSON configuration blobs)
+
+    def get_document(self, name, default=None):
+        """Get a stored JSON document"""
+        row = self._connect().execute("SELECT value FROM documents WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return default
+        return json.loads(row["value"])
+
+    def get_document_updated_at(self, name):
+        """Get when a document was last written (Unix timestamp) or None"""
+        row = self._connect().execute("SELECT updated_at FROM documents WHERE name = ?", (name,)).fetchone()
+        return row["updated_at"] if row else None
+
+    def set_document(self, name, value):
+        """Store a JSON document"""
+        with self.transaction() as db:
+            db.execute(
+                "INSERT INTO documents (name, value, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET value = excluded.value, updated_at = excluded.updated_at",
+                (name, json.dumps(value), time.time())
+            )
+
+    # Migrations from the legacy JSON files
+
+    def _migration_key(self, kind, path):
+        """Build the meta key that marks a file as migrated"""
+        return f"migrated:{kind}:{os.path.abspath(path)}"
+
+    def _needs_migration(self, kind, path):
+        """Check whether a legacy file exists and hasn't been imported yet"""
+        if not path or not os.path.exists(path):
+            return False
+        row = self._connect().execute(
+            "SELECT 1 FROM meta WHERE key = ?", (self._migration_key(kind, path),)
+        ).fetchone()
+        return row is None
+
+    def _mark_migrated(self, db, kind, path):
+        """Mark a legacy file as imported (inside the migration transaction)"""
+        db.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (self._migration_key(kind, path), datetime.datetime.now().isoformat())
+        )
+
+    def _read_json(self, path):
+        """Read a legacy JSON file, returning None if it can't be parsed"""
+        try:
+            with open(path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logging.error(f"{Fore.RED}Error reading {path} for migration: {str(e)}")
+            return None
+
+    def migrate_stats_file(self, path):
+        """Import a legacy sniper_stats.json file"""
+        if not self._needs_migration("stats", path):
+            return False
+
+        stats = self._read_json(path)
+        with self.transaction() as db:
+            if isinstance(stats, dict):
+                counters = {name: stats.get(name, 0) or 0 for name in STATS_COUNTERS[:6]}
+                avg_response_time = stats.get("avg_response_time", 0) or 0
+                if avg_response_time:
+                    counters["response_time_total"] = avg_response_time * max(1, counters["total_requests"])
+                    counters["response_time_samples"] = max(1, counters["total_requests"])
+
+                for name, value in counters.items():
+                    db.execute(
+                        "INSERT INTO counters (name, value) VALUES (?, ?) "
+                        "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                        (name, value)
+                    )
+
+                for strategy, values in (stats.get("strategy_stats") or {}).items():
+                    db.execute(
+                        "INSERT OR REPLACE INTO strategy_stats "
+                        "(strategy, attempts, successes, failures, avg_attempts, avg_time) VALUES (?, ?, ?, ?, ?, ?)",
+                        (
+                            strategy,
+                            values.get("attempts", 0),
+                            values.get("successes", 0),
+                            values.get("failures", 0),
+                            values.get("avg_attempts", 0),
+                            values.get("avg_time", 0)
+                        )
+                    )
+
+                # Recent results and claim history overlap; import each snipe once
+                seen = set()
+                for entry in (stats.get("claim_history") or []) + (stats.get("recent_results") or []):
+                    if not entry:
+                        continue
+                    created_at = _to_timestamp(entry.get("timestamp")) or time.time()
+                    marker = (entry.get("username"), round(created_at, 3))
+                    if marker in seen:
+                        continue
+                    seen.add(marker)
+                    db.execute(
+                        "INSERT INTO snipe_results (username, strategy, success, attempts, time_taken, error, created_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        (
+                            entry.get("username", ""),
+                            entry.get("strategy") or "unknown",
+                            int(entry.get("success", True)),
+                            entry.get("attempts", 0),
+                            entry.get("time_taken", 0),
+                            entry.get("error"),
+                            created_at
+                        )
+                    )
+
+            self._mark_migrated(db, "stats", path)
+
+        logging.info(f"{Fore.GREEN}Migrated statistics from {path} into {self.path}")
+        return True
+
+    def migrate_known_successes(self, path):
+        """Import known_successes from a legacy attack patterns file"""
+        if not self._needs_migration("known_successes", path):
+            return False
+
+        patterns = self._read_json(path)
+        with self.transaction() as db:
+            if isinstance(patterns, dict):
+                for username, known in (patterns.get("known_successes") or {}).items():
+                    db.execute(
+                        "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at, updated_at) "
+                        "VALUES ('known_successes', ?, ?, NULL, ?)",
+                        (username, json.dumps(known), time.time())
+                    )
+            self._mark_migrated(db, "known_successes", path)
+
+        logging.info(f"{Fore.GREEN}Migrated known successes from {path} into {self.path}")
+        return True
+
+    def migrate_auth_cache(self, path, key="credentials"):
+        """Import a legacy auth_cache.json file"""
+        if not self._needs_migration("auth", path):
+            return False
+
+        data = self._read_json(path)
+        with self.transaction() as db:
+            if isinstance(data, dict):
+                db.execute(
+                    "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at, updated_at) "
+                    "VALUES ('auth', ?, ?, NULL, ?)",
+                    (key, json.dumps(data), time.time())
+                )
+            self._mark_migrated(db, "auth", path)
+
+        logging.info(f"{Fore.GREEN}Migrated cached credentials from {path} into {self.path}")
+        return True
+
+    def summary(self):
+        """Get row counts for every table"""
+        tables = ["check_history", "snipe_results", "strategy_stats", "watchlist", "cache_entries", "documents", "counters"]
+        conn = self._connect()
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+
+
+# Shared store instances, one per database path
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_state_store(path=STATE_DB_FILE):
+    """Get the shared StateStore for a database path"""
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = StateStore(path)
+            _stores[path] = store
+        return store
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    parser = argparse.ArgumentParser(description="Inspect or migrate the sniper's local state database")
+    parser.add_argument("--db", default=STATE_DB_FILE, help=f"Database path (default: {STATE_DB_FILE})")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("status", help="Show row counts and counters")
+    migrate_parser = subparsers.add_parser("migrate", help="Import legacy JSON state files")
+    migrate_parser.add_argument("--stats", default="sniper_stats.json", help="Path to sniper_stats.json")
+    migrate_parser.add_argument("--patterns", default="attack_patterns.json", help="Path to the attack patterns file")
+    migrate_parser.add_argument("--auth", default="auth_cache.json", help="Path to auth_cache.json")
+    args = parser.parse_args()
+
+    store = StateStore(args.db)
+
+    if args.command == "migrate":
+        store.migrate_stats_file(args.stats)
+        store.migrate_known_successes(args.patterns)
+        store.migrate_auth_cache(args.auth)
+
+    print(f"State database: {store.path}")
+    for table, count in store.summary().items():
+        print(f"  {table:<16} {count} rows")
+    for name, value in sorted(store.get_counters().items()):
+        print(f"  {name:<24} {value:g}")
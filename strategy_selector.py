@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Strategy Selector
+
+This module picks snipe strategies with Thompson sampling over strategy/parameter arms.
+Each arm keeps a Beta posterior over its claim probability and a running mean of the
+requests it spends, and the arm with the highest sampled claims-per-request wins.
+"""
+
+import json
+import random
+import logging
+import threading
+from colorama import Fore
+
+from state_store import get_state_store
+
+# Constants
+BANDIT_NAMESPACE = "strategy_bandit"
+MAX_SEED_OBSERVATIONS = 20  # Cap on how much historical stats weigh against new results
+
+def arm_key(strategy_name, params):
+    """Build a stable key for a strategy/parameter arm"""
+    return f"{strategy_name}:{json.dumps(params, sort_keys=True)}"
+
+def estimate_request_cost(strategy_name, params):
+    """Estimate the requests a strategy will spend from its parameters"""
+    if strategy_name == "burst":
+        return params.get("burst_count", 10)
+    if strategy_name == "timing":
+        return params.get("pre_checks", 3) + params.get("max_post_attempts", 15)
+    if strategy_name == "distributed":
+        return params.get("thread_count", 5) * params.get("attempts_per_thread", 8)
+    if strategy_name == "precision":
+        return params.get("attempts", 20)
+    return 10
+
+
+class StrategyArm:
+    """Posterior state for a single strategy/parameter combination"""
+
+    def __init__(self, strategy_name, params, successes=0.0, failures=0.0, pulls=0.0, requests=0.0):
+        self.strategy_name = strategy_name
+        self.params = params
+        self.successes = successes
+        self.failures = failures
+        self.pulls = pulls
+        self.requests = requests
+        self.prior_cost = estimate_request_cost(strategy_name, params)
+
+    @property
+    def key(self):
+        return arm_key(self.strategy_name, self.params)
+
+    @property
+    def mean_cost(self):
+        """Mean requests per attempt, with the parameter estimate as one pseudo-observation"""
+        return (self.prior_cost + self.requests) / (1 + self.pulls)
+
+    def sample_score(self, rng=random):
+        """Sample claims per request from the posterior"""
+        theta = rng.betavariate(1 + self.successes, 1 + self.failures)
+        return theta / max(self.mean_cost, 1)
+
+    def update(self, success, requests):
+        """Add a single outcome"""
+        if success:
+            self.successes += 1
+        else:
+            self.failures += 1
+        self.pulls += 1
+        self.requests += max(requests, 1)
+
+    def to_dict(self):
+        return {
+            "strategy": self.strategy_name,
+            "params": self.params,
+            "successes": self.successes,
+            "failures": self.failures,
+            "pulls": self.pulls,
+            "requests": self.requests
+        }
+
+
+class ThompsonStrategySelector:
+    """Select strategy arms by Thompson sampling and learn from every snipe result"""
+
+    def __init__(self, arms, store=None, rng=None):
+        """
+        Initialize the selector
+
+        Args:
+            arms: Iterable of (strategy_name, params) pairs to choose between
+            store: StateStore used to persist arm posteriors
+            rng: Optional random.Random for reproducible sampling
+        """
+        self.store = store or get_state_store()
+        self.rng = rng or random.Random()
+        self.lock = threading.Lock()
+        self.arms = {}
+
+        for strategy_name, params in arms:
+            arm = StrategyArm(strategy_name, params)
+            saved = self.store.cache_get(BANDIT_NAMESPACE, arm.key)
+            if saved:
+                arm.successes = saved["successes"]
+                arm.failures = saved["failures"]
+                arm.pulls = saved["pulls"]
+                arm.requests = saved["requests"]
+            self.arms[arm.key] = arm
+
+    def seed_from_strategy_stats(self, strategy_stats, stat_names):
+        """
+        Seed arms that have no saved state from SniperStats strategy_stats
+
+        Args:
+            strategy_stats: Per-strategy aggregates from SniperStats
+            stat_names: Maps a strategy name to the names it is recorded under in strategy_stats
+        """
+        with self.lock:
+            unseeded = [arm for arm in self.arms.values() if arm.pulls == 0]
+            for strategy_name in {arm.strategy_name for arm in unseeded}:
+                successes = failures = requests = 0
+                for name in stat_names.get(strategy_name, []):
+                    stats = strategy_stats.get(name)
+                    if stats:
+                        successes += stats["successes"]
+                        failures += stats["failures"]
+                        requests += stats["avg_attempts"] * stats["attempts"]
+
+                total = successes + failures
+                if total == 0:
+                    continue
+
+                # Spread the history over the strategy's arms and cap its weight
+                arms = [arm for arm in unseeded if arm.strategy_name == strategy_name]
+                scale = min(1.0, MAX_SEED_OBSERVATIONS / total) / len(arms)
+                for arm in arms:
+                    arm.successes = successes * scale
+                    arm.failures = failures * scale
+                    arm.pulls = total * scale
+                    arm.requests = requests * scale
+                    self._save(arm)
+
+    def select(self):
+        """Pick the arm with the highest sampled claims per request"""
+        with self.lock:
+            best = max(self.arms.values(), key=lambda arm: arm.sample_score(self.rng))
+        logging.debug(f"Thompson sampling selected {best.key} (mean cost {best.mean_cost:.1f} requests)")
+        return best.strategy_name, dict(best.params)
+
+    def update(self, strategy_name, params, success, requests):
+        """Record the outcome of a snipe that used an arm"""
+        key = arm_key(strategy_name, params)
+        with self.lock:
+            arm = self.arms.get(key)
+            if arm is None:
+                arm = self.arms[key] = StrategyArm(strategy_name, params)
+            arm.update(success, requests)
+            self._save(arm)
+
+    def _save(self, arm):
+        """Persist a single arm"""
+        try:
+            self.store.cache_set(BANDIT_NAMESPACE, arm.key, arm.to_dict())
+        except Exception as e:
+            logging.error(f"{Fore.RED}Error saving strategy selector state: {str(e)}")
+
+    def summary(self):
+        """Get posterior means for every arm, best first"""
+        rows = []
+        for arm in self.arms.values():
+            claim_rate = (1 + arm.successes) / (2 + arm.successes + arm.failures)
+            rows.append({
+                "strategy": arm.strategy_name,
+                "params": arm.params,
+                "pulls": arm.pulls,
+                "claim_rate": claim_rate,
+                "mean_cost": arm.mean_cost,
+                "claims_per_request": claim_rate / max(arm.mean_cost, 1)
+            })
+        rows.sort(key=lambda row: row["claims_per_request"], reverse=True)
+        return rows
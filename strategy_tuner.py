@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Strategy Tuner
+
+This module searches the parameters of each snipe strategy against a simulated
+Mojang endpoint. Request latencies are drawn from recorded samples, and the
+strategies run on a SimulatedClock, so a full drop takes a fraction of a second.
+The winning parameters are written out as a new attack patterns file.
+"""
+
+import os
+import sys
+import copy
+import json
+import math
+import random
+import logging
+import argparse
+import datetime
+import threading
+from collections import deque
+from colorama import Fore, Style, init
+
+from clock import SimulatedClock
+from session_recorder import load_recording, recorded_latencies
+from sniper import (
+    BurstStrategy,
+    TimingStrategy,
+    DistributedStrategy,
+    PrecisionStrategy,
+    DEFAULT_ATTACK_PATTERNS,
+    ATTACK_PATTERNS_FILE,
+    MAX_THREADS
+)
+
+# Constants
+TUNED_PATTERNS_FILE = "attack_patterns.tuned.json"
+DEFAULT_REQUEST_BUDGET = 60  # Requests per minute shared by checks and claims
+DEFAULT_LATENCY_MEDIAN_MS = 80.0
+DEFAULT_LATENCY_SIGMA = 0.35
+LEAD_TIME = 3.0  # Simulated seconds between the start of a trial and the nominal drop
+FAILURE_PENALTY = 30.0  # Time-to-claim charged for a failed trial
+
+STRATEGY_CLASSES = {
+    "burst": BurstStrategy,
+    "timing": TimingStrategy,
+    "distributed": DistributedStrategy,
+    "precision": PrecisionStrategy
+}
+
+# Search space per strategy: (type, low, high)
+PARAM_SPACES = {
+    "burst": {
+        "burst_count": (int, 3, 30),
+        "burst_delay": (float, 0.02, 0.5)
+    },
+    "timing": {
+        "pre_checks": (int, 0, 6),
+        "max_post_attempts": (int, 5, 40)
+    },
+    "distributed": {
+        "thread_count": (int, 2, MAX_THREADS),
+        "attempts_per_thread": (int, 2, 15)
+    },
+    "precision": {
+        "latency_ms": (int, 0, 300),
+        "pre_window": (float, 0.1, 2.0),
+        "post_window": (float, 1.0, 8.0),
+        "attempts": (int, 5, 40)
+    }
+}
+
+
+class LatencyModel:
+    """Draw request latencies from recorded samples or a log-normal fallback"""
+
+    def __init__(self, samples_ms=None, median_ms=DEFAULT_LATENCY_MEDIAN_MS, sigma=DEFAULT_LATENCY_SIGMA):
+        self.samples = [s / 1000.0 for s in samples_ms or [] if s > 0]
+        self.mu = math.log(median_ms / 1000.0)
+        self.sigma = sigma
+
+    @classmethod
+    def from_file(cls, filename):
+        """
+        Load recorded latencies in milliseconds
+
+        Accepts a JSON list of numbers, the dictionary returned by
+        Sniper.test_network_latency (which keeps its samples under "samples"),
+        or a session recording (.jsonl) from session_recorder.py.
+        """
+        if filename.endswith(".jsonl"):
+            return cls(recorded_latencies(load_recording(filename)))
+
+        with open(filename, "r") as f:
+            data = json.load(f)
+
+        if isinstance(data, dict):
+            data = data.get("samples") or []
+        return cls([float(s) for s in data])
+
+    def sample(self, rng):
+        """Draw a single round-trip latency in seconds"""
+        if self.samples:
+            return rng.choice(self.samples)
+        return rng.lognormvariate(self.mu, self.sigma)
+
+
+class SimulatedMojangEndpoint:
+    """
+    A simulated name-change API for a single drop
+
+    The name is released a little after the nominal drop time, a competing
+    sniper claims it after a random delay, and requests beyond the per-minute
+    budget are rate limited.
+    """
+
+    def __init__(self, clock, drop_time, latency_model, rng, request_budget=DEFAULT_REQUEST_BUDGET,
+                 drop_jitter=0.5, competitor_delay=1.5):
+        """
+        Initialize the endpoint
+
+        Args:
+            clock: SimulatedClock shared with the strategy
+            drop_time: Nominal drop time as a Unix timestamp
+            latency_model: LatencyModel used for every request
+            rng: random.Random for this trial
+            request_budget: Requests allowed per rolling minute
+            drop_jitter: Maximum seconds the real release lags the nominal drop
+            competitor_delay: Mean seconds after release before a competitor claims the name
+        """
+        self.clock = clock
+        self.latency_model = latency_model
+        self.rng = rng
+        self.request_budget = request_budget
+        self.release_time = drop_time + rng.uniform(0, drop_jitter)
+        self.competitor_time = self.release_time + rng.expovariate(1.0 / competitor_delay) if competitor_delay else math.inf
+        self.lock = threading.Lock()
+        self.request_times = deque()
+        self.requests = 0
+        self.rate_limited = 0
+        self.claimed_at = None
+
+    def _send(self):
+        """Simulate one request; returns the time it reached the server or None if rate limited"""
+        latency = self.latency_model.sample(self.rng)
+        sent = self.clock.time()
+
+        with self.lock:
+            self.requests += 1
+            while self.request_times and self.request_times[0] <= sent - 60:
+                self.request_times.popleft()
+            limited = len(self.request_times) >= self.request_budget
+            self.request_times.append(sent)
+            if limited:
+                self.rate_limited += 1
+
+        # Half the round trip to reach the server, the rest to come back
+        self.clock.sleep(latency)
+        return None if limited else sent + latency / 2
+
+    def is_username_available(self, username):
+        arrival = self._send()
+        if arrival is None:
+            return False
+        with self.lock:
+            return self.release_time <= arrival and self.claimed_at is None and arrival < self.competitor_time
+
+    def change_username(self, username):
+        arrival = self._send()
+        if arrival is None:
+            return False
+        with self.lock:
+            if self.release_time <= arrival and self.claimed_at is None and arrival < self.competitor_time:
+                self.claimed_at = arrival
+                return True
+        return False
+
+
+class RecordedLatencies:
+    """Replay recorded round-trip times in the order they happened"""
+
+    def __init__(self, latencies, fallback=None):
+        self.latencies = list(latencies)
+        self.fallback = fallback or LatencyModel()
+        self.index = 0
+        self.lock = threading.Lock()
+
+    def sample(self, rng):
+        with self.lock:
+            if not self.latencies:
+                return self.fallback.sample(rng)
+            latency = self.latencies[self.index % len(self.latencies)]
+            self.index += 1
+            return latency
+
+
+class RecordedMojangEndpoint(SimulatedMojangEndpoint):
+    """
+    A simulated name-change API that behaves like a recorded drop
+
+    The name is released when the recording first saw it available and taken
+    when the recording first saw it owned again, and requests take the recorded
+    round-trip times in order.
+    """
+
+    def __init__(self, clock, drop, rng, request_budget=DEFAULT_REQUEST_BUDGET):
+        super().__init__(clock, drop["target_time"], RecordedLatencies(drop["latencies"]), rng,
+                         request_budget, drop_jitter=0, competitor_delay=0)
+        self.release_time = drop["release_time"] or math.inf
+        self.competitor_time = drop["taken_time"] or math.inf
+
+
+class TrialResult:
+    """Outcome of one simulated drop"""
+
+    def __init__(self, success, time_to_claim, requests, rate_limited):
+        self.success = success
+        self.time_to_claim = time_to_claim
+        self.requests = requests
+        self.rate_limited = rate_limited
+
+
+class StrategyTuner:
+    """Random search over strategy parameters against simulated drops"""
+
+    def __init__(self, latency_model=None, request_budget=DEFAULT_REQUEST_BUDGET, trials=6, scale=40.0, seed=None):
+        """
+        Initialize the tuner
+
+        Args:
+            latency_model: LatencyModel for simulated requests
+            request_budget: Requests allowed per rolling minute
+            trials: Simulated drops per candidate
+            scale: Simulated seconds per real second
+            seed: Seed for reproducible searches
+        """
+        self.latency_model = latency_model or LatencyModel()
+        self.request_budget = request_budget
+        self.trials = trials
+        self.scale = scale
+        self.rng = random.Random(seed)
+
+    def sample_params(self, strategy_name):
+        """Draw a random point from a strategy's parameter space"""
+        params = {}
+        for name, (kind, low, high) in PARAM_SPACES[strategy_name].items():
+            if kind is int:
+                params[name] = self.rng.randint(low, high)
+            else:
+                params[name] = round(self.rng.uniform(low, high), 3)
+        return params
+
+    def run_trial(self, strategy_name, params, trial_seed):
+        """Run one simulated drop with a strategy"""
+        trial_rng = random.Random(trial_seed)
+        clock = SimulatedClock(scale=self.scale)
+        drop_time = clock.time() + LEAD_TIME
+        endpoint = SimulatedMojangEndpoint(clock, drop_time, self.latency_model, trial_rng, self.request_budget)
+
+        strategy = STRATEGY_CLASSES[strategy_name](**params)
+        strategy.clock = clock
+        strategy.execute(endpoint, endpoint, "simulated", datetime.datetime.fromtimestamp(drop_time))
+
+        success = endpoint.claimed_at is not None
+        time_to_claim = endpoint.claimed_at - endpoint.release_time if success else FAILURE_PENALTY
+        return TrialResult(success, time_to_claim, endpoint.requests, endpoint.rate_limited)
+
+    def evaluate(self, strategy_name, params, trial_seeds):
+        """Score a candidate as its mean time-to-claim across the trial drops"""
+        results = [self.run_trial(strategy_name, params, seed) for seed in trial_seeds]
+        max_requests = max(r.requests for r in results)
+        return {
+            "params": params,
+            "score": sum(r.time_to_claim for r in results) / len(results),
+            "success_rate": sum(r.success for r in results) / len(results),
+            "max_requests": max_requests,
+            "rate_limited": sum(r.rate_limited for r in results),
+            "within_budget": max_requests <= self.request_budget
+        }
+
+    def tune(self, strategy_name, candidates=20, baseline=None):
+        """
+        Search a strategy's parameters
+
+        Every candidate (and the baseline) runs against the same drops, so the
+        comparison is not skewed by lucky draws. Candidates that spend more than
+        the request budget in a drop are disqualified.
+        """
+        trial_seeds = [self.rng.randrange(2 ** 32) for _ in range(self.trials)]
+        pool = [baseline] if baseline else []
+        pool += [self.sample_params(strategy_name) for _ in range(candidates)]
+
+        best = None
+        for index, params in enumerate(pool):
+            evaluation = self.evaluate(strategy_name, params, trial_seeds)
+            evaluation["baseline"] = index == 0 and baseline is not None
+            logging.debug(f"{strategy_name} {params}: {evaluation['score']:.3f}s, "
+                          f"{evaluation['success_rate']:.0%} claimed, {evaluation['max_requests']} requests")
+
+            if not evaluation["within_budget"]:
+                continue
+            if best is None or evaluation["score"] < best["score"]:
+                best = evaluation
+
+        return best
+
+
+def replay_drop(drop, strategy_name, params, scale=20.0, request_budget=DEFAULT_REQUEST_BUDGET, seed=0):
+    """
+    Run a strategy against a drop reconstructed by session_recorder.extract_drops
+
+    The strategy starts at the recorded snipe start time on a SimulatedClock, so it
+    sees the drop at exactly the recorded relative timing.
+    """
+    clock = SimulatedClock(start=drop["started_at"], scale=scale)
+    endpoint = RecordedMojangEndpoint(clock, drop, random.Random(seed), request_budget)
+
+    strategy = STRATEGY_CLASSES[strategy_name](**params)
+    strategy.clock = clock
+    strategy.execute(endpoint, endpoint, drop["username"], datetime.datetime.fromtimestamp(drop["target_time"]))
+
+    success = endpoint.claimed_at is not None
+    time_to_claim = endpoint.claimed_at - endpoint.release_time if success else FAILURE_PENALTY
+    return TrialResult(success, time_to_claim, endpoint.requests, endpoint.rate_limited)
+
+
+def build_tuned_patterns(base_patterns, winners):
+    """Replace the parameters of every pattern entry whose strategy was tuned"""
+    patterns = copy.deepcopy(base_patterns)
+    patterns.pop("known_successes", None)  # Learned at runtime, kept in the state store
+
+    for table in ("time_of_day", "name_length"):
+        for entry in patterns.get(table, {}).values():
+            winner = winners.get(entry["strategy"])
+            if winner:
+                entry["params"] = dict(winner["params"])
+
+    patterns["tuning"] = {
+        "generated_at": datetime.datetime.now().isoformat(),
+        "results": {
+            name: {key: value for key, value in winner.items() if key != "within_budget"}
+            for name, winner in winners.items()
+        }
+    }
+    return patterns
+
+def load_base_patterns(filename):
+    """Load the patterns to start from, filling missing tables from the built-in defaults"""
+    patterns = copy.deepcopy(DEFAULT_ATTACK_PATTERNS)
+    if filename and os.path.exists(filename):
+        with open(filename, "r") as f:
+            patterns.update(json.load(f))
+    return patterns
+
+def baseline_params(patterns, strategy_name):
+    """Get the current parameters of a strategy from a patterns file"""
+    for table in ("time_of_day", "name_length"):
+        for entry in patterns.get(table, {}).values():
+            if entry["strategy"] == strategy_name:
+                return dict(entry["params"])
+    return None
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Tune snipe strategy parameters against a simulated drop")
+    parser.add_argument("--strategies", nargs="+", choices=list(STRATEGY_CLASSES), default=list(STRATEGY_CLASSES),
+                        help="Strategies to tune (default: all)")
+    parser.add_argument("--candidates", type=int, default=20, help="Random candidates per strategy (default: 20)")
+    parser.add_argument("--trials", type=int, default=6, help="Simulated drops per candidate (default: 6)")
+    parser.add_argument("--budget", type=int, default=DEFAULT_REQUEST_BUDGET,
+                        help=f"Request budget per minute (default: {DEFAULT_REQUEST_BUDGET})")
+    parser.add_argument("--latency-file", help="JSON file of recorded request latencies in milliseconds, or a session recording (.jsonl)")
+    parser.add_argument("--scale", type=float, default=40.0, help="Simulation speed-up factor (default: 40)")
+    parser.add_argument("--seed", type=int, help="Random seed for a reproducible search")
+    parser.add_argument("--patterns", default=ATTACK_PATTERNS_FILE, help="Patterns file to start from")
+    parser.add_argument("--output", default=TUNED_PATTERNS_FILE, help=f"Output patterns file (default: {TUNED_PATTERNS_FILE})")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Show every candidate")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    init(autoreset=True)
+    # Strategies log every attempt at INFO; only show that when asked
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING, format="%(message)s")
+
+    latency_model = LatencyModel.from_file(args.latency_file) if args.latency_file else LatencyModel()
+    tuner = StrategyTuner(latency_model, args.budget, args.trials, args.scale, args.seed)
+    base_patterns = load_base_patterns(args.patterns)
+
+    winners = {}
+    for strategy_name in args.strategies:
+        print(f"{Fore.CYAN}Tuning {strategy_name} strategy ({args.candidates} candidates x {args.trials} drops)...")
+        best = tuner.tune(strategy_name, args.candidates, baseline_params(base_patterns, strategy_name))
+
+        if not best:
+            print(f"{Fore.YELLOW}  No candidate stayed within {args.budget} requests per minute")
+            continue
+
+        winners[strategy_name] = best
+        label = "current parameters" if best["baseline"] else json.dumps(best["params"])
+        print(f"{Fore.GREEN}  Best: {label}")
+        print(f"  Mean time-to-claim {best['score']:.3f}s, {best['success_rate']:.0%} claimed, "
+              f"at most {best['max_requests']} requests")
+
+    if not winners:
+        sys.exit(1)
+
+    with open(args.output, "w") as f:
+        json.dump(build_tuned_patterns(base_patterns, winners), f, indent=4)
+    print(f"\n{Fore.GREEN}Tuned patterns written to {args.output}{Style.RESET_ALL}")
+    print(f"Use them with AdaptiveStrategy(patterns_file=\"{args.output}\") or copy over {ATTACK_PATTERNS_FILE}")
+
+if __name__ == "__main__":
+    main()
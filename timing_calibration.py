@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Timing Calibration
+
+Strategies wait for the snipe window with a coarse sleep followed by a short
+busy-wait, because time.sleep() can wake up late on a loaded host. This module
+measures how late: the sleep overshoot distribution, the clock resolution and
+how long a thread takes to wake up after being signalled. From that it derives
+the switch-over point between sleeping and spinning. The result is stored as a
+per-host profile in the state store and picked up by precise_sleep_until.
+"""
+
+import sys
+import time
+import socket
+import logging
+import datetime
+import argparse
+import threading
+import statistics
+from colorama import Fore, Style, init
+
+from state_store import get_state_store
+
+# Constants
+PROFILE_DOCUMENT = "timing_profile:{hostname}"
+SLEEP_DURATIONS = (0.001, 0.005, 0.02, 0.1)  # seconds
+DEFAULT_SLEEP_SAMPLES = 50
+DEFAULT_WAKEUP_SAMPLES = 100
+# Without a profile, assume Windows' ~15.6ms timer tick and a few ms elsewhere
+DEFAULT_SPIN_THRESHOLD = 0.02 if sys.platform == "win32" else 0.003
+MIN_SPIN_THRESHOLD = 0.0005
+MAX_SPIN_THRESHOLD = 0.05
+SPIN_SAFETY_FACTOR = 1.5
+
+
+def _percentiles(values):
+    """Summarize a list of seconds as milliseconds"""
+    ordered = sorted(values)
+    pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+    return {
+        "p50_ms": pick(0.5) * 1000,
+        "p90_ms": pick(0.9) * 1000,
+        "p99_ms": pick(0.99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000
+    }
+
+def measure_sleep_overshoot(durations=SLEEP_DURATIONS, samples=DEFAULT_SLEEP_SAMPLES):
+    """Measure how much later than asked time.sleep() returns, per requested duration"""
+    results = {}
+    for duration in durations:
+        overshoots = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            time.sleep(duration)
+            overshoots.append(max(0.0, time.perf_counter() - start - duration))
+        results[str(duration)] = _percentiles(overshoots)
+    return results
+
+def measure_clock_resolution(samples=10000):
+    """Compare the advertised and observed resolution of the monotonic clocks"""
+    results = {}
+    for name, clock in (("monotonic", time.monotonic), ("perf_counter", time.perf_counter), ("time", time.time)):
+        smallest = None
+        previous = clock()
+        for _ in range(samples):
+            current = clock()
+            delta = current - previous
+            if delta > 0 and (smallest is None or delta < smallest):
+                smallest = delta
+            previous = current
+        results[name] = {
+            "advertised_ms": time.get_clock_info(name).resolution * 1000,
+            "observed_ms": smallest * 1000 if smallest else None
+        }
+    return results
+
+def measure_wakeup_latency(samples=DEFAULT_WAKEUP_SAMPLES):
+    """Measure the delay between setting an Event and the waiting thread running"""
+    latencies = []
+    for _ in range(samples):
+        event = threading.Event()
+        woke = []
+        waiter = threading.Thread(target=lambda: (event.wait(), woke.append(time.perf_counter())))
+        waiter.start()
+        time.sleep(0.002)  # Let the waiter block
+        signalled = time.perf_counter()
+        event.set()
+        waiter.join()
+        latencies.append(max(0.0, woke[0] - signalled))
+    return _percentiles(latencies)
+
+def spin_threshold_from(sleep_overshoot, wakeup):
+    """Pick how long before a deadline to stop sleeping and start spinning"""
+    worst_overshoot = max(stats["p99_ms"] for stats in sleep_overshoot.values())
+    threshold = (worst_overshoot + wakeup["p99_ms"]) / 1000 * SPIN_SAFETY_FACTOR
+    return min(MAX_SPIN_THRESHOLD, max(MIN_SPIN_THRESHOLD, threshold))
+
+
+def calibrate(sleep_samples=DEFAULT_SLEEP_SAMPLES, wakeup_samples=DEFAULT_WAKEUP_SAMPLES, store=None):
+    """
+    Measure this host and store its timing profile
+
+    Returns:
+        The stored profile dictionary
+    """
+    sleep_overshoot = measure_sleep_overshoot(samples=sleep_samples)
+    wakeup = measure_wakeup_latency(wakeup_samples)
+    profile = {
+        "hostname": socket.gethostname(),
+        "measured_at": datetime.datetime.now().isoformat(),
+        "sleep_overshoot": sleep_overshoot,
+        "clock_resolution": measure_clock_resolution(),
+        "wakeup_latency": wakeup,
+        "spin_threshold": spin_threshold_from(sleep_overshoot, wakeup)
+    }
+
+    store = store or get_state_store()
+    store.set_document(PROFILE_DOCUMENT.format(hostname=profile["hostname"]), profile)
+    _spin_threshold.clear()
+    return profile
+
+def load_host_profile(store=None):
+    """Get this host's stored timing profile, or None if it hasn't been calibrated"""
+    store = store or get_state_store()
+    return store.get_document(PROFILE_DOCUMENT.format(hostname=socket.gethostname()))
+
+
+# Cached switch-over point, loaded from the host profile on first use
+_spin_threshold = []
+
+
+def get_spin_threshold():
+    """Seconds before a deadline at which precise_sleep_until stops sleeping"""
+    if not _spin_threshold:
+        try:
+            profile = load_host_profile()
+        except Exception as e:
+            logging.debug(f"Couldn't load the host timing profile: {str(e)}")
+            profile = None
+        _spin_threshold.append(profile["spin_threshold"] if profile else DEFAULT_SPIN_THRESHOLD)
+    return _spin_threshold[0]
+
+def precise_sleep_until(deadline, event=None):
+    """
+    Sleep until a Unix timestamp, waking up on time even if sleep overshoots
+
+    Sleeps coarsely until the host's spin threshold before the deadline, then
+    yields in a tight loop until it passes.
+
+    Args:
+        deadline: Unix timestamp to wake up at
+        event: Optional threading.Event that ends the sleep early when set
+
+    Returns:
+        True if the event was set before the deadline
+    """
+    threshold = get_spin_threshold()
+    remaining = deadline - time.time()
+    if remaining > threshold:
+        if event is not None:
+            if event.wait(remaining - threshold):
+                return True
+        else:
+            time.sleep(remaining - threshold)
+    while time.time() < deadline:
+        if event is not None and event.is_set():
+            return True
+        time.sleep(0)
+    return False
+
+
+def display_profile(profile):
+    """Print a timing profile"""
+    print(f"\n{Fore.CYAN}Timing profile for {profile['hostname']} ({profile['measured_at']}){Style.RESET_ALL}")
+    print(f"\n{'Sleep':>10} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}  overshoot (ms)")
+    for duration, stats in profile["sleep_overshoot"].items():
+        print(f"{float(duration) * 1000:>8.0f}ms {stats['p50_ms']:>9.3f} {stats['p90_ms']:>9.3f} "
+              f"{stats['p99_ms']:>9.3f} {stats['max_ms']:>9.3f}")
+
+    print(f"\n{'Clock':>12} {'advertised':>12} {'observed':>12}  resolution (ms)")
+    for name, stats in profile["clock_resolution"].items():
+        observed = f"{stats['observed_ms']:.6f}" if stats["observed_ms"] else "n/a"
+        print(f"{name:>12} {stats['advertised_ms']:>12.6f} {observed:>12}")
+
+    wakeup = profile["wakeup_latency"]
+    print(f"\nThread wake-up latency: p50 {wakeup['p50_ms']:.3f}ms, p99 {wakeup['p99_ms']:.3f}ms, max {wakeup['max_ms']:.3f}ms")
+    print(f"{Fore.GREEN}Sleep/spin switch-over: {profile['spin_threshold'] * 1000:.2f}ms before each deadline")
+
+
+if __name__ == "__main__":
+    init(autoreset=True)
+    parser = argparse.ArgumentParser(description="Measure this host's timer behaviour for precise snipe timing")
+    parser.add_argument("command", nargs="?", choices=["calibrate", "show"], default="calibrate")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SLEEP_SAMPLES, help="Sleeps measured per duration")
+    args = parser.parse_args()
+
+    if args.command == "show":
+        profile = load_host_profile()
+        if not profile:
+            print(f"{Fore.YELLOW}This host hasn't been calibrated; using a {DEFAULT_SPIN_THRESHOLD * 1000:.1f}ms switch-over")
+            sys.exit(1)
+    else:
+        print(f"{Fore.CYAN}Calibrating timers, this takes a few seconds...")
+        profile = calibrate(args.samples)
+    display_profile(profile)
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Transport Benchmark
+
+Compares the HTTP transports against a local keep-alive server that answers
+like the profile lookup endpoint. The server runs in its own process, so the
+CPU time measured here is the client's: what each transport costs per request
+on top of the network. Latency percentiles show each transport's tail.
+"""
+
+import time
+import json
+import argparse
+import statistics
+import threading
+import multiprocessing
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from colorama import Fore, Style, init
+
+from http_transport import TRANSPORTS, httpx_available, h2_available
+
+# Constants
+DEFAULT_REQUESTS = 2000
+DEFAULT_WARMUP = 100
+PROFILE_BODY = json.dumps({"id": "069a79f444e94726a5befca90e38aaf5", "name": "Notch"}).encode("utf-8")
+
+
+class LookupHandler(BaseHTTPRequestHandler):
+    """Answer 204 for names starting with 'free', otherwise a small profile"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True  # Otherwise headers and body meet delayed ACKs and add ~40ms
+
+    def do_GET(self):
+        if self.path.rsplit("/", 1)[-1].startswith("free"):
+            self.send_response(204)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(PROFILE_BODY)))
+        self.end_headers()
+        self.wfile.write(PROFILE_BODY)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def _serve(port_queue):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), LookupHandler)
+    server.daemon_threads = True
+    port_queue.put(server.server_address[1])
+    server.serve_forever()
+
+def start_server():
+    """Start the lookup server in a child process; returns (process, base URL)"""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(port_queue,), daemon=True)
+    process.start()
+    return process, f"http://127.0.0.1:{port_queue.get(timeout=10)}"
+
+
+def _percentile(ordered, q):
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+def benchmark_transport(kind, base_url, count=DEFAULT_REQUESTS, warmup=DEFAULT_WARMUP, threads=1, stream=False):
+    """
+    Time a transport against the lookup server
+
+    Args:
+        kind: Transport name from http_transport.TRANSPORTS
+        base_url: Server URL
+        count: Requests timed, split across the threads
+        warmup: Untimed requests sent first to open the connections
+        threads: Threads sending requests concurrently
+        stream: Send status-only lookups, releasing the body unread
+
+    Returns:
+        Dictionary of latency percentiles (ms), throughput and client CPU per request (us)
+    """
+    transport = TRANSPORTS[kind]()
+    names = ["free_name", "notch"]
+
+    def lookup(i):
+        url = f"{base_url}/users/profiles/minecraft/{names[i % 2]}"
+        start = time.perf_counter()
+        response = transport.get(url, timeout=5, stream=stream)
+        if stream:
+            transport.release(response)
+        elif response.status_code == 200:
+            response.json()
+        return time.perf_counter() - start
+
+    for i in range(warmup):
+        lookup(i)
+
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(offset):
+        mine = [lookup(i) for i in range(offset, count, threads)]
+        with lock:
+            latencies.extend(mine)
+
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(offset,)) for offset in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    transport.close()
+
+    ordered = sorted(latencies)
+    return {
+        "transport": kind,
+        "requests": len(ordered),
+        "per_second": len(ordered) / wall,
+        "cpu_us": cpu / len(ordered) * 1e6,
+        "p50_ms": _percentile(ordered, 0.5) * 1000,
+        "p90_ms": _percentile(ordered, 0.9) * 1000,
+        "p99_ms": _percentile(ordered, 0.99) * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000
+    }
+
+def display_results(results):
+    """Print the results as a table"""
+    print(f"\n{'Transport':<10} {'req/s':>8} {'CPU/req':>10} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}")
+    for result in results:
+        print(f"{result['transport']:<10} {result['per_second']:>8.0f} {result['cpu_us']:>8.0f}us "
+              f"{result['p50_ms']:>6.3f}ms {result['p90_ms']:>6.3f}ms {result['p99_ms']:>6.3f}ms {result['max_ms']:>6.2f}ms")
+
+
+if __name__ == "__main__":
+    init(autoreset=True)
+    parser = argparse.ArgumentParser(description="Compare the overhead and tail latency of the HTTP transports")
+    parser.add_argument("-t", "--transports", nargs="+", choices=sorted(TRANSPORTS), help="Transports to compare (default: all installed)")
+    parser.add_argument("-n", "--requests", type=int, default=DEFAULT_REQUESTS, help="Timed requests per transport")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="Untimed requests sent first")
+    parser.add_argument("--threads", type=int, default=1, help="Concurrent threads per transport")
+    parser.add_argument("--stream", action="store_true", help="Status-only lookups that never read the body")
+    args = parser.parse_args()
+
+    kinds = args.transports or [kind for kind in TRANSPORTS if kind != "httpx" or httpx_available]
+    if "httpx" in kinds and not httpx_available:
+        print(f"{Fore.YELLOW}httpx isn't installed; skipping it")
+        kinds.remove("httpx")
+    elif "httpx" in kinds:
+        # The local server only speaks HTTP/1.1, so this measures httpx's client overhead, not HTTP/2
+        print(f"{Fore.CYAN}httpx runs over HTTP/1.1 here (h2 {'installed' if h2_available else 'not installed'})")
+
+    server, base_url = start_server()
+    try:
+        print(f"{Fore.CYAN}Benchmarking {', '.join(kinds)} against {base_url} "
+              f"({args.requests} requests, {args.threads} thread{'s' if args.threads != 1 else ''})...{Style.RESET_ALL}")
+        display_results([
+            benchmark_transport(kind, base_url, args.requests, args.warmup, args.threads, args.stream)
+            for kind in kinds
+        ])
+    finally:
+        server.terminate()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Minecraft Username Sniper Upcoming Names Index
+
+This module keeps a persistent, time-sorted index of upcoming name drops scraped
+from NameMC. Pages are refreshed with conditional requests, paging stops as soon
+as the requested window is covered, and queries are answered locally by bisecting
+the sorted drop times. When NameMC can't be reached the last index is served.
+"""
+
+import time
+import bisect
+import logging
+import datetime
+import threading
+from bs4 import BeautifulSoup
+from colorama import Fore
+
+from state_store import get_state_store
+
+# Constants
+INDEX_DOCUMENT = "upcoming_index"
+REFRESH_INTERVAL = 300  # seconds an index that covers the query is served without refetching
+MAX_INDEX_PAGES = 20  # Cached pages kept for conditional requests
+
+
+def parse_upcoming_page(html):
+    """
+    Parse a NameMC upcoming names page
+
+    Args:
+        html: Page HTML
+
+    Returns:
+        List of [drop timestamp, name] pairs in page order
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    entries = []
+
+    for card in soup.select('.card-body'):
+        try:
+            name_link = card.select_one('a[href*="/name/"]')
+            time_element = card.select_one('time[data-timestamp]')
+            if not name_link or not time_element:
+                continue
+            entries.append([int(time_element['data-timestamp']) / 1000, name_link.text.strip()])
+        except Exception as e:
+            logging.debug(f"Error parsing name card: {str(e)}")
+
+    return entries
+
+
+class UpcomingIndex:
+    """Persistent, time-sorted index of upcoming NameMC drops"""
+
+    def __init__(self, store=None):
+        """
+        Initialize the index from the state store
+
+        Args:
+            store: StateStore the index is persisted in
+        """
+        self.store = store or get_state_store()
+        self.lock = threading.Lock()
+
+        document = self.store.get_document(INDEX_DOCUMENT) or {}
+        self.pages = document.get("pages", {})
+        self.fetched_at = document.get("fetched_at", 0)
+        self._rebuild()
+
+    def _rebuild(self):
+        """Merge the cached pages into the sorted index, dropping past entries"""
+        now = time.time()
+        drops = {}
+
+        # Later pages first so a name that moved onto an earlier page takes its newer time
+        for page in sorted(self.pages, key=int, reverse=True):
+            for timestamp, name in self.pages[page]["entries"]:
+                drops[name.lower()] = (timestamp, name)
+
+        self.entries = sorted(entry for entry in drops.values() if entry[0] > now)
+        self.times = [timestamp for timestamp, _ in self.entries]
+
+    def _save(self):
+        try:
+            self.store.set_document(INDEX_DOCUMENT, {"pages": self.pages, "fetched_at": self.fetched_at})
+        except Exception as e:
+            logging.error(f"{Fore.RED}Error saving upcoming names index: {str(e)}")
+
+    def covers(self, limit=None, until=None):
+        """Check whether the index already answers a query without fetching"""
+        if time.time() - self.fetched_at > REFRESH_INTERVAL:
+            return False
+        if until is not None:
+            return bool(self.times) and self.times[-1] >= until
+        if limit is not None:
+            return len(self.times) - bisect.bisect_right(self.times, time.time()) >= limit
+        return True
+
+    def refresh(self, request, url, limit=None, until=None, max_pages=2):
+        """
+        Refresh the index from NameMC, stopping once the window is covered
+
+        Args:
+            request: Callable (url, headers=...) returning a requests.Response or None
+            url: NameMC upcoming names URL
+            limit: Stop once this many future drops are known
+            until: Stop once drops up to this Unix timestamp are known
+            max_pages: Maximum number of pages to request
+
+        Returns:
+            True if at least one page was fetched or revalidated
+        """
+        now = time.time()
+        refreshed = False
+        seen = set()
+
+        with self.lock:
+            for page in range(1, max_pages + 1):
+                key = str(page)
+                cached = self.pages.get(key)
+
+                headers = {"Accept-Encoding": "gzip, deflate"}
+                if cached and cached.get("etag"):
+                    headers["If-None-Match"] = cached["etag"]
+                if cached and cached.get("last_modified"):
+                    headers["If-Modified-Since"] = cached["last_modified"]
+
+                response = request(f"{url}?sort=asc&page={page}", headers=headers)
+                if response is None:
+                    break
+
+                if response.status_code == 304 and cached:
+                    logging.debug(f"Upcoming names page {page} not modified")
+                    entries = cached["entries"]
+                elif response.status_code == 200:
+                    entries = parse_upcoming_page(response.text)
+                    self.pages[key] = {
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "entries": entries
+                    }
+                else:
+                    logging.warning(f"{Fore.YELLOW}NameMC returned {response.status_code} for upcoming names page {page}")
+                    break
+
+                refreshed = True
+                if not entries:
+                    break
+
+                # Pages are sorted by drop time, so stop as soon as the window is covered
+                seen.update(name.lower() for timestamp, name in entries if timestamp > now)
+                if until is not None and entries[-1][0] >= until:
+                    break
+                if until is None and limit is not None and len(seen) >= limit:
+                    break
+
+            if refreshed:
+                self.fetched_at = now
+                # Forget pages that only hold past drops, and cap how many are kept
+                self.pages = {
+                    key: page for key, page in self.pages.items()
+                    if int(key) <= MAX_INDEX_PAGES and any(timestamp > now for timestamp, _ in page["entries"])
+                }
+                self._rebuild()
+                self._save()
+
+        return refreshed
+
+    def query(self, limit=None, start=None, until=None):
+        """
+        Get upcoming drops from the index
+
+        Args:
+            limit: Maximum number of drops to return
+            start: Earliest drop time as a Unix timestamp (defaults to now)
+            until: Latest drop time as a Unix timestamp
+
+        Returns:
+            List of dictionaries with name, drop_time, time_until and length
+        """
+        now = datetime.datetime.now()
+        low = bisect.bisect_right(self.times, start if start is not None else now.timestamp())
+        high = bisect.bisect_right(self.times, until) if until is not None else len(self.times)
+        if limit is not None:
+            high = min(high, low + limit)
+
+        results = []
+        for timestamp, name in self.entries[low:high]:
+            drop_time = datetime.datetime.fromtimestamp(timestamp)
+            results.append({
+                "name": name,
+                "drop_time": drop_time,
+                "time_until": drop_time - now,
+                "length": len(name)
+            })
+        return results
+
+    def get_upcoming(self, request, url, limit=10, until=None, max_pages=2):
+        """
+        Answer a query, refreshing from NameMC first if the index doesn't cover it
+
+        Falls back to the stored index when NameMC can't be reached.
+        """
+        if not self.covers(limit, until):
+            try:
+                if not self.refresh(request, url, limit, until, max_pages):
+                    self._warn_stale()
+            except Exception as e:
+                logging.error(f"{Fore.RED}Error refreshing upcoming names: {str(e)}")
+                self._warn_stale()
+
+        return self.query(limit, until=until)
+
+    def _warn_stale(self):
+        if not self.entries:
+            logging.warning(f"{Fore.YELLOW}Couldn't fetch upcoming names and no cached index is available")
+            return
+        age = datetime.timedelta(seconds=int(time.time() - self.fetched_at))
+        logging.warning(f"{Fore.YELLOW}Couldn't refresh upcoming names, using the index from {age} ago")